@@ -0,0 +1,375 @@
+# alerts.py - 고영향 뉴스 알림 (규칙 → 싱크)
+# 분석기가 커밋한 직후 / --watch 로 몇 초마다 실행
+#   - 지난번에 어디까지 봤는지 (analyzed_at, id) 를 pipeline_state 에 저장
+#     → 매번 그 뒤에 분석된 행만 idx_news_analyzed_at 으로 읽음 (비용 = 새 행 수)
+#   - 규칙은 처음에 색인으로 컴파일 (티커 → 규칙, 유형 → 규칙, 점수 문턱 정렬, 키워드 정규식 1개)
+#     → 행 하나당 규칙 수만큼 검사하지 않고 dict 조회 몇 번 + 집합 교집합
+#   - 싱크: file (JSON 한 줄씩) / webhook (로컬 HTTP POST) / smtp (로컬 SMTP, 예: python -m aiosmtpd -n)
+#   - 같은 (싱크, 규칙, 뉴스) 는 한 번만 보냄 (alert_log). 싱크가 실패하면 위치를 저장하지 않고 다음에 다시 시도
+# 규칙 파일: alert_rules.json (OWNDRUG_ALERT_RULES) - alert_rules.example.json 참고
+# 사용법: python alerts.py [--watch 5] [--from-start] [--dry-run]
+import argparse
+import bisect
+import json
+import os
+import re
+import smtplib
+import sqlite3
+import time
+from email.message import EmailMessage
+
+import requests
+
+from calibration import SCORE_SQL
+from database import get_state, migrate, set_state
+from tracing import PipelineRun
+
+RULES_FILE = os.getenv("OWNDRUG_ALERT_RULES", "alert_rules.json")
+HWM_KEY = 'alerts.hwm'
+
+BATCH_SIZE = 500
+
+NEW_ROWS_SQL = f"""
+    SELECT id, analyzed_at, ticker, news_type, {SCORE_SQL} AS score, source,
+           title, summary_ko, link, pub_date
+    FROM news
+    WHERE analyzed = 1 AND analyzed_at IS NOT NULL
+      AND (analyzed_at > ? OR (analyzed_at = ? AND id > ?))
+    ORDER BY analyzed_at, id
+    LIMIT ?
+"""
+
+
+def init_alert_tables(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS alert_log (
+            sink TEXT NOT NULL,
+            rule TEXT NOT NULL,
+            news_id INTEGER NOT NULL,
+            sent_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (sink, rule, news_id)
+        ) WITHOUT ROWID
+    """)
+    conn.commit()
+
+
+# ---------------------------------------------------------------------- 규칙
+def as_list(value):
+    if value is None:
+        return []
+    return [value] if isinstance(value, str) else list(value)
+
+
+class RuleIndex:
+    """규칙 목록을 조건별 색인으로 컴파일
+
+    조건마다 "이 값이면 만족하는 규칙 집합" 을 미리 만들어 둠.
+    조건을 안 건 규칙은 그 조건의 any 집합에 들어가 항상 만족.
+    행 하나 = 조건마다 조회 1번 → 교집합 (규칙 수와 무관)
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        every = frozenset(range(len(rules)))
+
+        # 티커 / 유형: 값 → 규칙 번호 (대소문자 무시)
+        self.ticker_any, self.by_ticker = self._lookup(rules, 'tickers', str.upper, every)
+        self.type_any, self.by_type = self._lookup(rules, 'news_types', str.lower, every)
+        self.source_any, self.by_source = self._lookup(rules, 'sources', str.lower, every)
+
+        # 점수: min_score 오름차순 → bisect 로 "문턱 <= 점수" 인 규칙까지의 누적 집합
+        thresholds = sorted((r['min_score'], i) for i, r in enumerate(rules) if r.get('min_score') is not None)
+        self.score_any = every - {i for _, i in thresholds}
+        self.score_keys = [t for t, _ in thresholds]
+        self.score_sets = []
+        acc = set(self.score_any)
+        for _, i in thresholds:
+            acc.add(i)
+            self.score_sets.append(frozenset(acc))
+        self.max_score = {i: r['max_score'] for i, r in enumerate(rules) if r.get('max_score') is not None}
+
+        # 키워드: 모든 규칙의 키워드를 정규식 하나로 → 찾은 단어 → 규칙 번호
+        self.keyword_any = frozenset(i for i, r in enumerate(rules) if not r.get('keywords'))
+        self.by_keyword = {}
+        for i, r in enumerate(rules):
+            for kw in as_list(r.get('keywords')):
+                self.by_keyword.setdefault(kw.lower(), set()).add(i)
+        self.keyword_re = None
+        if self.by_keyword:
+            words = sorted(self.by_keyword, key=len, reverse=True)
+            self.keyword_re = re.compile(r'\b(' + '|'.join(re.escape(w) for w in words) + r')\b', re.IGNORECASE)
+
+    @staticmethod
+    def _lookup(rules, field, norm, every):
+        table = {}
+        for i, r in enumerate(rules):
+            for value in as_list(r.get(field)):
+                table.setdefault(norm(value), set()).add(i)
+        constrained = {i for ids in table.values() for i in ids}
+        return frozenset(every - constrained), table
+
+    def _pick(self, any_set, table, value):
+        hit = table.get(value) if value else None
+        return any_set | hit if hit else any_set
+
+    def match(self, ticker, news_type, source, score, text):
+        """이 행에 맞는 규칙 번호 집합"""
+        found = self._pick(self.ticker_any, self.by_ticker, ticker.upper() if ticker else None)
+        if not found:
+            return found
+        found = found & self._pick(self.type_any, self.by_type, news_type.lower() if news_type else None)
+        if not found:
+            return found
+        found = found & self._pick(self.source_any, self.by_source, source.lower() if source else None)
+        if not found:
+            return found
+
+        if score is None:
+            found = found & self.score_any
+        else:
+            pos = bisect.bisect_right(self.score_keys, score)
+            found = found & (self.score_sets[pos - 1] if pos else self.score_any)
+            if self.max_score:
+                found = {i for i in found if score <= self.max_score.get(i, score)}
+        if not found:
+            return found
+
+        if self.keyword_re is not None and not found <= self.keyword_any:
+            hits = set(self.keyword_any)
+            for word in {m.lower() for m in self.keyword_re.findall(text or '')}:
+                hits |= self.by_keyword[word]
+            found = found & hits
+        return found
+
+
+def load_rules(path=RULES_FILE):
+    """규칙 파일 → (규칙 목록, 싱크 설정). 파일이 없으면 None"""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+    rules = config.get('rules', [])
+    sinks = config.get('sinks', {})
+    for i, rule in enumerate(rules):
+        rule.setdefault('name', f"rule{i + 1}")
+        rule['sinks'] = as_list(rule.get('sinks')) or list(sinks)
+        unknown = [s for s in rule['sinks'] if s not in sinks]
+        if unknown:
+            raise ValueError(f"규칙 {rule['name']}: 정의되지 않은 싱크 {unknown}")
+    return rules, sinks
+
+
+# ---------------------------------------------------------------------- 싱크
+def alert_payload(rule, row):
+    return {
+        'rule': rule['name'],
+        'id': row['id'],
+        'ticker': row['ticker'],
+        'news_type': row['news_type'],
+        'score': row['score'],
+        'source': row['source'],
+        'title': row['title'],
+        'summary_ko': row['summary_ko'],
+        'link': row['link'],
+        'pub_date': row['pub_date'],
+        'analyzed_at': row['analyzed_at'],
+    }
+
+
+class FileSink:
+    """JSON 한 줄씩 추가 (tail -f 로 보기)"""
+
+    def __init__(self, path='alerts.jsonl'):
+        self.path = path
+
+    def send(self, alerts):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for alert in alerts:
+                f.write(json.dumps(alert, ensure_ascii=False) + '\n')
+
+
+class WebhookSink:
+    """실행 1회 = POST 1번 (알림 목록을 한 번에)"""
+
+    def __init__(self, url, timeout=10):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, alerts):
+        r = requests.post(self.url, json={'alerts': alerts}, timeout=self.timeout)
+        r.raise_for_status()
+
+
+class SmtpSink:
+    """실행 1회 = 메일 1통 (요약 목록)"""
+
+    def __init__(self, to, host='localhost', port=1025, sender='owndrug-alerts@localhost', timeout=10):
+        self.to = as_list(to)
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.timeout = timeout
+
+    def send(self, alerts):
+        msg = EmailMessage()
+        top = max(alerts, key=lambda a: a['score'] or 0)
+        msg['Subject'] = f"[OwnDrug] 알림 {len(alerts)}건 - {top['ticker'] or '-'} {top['score']}"
+        msg['From'] = self.sender
+        msg['To'] = ', '.join(self.to)
+        lines = []
+        for a in alerts:
+            lines.append(f"[{a['rule']}] {a['ticker'] or '-'} {a['score']} {a['news_type'] or ''}")
+            lines.append(f"  {a['summary_ko'] or a['title']}")
+            lines.append(f"  {a['link']}")
+        msg.set_content('\n'.join(lines))
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            smtp.send_message(msg)
+
+
+SINK_TYPES = {'file': FileSink, 'webhook': WebhookSink, 'smtp': SmtpSink}
+
+
+def build_sinks(config):
+    sinks = {}
+    for name, options in config.items():
+        options = dict(options)
+        kind = options.pop('type', name)
+        if kind not in SINK_TYPES:
+            raise ValueError(f"싱크 {name}: 알 수 없는 종류 {kind}")
+        sinks[name] = SINK_TYPES[kind](**options)
+    return sinks
+
+
+# ---------------------------------------------------------------------- 실행
+def parse_hwm(value):
+    if not value:
+        return None
+    at, _, news_id = value.rpartition('|')
+    return at, int(news_id)
+
+
+def latest_hwm(conn):
+    row = conn.execute("""
+        SELECT analyzed_at, id FROM news
+        WHERE analyzed_at IS NOT NULL
+        ORDER BY analyzed_at DESC, id DESC LIMIT 1
+    """).fetchone()
+    return (row[0], row[1]) if row else ('', 0)
+
+
+def run_alerts(db_path='fda_news.db', rules_path=RULES_FILE, from_start=False, dry_run=False, quiet=False):
+    """새로 분석된 행에 규칙 적용 → 싱크로 전송. 반환: 보낸 알림 수 (규칙 파일 없으면 None)"""
+    loaded = load_rules(rules_path)
+    if loaded is None:
+        return None
+    rules, sink_config = loaded
+    index = RuleIndex(rules)
+    sinks = build_sinks(sink_config)
+
+    run = PipelineRun('alerts', db_path=db_path, record=not dry_run)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+    init_alert_tables(conn)
+
+    hwm = parse_hwm(get_state(conn, HWM_KEY))
+    if hwm is None:
+        if not from_start:
+            # 처음 켤 때는 지금까지 쌓인 뉴스로 알림 폭탄을 보내지 않음
+            hwm = latest_hwm(conn)
+            if not dry_run:
+                set_state(conn, HWM_KEY, f"{hwm[0]}|{hwm[1]}")
+                conn.commit()
+            if not quiet:
+                print(f"🔔 알림 시작 위치: {hwm[0] or '-'} (#{hwm[1]})")
+            conn.close()
+            run.finish(status='init')
+            return 0
+        hwm = ('', 0)
+
+    # 싱크별로 보낼 알림 (새 행 수만큼만 읽음)
+    outbox = {name: [] for name in sinks}
+    scanned = 0
+    with run.span('match') as span:
+        while True:
+            rows = conn.execute(NEW_ROWS_SQL, (hwm[0], hwm[0], hwm[1], BATCH_SIZE)).fetchall()
+            for row in rows:
+                text = f"{row['title'] or ''} {row['summary_ko'] or ''}"
+                for i in sorted(index.match(row['ticker'], row['news_type'], row['source'], row['score'], text)):
+                    rule = rules[i]
+                    for sink in rule['sinks']:
+                        outbox[sink].append(alert_payload(rule, row))
+            scanned += len(rows)
+            if rows:
+                hwm = (rows[-1]['analyzed_at'], rows[-1]['id'])
+            if len(rows) < BATCH_SIZE:
+                break
+        span.count = scanned
+        span.meta['rules'] = len(rules)
+
+    sent = 0
+    failed = []
+    for name, alerts in outbox.items():
+        if not alerts:
+            continue
+        with run.span('send', sink=name) as span:
+            # 이전 실행에서 이미 보낸 것 (다른 싱크 실패로 다시 읽은 행)
+            done = set()
+            for alert in alerts:
+                if conn.execute("SELECT 1 FROM alert_log WHERE sink = ? AND rule = ? AND news_id = ?",
+                                (name, alert['rule'], alert['id'])).fetchone():
+                    done.add((alert['rule'], alert['id']))
+            alerts = [a for a in alerts if (a['rule'], a['id']) not in done]
+            span.skipped = len(done)
+            if not alerts:
+                continue
+            if dry_run:
+                for a in alerts:
+                    print(f"  🔔 [{name}/{a['rule']}] {a['ticker'] or '-'} {a['score']} {(a['title'] or '')[:60]}")
+                span.count = len(alerts)
+                continue
+            try:
+                sinks[name].send(alerts)
+            except Exception as e:
+                print(f"❌ 알림 전송 실패 ({name}): {e}")
+                span.status = 'error'
+                span.meta['error'] = str(e)[:200]
+                failed.append(name)
+                continue
+            conn.executemany("INSERT OR IGNORE INTO alert_log (sink, rule, news_id) VALUES (?, ?, ?)",
+                             [(name, a['rule'], a['id']) for a in alerts])
+            conn.commit()
+            span.count = len(alerts)
+            sent += len(alerts)
+
+    # 모든 싱크가 성공했을 때만 위치 저장 (실패한 싱크는 다음 실행에서 다시)
+    if not dry_run and not failed and scanned:
+        set_state(conn, HWM_KEY, f"{hwm[0]}|{hwm[1]}")
+        conn.commit()
+    conn.close()
+    if scanned or not quiet:
+        # --watch 로 몇 초마다 돌 때 빈 실행은 기록하지 않음
+        run.finish(status='sink_error' if failed else ('ok' if scanned else 'empty'))
+
+    if not quiet or sent:
+        print(f"🔔 새 분석 {scanned}건 → 알림 {sent}건" + (f" (실패: {', '.join(failed)})" if failed else ""))
+    return sent
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="고영향 뉴스 알림")
+    ap.add_argument("--db", default="fda_news.db")
+    ap.add_argument("--rules", default=RULES_FILE)
+    ap.add_argument("--watch", type=float, default=0, help="N초마다 계속 확인")
+    ap.add_argument("--from-start", action="store_true", help="처음 실행 시 전체 뉴스부터 (기본: 지금 이후만)")
+    ap.add_argument("--dry-run", action="store_true", help="보내지 않고 출력만 (위치도 저장 안 함)")
+    args = ap.parse_args()
+
+    if not os.path.exists(args.rules):
+        print(f"❌ 규칙 파일 없음: {args.rules} (alert_rules.example.json 참고)")
+        raise SystemExit(1)
+
+    run_alerts(args.db, args.rules, from_start=args.from_start, dry_run=args.dry_run)
+    while args.watch:
+        time.sleep(args.watch)
+        run_alerts(args.db, args.rules, dry_run=args.dry_run, quiet=True)
@@ -4,19 +4,35 @@ import sqlite3
 import time
 import re
 import os
+import hashlib
+from datetime import datetime, timezone
+
+from alerts import run_alerts
+from article_fetcher import load_bodies
+from calibration import apply_calibration
+from catalysts import extract_new
+from database import migrate
+from ranking import ensure_ranks, update_ranks
+from snapshot import write_snapshot
+from ticker_stats import day_key, refresh_groups
+from topics import assign_topics, ensure_topics
+from tracing import PipelineRun
 
 API_KEY = os.getenv("PERPLEXITY_API_KEY", "")
+API_URL = "https://api.perplexity.ai/chat/completions"
+MODEL = "sonar-pro"
+BODY_PROMPT_CHARS = 2000  # 본문을 받아 둔 글은 본문 앞부분도 같이 (article_fetcher.py)
 
 def test_api():
     """API 테스트"""
     print("🔑 Testing API...")
-    url = "https://api.perplexity.ai/chat/completions"
+    url = API_URL
     headers = {
         "Authorization": f"Bearer {API_KEY}",
         "Content-Type": "application/json"
     }
     payload = {
-        "model": "sonar-pro",
+        "model": MODEL,
         "messages": [{"role": "user", "content": "Say OK"}],
         "max_tokens": 10
     }
@@ -32,19 +48,85 @@ def test_api():
         print(f"❌ {e}\n")
         return False
 
-def analyze_news_smart(title, summary):
-    """스마트 분석 - Perplexity가 직접 판단"""
-    url = "https://api.perplexity.ai/chat/completions"
+def call_llm(prompt, max_tokens=200, temperature=0.2, run=None, timeout=30):
+    """Perplexity 호출 1회 → 응답 텍스트 (실패하면 None). llm_call 스팬 기록"""
+    if run is None:
+        run = PipelineRun('analyzer', record=False)
+
     headers = {
         "Authorization": f"Bearer {API_KEY}",
         "Content-Type": "application/json"
     }
-    
+    payload = {
+        "model": MODEL,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": temperature,
+        "max_tokens": max_tokens
+    }
+
+    with run.span('llm_call') as span:
+        r = requests.post(API_URL, headers=headers, json=payload, timeout=timeout)
+        span.bytes = len(r.content)
+        if r.status_code == 200:
+            result = r.json()
+            span.tokens = (result.get('usage') or {}).get('total_tokens', 0)
+        else:
+            span.status = f"http_{r.status_code}"
+
+    if r.status_code != 200:
+        print(f"API Error {r.status_code}")
+        return None
+    return result['choices'][0]['message']['content']
+
+
+def cache_key(*parts):
+    return hashlib.sha256("\x1f".join([MODEL, *map(str, parts)]).encode()).hexdigest()
+
+
+def cache_get(conn, key):
+    row = conn.execute("SELECT response FROM llm_cache WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def cache_put(conn, key, response):
+    conn.execute(
+        "INSERT OR REPLACE INTO llm_cache (key, model, response) VALUES (?, ?, ?)",
+        (key, MODEL, response)
+    )
+
+
+def cached_completion(conn, prompt, max_tokens=200, temperature=0.2, run=None, commit=True):
+    """같은 프롬프트면 llm_cache 에서 바로 돌려줌 (conn 은 migrate() 된 DB)
+
+    commit=False: 호출한 쪽 트랜잭션 안에서 (캐시도 그 커밋 때 같이 저장)
+    """
+    key = cache_key(prompt, max_tokens, temperature)
+    cached = cache_get(conn, key)
+    if cached is not None:
+        if run is not None:
+            with run.timer('llm_cache') as span:
+                span.count += 1
+        return cached
+
+    content = call_llm(prompt, max_tokens, temperature, run=run)
+    if content is not None:
+        cache_put(conn, key, content)
+        if commit:
+            conn.commit()
+    return content
+
+
+def analyze_news_smart(title, summary, run=None, body=None):
+    """스마트 분석 - Perplexity가 직접 판단"""
+    if run is None:
+        run = PipelineRun('analyzer', record=False)
+
     # ★ Perplexity에게 맡기기
     prompt = f"""이 제약바이오 뉴스를 분석하고, 기업의 이름과 티커를 식별하고, 한국어로 된 요약을 제공해주세요. Impact는 해당 기업의 주가에 어떤 영향을 얼마나 미칠지 평가하는 지표로, 시가총액이 큰 주식일수록 주가가 잘 움직이지 않는다는 것을 반영하면 됩니다. 5점은 주가가 그대로일 것이라고 예측하는 것이고, 0점은 주가가 가장 크게 하락할 것을, 10점은 주가가 가장 크게 상승할 것을 예측하는 것입니다. 0.1점 단위로 평가해주세요.:
 
 Title: {title}
 Summary: {summary if summary else 'N/A'}
+{f'Article: {body[:BODY_PROMPT_CHARS]}' if body else ''}
 
 Please answer in this exact format:
 Company: [Company name]
@@ -53,30 +135,20 @@ Type: [approval/warning/breakthrough/rejection/policy]
 Impact: [score 0-10]
 KoreanSummary: [50자 이내, 기업명을 포함한 완성된 문장]
 If no specific company is mentioned, write "Ticker: NONE"."""
-    payload = {
-        "model": "sonar-pro",
-        "messages": [{"role": "user", "content": prompt}],
-        "temperature": 0.2,
-        "max_tokens": 200
-    }
-    
     try:
-        r = requests.post(url, headers=headers, json=payload, timeout=30)
-        
-        if r.status_code != 200:
-            print(f"API Error {r.status_code}")
+        content = call_llm(prompt, max_tokens=200, temperature=0.2, run=run)
+        if content is None:
             return None
         
-        result = r.json()
-        content = result['choices'][0]['message']['content']
-        
         print(f"AI Response:\n{content}\n")
         
         # 파싱
-        ticker_match = re.search(r'Ticker:\s*([A-Z]{2,5}|NONE)', content, re.IGNORECASE)
-        type_match = re.search(r'Type:\s*(\w+)', content, re.IGNORECASE)
-        impact_match = re.search(r'Impact:\s*([\d.]+)', content)
-        summary_ko_match = re.search(r'KoreanSummary:\s*(.+)', content)
+        with run.span('parse_response') as span:
+            ticker_match = re.search(r'Ticker:\s*([A-Z]{2,5}|NONE)', content, re.IGNORECASE)
+            type_match = re.search(r'Type:\s*(\w+)', content, re.IGNORECASE)
+            impact_match = re.search(r'Impact:\s*([\d.]+)', content)
+            summary_ko_match = re.search(r'KoreanSummary:\s*(.+)', content)
+            span.count = 1 if ticker_match else 0
 
         if ticker_match:
             ticker = ticker_match.group(1).upper()
@@ -100,36 +172,65 @@ If no specific company is mentioned, write "Ticker: NONE"."""
         print(f"Exception: {e}")
         return None
 
+
+def run_step(conn, run, stage, func, failed):
+    """분석 뒤 파생 단계 하나 = 트랜잭션 하나. 실패하면 그 단계만 되돌리고 다음 단계로"""
+    try:
+        with run.span(stage) as span:
+            span.count = func()
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        failed.append(stage)
+        print(f"⚠️ {stage} 실패 (분석 결과는 저장됨): {e}")
+
+
 def analyze_all_pending():
     """메인"""
     print("\n" + "="*60)
     print("🤖 Smart AI Analysis with Perplexity")
     print("="*60 + "\n")
     
+    run = PipelineRun('analyzer')
+    
     if not test_api():
+        run.finish(status='api_error')
         return
     
     print("="*60 + "\n")
     
     conn = sqlite3.connect('fda_news.db')
+    migrate(conn)
+    ensure_ranks(conn)  # ticker_daily 도 같이
+    ensure_topics(conn)
     cursor = conn.cursor()
     
-    cursor.execute("SELECT id, title, summary FROM news WHERE analyzed = 0 LIMIT 100")
-    pending = cursor.fetchall()
+    with run.span('select_pending') as span:
+        cursor.execute("SELECT id, title, summary, ticker, pub_date FROM news WHERE analyzed = 0 LIMIT 100")
+        pending = cursor.fetchall()
+        span.count = len(pending)
     
     if not pending:
         print("✅ No pending")
         conn.close()
+        run.finish(status='empty')
         return
     
     print(f"📰 Analyzing {len(pending)} news...\n")
     
+    # 본문은 article_fetcher.py 가 받아 둔 것만 (없으면 요약으로)
+    bodies = load_bodies([row[0] for row in pending])
+    
     success = 0
+    touched = set()  # 집계를 다시 셀 (티커, 날짜)
     
-    for news_id, title, summary in pending:
+    for news_id, title, summary, old_ticker, pub_date in pending:
         print(f"{title[:70]}...")
         
-        result = analyze_news_smart(title, summary)
+        result = analyze_news_smart(title, summary, run=run, body=bodies.get(news_id))
+        # created_at(CURRENT_TIMESTAMP)과 같은 UTC
+        analyzed_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        touched.add(day_key(old_ticker, pub_date))
         
         if result:
             ticker = result['ticker']
@@ -137,32 +238,61 @@ def analyze_all_pending():
             news_type = result['type']
             summary_ko = result['summary_ko']
             
-            cursor.execute("""
-                UPDATE news
-                SET ticker = ?, 
-                    impact_score = ?, 
-                    news_type = ?,
-                    summary_ko = ?,
-                    analyzed = 1
-                WHERE id = ?
-            """, (ticker, score, news_type, summary_ko, news_id))
+            with run.timer('update') as span:
+                cursor.execute("""
+                    UPDATE news
+                    SET ticker = ?, 
+                        impact_score = ?, 
+                        news_type = ?,
+                        summary_ko = ?,
+                        analyzed = 1,
+                        analyzed_at = ?
+                    WHERE id = ?
+                """, (ticker, score, news_type, summary_ko, analyzed_at, news_id))
+                span.count += 1
             
+            touched.add(day_key(ticker, pub_date))
             print(f"  ✅ {ticker} | {score} | {news_type}\n")
             success += 1
         else:
             print(f"  ⚠️ No company (policy news)\n")
             
             # 티커 없는 뉴스도 분석 완료로 표시
-            cursor.execute("""
-                UPDATE news
-                SET analyzed = 1, impact_score = 3.0
-                WHERE id = ?
-            """, (news_id,))
+            with run.timer('update') as span:
+                cursor.execute("""
+                    UPDATE news
+                    SET analyzed = 1, impact_score = 3.0, analyzed_at = ?
+                    WHERE id = ?
+                """, (analyzed_at, news_id))
+                span.count += 1
         
         time.sleep(3)
     
-    conn.commit()
+    # LLM 결과부터 저장 (뒤 단계가 실패해도 이미 돈을 낸 분석은 남김)
+    with run.timer('update'):
+        conn.commit()
+    
+    ids = [row[0] for row in pending]
+    failed = []
+    # 출처/유형별 보정 점수 (calibration.py 로 맞춰 둔 함수가 있을 때)
+    run_step(conn, run, 'calibrate', lambda: apply_calibration(conn, ids), failed)
+    run_step(conn, run, 'ticker_daily', lambda: refresh_groups(conn, touched), failed)
+    # 중요도 순위: 분석한 행 + 같은 날 같은 티커 묶음 (묶음 크기가 바뀜)
+    run_step(conn, run, 'rank', lambda: update_ranks(conn, ids, touched), failed)
+    # 주제: 새로 분석한 뉴스만 가까운 주제에 배정 (전체를 다시 묶지 않음)
+    run_step(conn, run, 'topics', lambda: assign_topics(conn, ids), failed)
+    # PDUFA / 자문위원회 일정: 새로 분석된 행만, 날짜를 정규식으로 못 찾은 글만 LLM (캐시)
+    run_step(conn, run, 'catalysts', lambda: extract_new(
+        conn, llm=lambda prompt: cached_completion(conn, prompt, max_tokens=80, temperature=0, run=run, commit=False)
+    ), failed)
     conn.close()
+    run.finish(status='step_error' if failed else 'ok', error=', '.join(failed) or None)
+
+    # 대시보드 스냅샷 갱신 (app.py 는 이 파일만 읽음)
+    write_snapshot()
+    
+    # 규칙 파일(alert_rules.json)이 있으면 방금 분석된 뉴스로 알림
+    run_alerts()
     
     print("="*60)
     print(f"🎉 {success}/{len(pending)} companies identified!")
@@ -0,0 +1,528 @@
+# article_fetcher.py - 기사 본문 가져오기 (선택 단계: 수집기 다음, 분석기 전)
+# RSS 요약은 앞부분 몇 문장뿐이라 분석기가 예고편만 보고 판단하는 일이 많음
+#   → 분석 전 뉴스의 원문 페이지를 받아서 본문만 남기고 zlib 으로 압축해서 BODY_DB 에 저장
+#   본문은 커밋되는 fda_news.db 에 넣지 않음 (저장소 이력이 기사마다 커짐)
+#   fda_news.db 의 article_bodies 에는 가져오기 상태(응답 코드/ETag/시도 횟수/글자 수)만
+#   BODY_DB 는 article_cache/ 안 → CI 에서는 actions/cache 로 HTML 캐시와 같이 보존
+# 가져오기
+#   - 스레드 MAX_WORKERS 개로 동시에, 단 같은 호스트는 PER_HOST 개까지 + 요청 사이 HOST_DELAY 초
+#     (429/503 이면 Retry-After 만큼 그 호스트는 쉼)
+#   - ETag / Last-Modified 를 저장해 두고 다시 받을 때는 조건부 GET (안 바뀌었으면 304, 본문 전송 없음)
+#   - 받은 HTML 은 article_cache/ 에 압축해서 보관 → 본문 추리는 규칙을 고치면 --reextract 로 네트워크 없이 다시
+# 본문 추리기: script/nav/footer 등은 버리고, <article>/<main> 안 문단 위주로
+#   링크 비율이 높은 줄(메뉴/관련 기사), 쿠키/구독 안내, 보도자료 끝의 Forward-Looking Statements / About 회사 / 연락처 이후는 버림
+# news 테이블은 그대로 (대시보드 쿼리는 본문을 읽지 않음). 필요한 곳만 load_bodies() 로 그때그때
+# BODY_DB 가 없어지면 (캐시 만료) 분석 전 뉴스는 다음 실행에 다시 받음
+# 사용법: python article_fetcher.py [--limit 100] [--all] [--refresh 3] [--reextract]
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+import requests
+
+from database import migrate
+from tracing import PipelineRun
+
+CACHE_DIR = os.getenv("OWNDRUG_ARTICLE_CACHE", "article_cache")
+CACHE_DAYS = 30
+BODY_DB = os.getenv("OWNDRUG_BODY_DB", os.path.join(CACHE_DIR, "bodies.db"))
+
+USER_AGENT = "Mozilla/5.0 (compatible; OwnDrug news reader)"
+MAX_WORKERS = 8
+PER_HOST = 2
+HOST_DELAY = 1.0      # 같은 호스트 요청 간격 (초)
+MAX_RETRY_AFTER = 60
+HOST_MAX_ERRORS = 3   # 연결 오류가 연달아 이만큼이면 이번 실행에서는 그 호스트 건너뜀
+TIMEOUT = 20
+MAX_BYTES = 3_000_000
+MAX_ATTEMPTS = 3      # 실패한 글은 다음 실행 때 이만큼까지만 다시
+
+BATCH_SIZE = 100      # 분석기가 한 번에 분석하는 수와 같게
+MAX_CHARS = 20000     # 저장하는 본문 길이
+MIN_BLOCK_CHARS = 40  # 이보다 짧은 줄은 제목(h1~h6)만 남김
+MAX_LINK_DENSITY = 0.5
+
+SKIP_TAGS = {'script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form',
+             'svg', 'iframe', 'button', 'select', 'template', 'figure'}
+BLOCK_TAGS = {'p', 'li', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'blockquote', 'pre', 'td', 'th',
+              'div', 'section', 'article', 'main', 'br', 'tr', 'dd', 'dt', 'table', 'ul', 'ol'}
+HEADINGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+MAIN_TAGS = {'article', 'main'}
+
+BOILERPLATE_RE = re.compile(
+    r'cookie|subscribe|sign up|newsletter|all rights reserved|privacy policy|terms of (?:use|service)'
+    r'|share this|related (?:articles|content|news)|advertisement|javascript|follow us',
+    re.IGNORECASE)
+# 보도자료 끝부분 (여기부터 마지막까지 버림)
+CUT_RE = re.compile(
+    r'^(?:forward[- ]looking statements?|safe harbor|cautionary (?:note|statement)|about [A-Z0-9]'
+    r'|(?:media|investor)s? (?:contact|relations)|contacts?:?$|source:)',
+    re.IGNORECASE)
+
+
+def init_article_tables(conn):
+    """fda_news.db 쪽: 가져오기 상태만 (본문은 BODY_DB)"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS article_bodies (
+            news_id INTEGER PRIMARY KEY,
+            url TEXT,
+            status INTEGER,          -- 마지막 응답 코드 (네트워크 오류면 0)
+            etag TEXT,
+            last_modified TEXT,
+            fetched_at TIMESTAMP,
+            attempts INTEGER DEFAULT 0,
+            raw_bytes INTEGER,
+            chars INTEGER
+        )
+    """)
+
+
+def open_body_db(conn, path=BODY_DB):
+    """본문 DB 열기 (없으면 만듦). conn 은 fda_news.db
+
+    - 예전처럼 fda_news.db 에 body 컬럼이 있으면 본문을 옮기고 컬럼을 지움
+    - 본문 DB 가 새로 생겼으면 (CI 캐시 만료 등) 받았다고 기록된 글을 다시 받도록 상태 초기화
+    """
+    created = not os.path.exists(path)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    body_conn = sqlite3.connect(path)
+    body_conn.execute("CREATE TABLE IF NOT EXISTS bodies (news_id INTEGER PRIMARY KEY, body BLOB)")
+
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(article_bodies)")}
+    if 'body' in columns:
+        body_conn.executemany("INSERT OR REPLACE INTO bodies (news_id, body) VALUES (?, ?)",
+                              conn.execute("SELECT news_id, body FROM article_bodies WHERE body IS NOT NULL"))
+        body_conn.commit()
+        conn.execute("ALTER TABLE article_bodies DROP COLUMN body")
+        conn.commit()
+        conn.execute("VACUUM")
+        print("📦 기사 본문을 fda_news.db → " + path + " 로 옮김")
+    elif created:
+        conn.execute("""
+            UPDATE article_bodies SET status = 0, etag = NULL, last_modified = NULL, attempts = 0
+            WHERE status IN (200, 304)
+        """)
+        conn.commit()
+    return body_conn
+
+
+# ------------------------------------------------------------------ 본문 추리기
+class BlockParser(HTMLParser):
+    """HTML → [(태그, 텍스트, 링크 글자 수, <article>/<main> 안인지)]"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks = []
+        self.skip = 0
+        self.main = 0
+        self.links = 0
+        self.tag = 'p'
+        self.parts = []
+        self.link_chars = 0
+
+    def flush(self):
+        text = ' '.join(''.join(self.parts).split())
+        if text:
+            self.blocks.append((self.tag, text, self.link_chars, self.main > 0))
+        self.parts = []
+        self.link_chars = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self.skip += 1
+        elif tag in BLOCK_TAGS:
+            self.flush()
+            self.tag = tag
+        if tag in MAIN_TAGS:
+            self.main += 1
+        if tag == 'a':
+            self.links += 1
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self.skip = max(0, self.skip - 1)
+        elif tag in BLOCK_TAGS:
+            self.flush()
+            self.tag = 'p'
+        if tag in MAIN_TAGS:
+            self.main = max(0, self.main - 1)
+        if tag == 'a':
+            self.links = max(0, self.links - 1)
+
+    def handle_data(self, data):
+        if self.skip:
+            return
+        self.parts.append(data)
+        if self.links:
+            self.link_chars += len(data.strip())
+
+
+def clean_body(raw):
+    """HTML → 본문 텍스트 (문단마다 줄바꿈). 본문을 못 찾으면 ''"""
+    parser = BlockParser()
+    try:
+        parser.feed(raw)
+        parser.close()
+    except Exception:
+        # 깨진 HTML - 거기까지 읽은 것만
+        pass
+    parser.flush()
+    blocks = parser.blocks
+    # <article>/<main> 안에 본문다운 분량이 있으면 그것만
+    main = [b for b in blocks if b[3]]
+    if sum(len(b[1]) for b in main) >= 200:
+        blocks = main
+
+    lines = []
+    for tag, text, link_chars, _ in blocks:
+        if lines and CUT_RE.match(text):
+            break
+        if link_chars > len(text) * MAX_LINK_DENSITY:
+            continue
+        if len(text) < MIN_BLOCK_CHARS and tag not in HEADINGS:
+            continue
+        if len(text) < 200 and BOILERPLATE_RE.search(text):
+            continue
+        if lines and lines[-1] == text:
+            continue
+        lines.append(text)
+    return '\n'.join(lines)[:MAX_CHARS]
+
+
+def decode(content, encoding):
+    try:
+        return content.decode(encoding or 'utf-8', errors='replace')
+    except LookupError:
+        return content.decode('utf-8', errors='replace')
+
+
+# ------------------------------------------------------------------ 디스크 캐시 (받은 HTML)
+def cache_path(url):
+    digest = hashlib.sha1(url.encode()).hexdigest()
+    return os.path.join(CACHE_DIR, digest[:2], digest + '.html.z')
+
+
+def cache_put(url, content):
+    path = cache_path(url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(zlib.compress(content, 6))
+    os.replace(tmp, path)
+
+
+def cache_get(url):
+    try:
+        with open(cache_path(url), 'rb') as f:
+            return zlib.decompress(f.read())
+    except (OSError, zlib.error):
+        return None
+
+
+def prune_cache(days=CACHE_DAYS):
+    """오래된 HTML 캐시 파일 지우기 (CI 캐시가 계속 커지지 않게, 본문 DB 는 그대로)"""
+    cutoff = time.time() - days * 86400
+    removed = 0
+    for root, _, files in os.walk(CACHE_DIR):
+        for name in files:
+            if not name.endswith('.html.z'):
+                continue
+            path = os.path.join(root, name)
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+    return removed
+
+
+# ------------------------------------------------------------------ 가져오기
+class HostLimiter:
+    """호스트마다 동시 요청 per_host 개 + 요청 시작 간격 delay 초"""
+
+    def __init__(self, per_host=PER_HOST, delay=HOST_DELAY):
+        self.per_host = per_host
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._hosts = {}  # host → [Semaphore, 다음 요청 가능 시각, 연달아 난 연결 오류 수]
+
+    def _state(self, host):
+        with self._lock:
+            return self._hosts.setdefault(host, [threading.Semaphore(self.per_host), 0.0, 0])
+
+    def down(self, host):
+        return self._state(host)[2] >= HOST_MAX_ERRORS
+
+    def record(self, host, ok):
+        state = self._state(host)
+        with self._lock:
+            state[2] = 0 if ok else state[2] + 1
+
+    @contextmanager
+    def slot(self, host):
+        state = self._state(host)
+        with state[0]:
+            with self._lock:
+                now = time.monotonic()
+                start = max(state[1], now)
+                state[1] = start + self.delay
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+    def back_off(self, host, seconds):
+        state = self._state(host)
+        with self._lock:
+            state[1] = max(state[1], time.monotonic() + min(seconds, MAX_RETRY_AFTER))
+
+
+_local = threading.local()
+
+
+def session():
+    # requests.Session 은 스레드마다 하나 (연결은 재사용)
+    if not hasattr(_local, 'session'):
+        _local.session = requests.Session()
+        _local.session.headers['User-Agent'] = USER_AGENT
+    return _local.session
+
+
+def fetch(limiter, url, etag=None, last_modified=None):
+    """한 건 받기 (작업 스레드에서). 반환: dict(status, content, etag, last_modified, error)"""
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+    host = urlsplit(url).netloc
+    result = {'status': 0, 'content': None, 'encoding': None, 'etag': etag,
+              'last_modified': last_modified, 'error': None, 'skipped': False}
+    with limiter.slot(host):
+        if limiter.down(host):
+            result['skipped'] = True
+            return result
+        try:
+            with session().get(url, headers=headers, timeout=TIMEOUT, stream=True) as r:
+                result['status'] = r.status_code
+                if r.status_code in (429, 503):
+                    retry_after = r.headers.get('Retry-After', '')
+                    limiter.back_off(host, int(retry_after) if retry_after.isdigit() else MAX_RETRY_AFTER)
+                if r.status_code != 200:
+                    return result
+                chunks, size = [], 0
+                for chunk in r.iter_content(65536):
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size > MAX_BYTES:
+                        break
+                result['content'] = b''.join(chunks)
+                result['encoding'] = r.encoding if 'charset' in r.headers.get('Content-Type', '') else None
+                result['etag'] = r.headers.get('ETag')
+                result['last_modified'] = r.headers.get('Last-Modified')
+        except requests.RequestException as e:
+            result['error'] = type(e).__name__
+        limiter.record(host, result['error'] is None)
+    return result
+
+
+def select_targets(conn, limit, include_analyzed=False, refresh_days=0):
+    """받을 글 [(news_id, link, etag, last_modified, attempts)]
+
+    - 아직 안 받은 분석 전 뉴스 (include_analyzed 면 분석된 뉴스도, 최신순)
+    - 실패했던 글 (MAX_ATTEMPTS 까지)
+    - refresh_days 면 그 기간에 발표된 글을 조건부 GET 으로 다시 확인
+    """
+    # 분석 전 뉴스는 분석기와 같은 순서 (id 순), 분석된 뉴스까지면 최신순
+    analyzed_sql, order = ("", "DESC") if include_analyzed else ("AND n.analyzed = 0", "")
+    targets = conn.execute(f"""
+        SELECT n.id, n.link, b.etag, b.last_modified, COALESCE(b.attempts, 0)
+        FROM news n LEFT JOIN article_bodies b ON b.news_id = n.id
+        WHERE n.link LIKE 'http%' {analyzed_sql}
+          AND (b.news_id IS NULL OR (b.status NOT IN (200, 304) AND b.attempts < ?))
+        ORDER BY n.id {order}
+        LIMIT ?
+    """, (MAX_ATTEMPTS, limit)).fetchall()
+    if refresh_days:
+        since = (datetime.now() - timedelta(days=refresh_days)).strftime('%Y-%m-%d')
+        seen = {t[0] for t in targets}
+        targets += [row for row in conn.execute("""
+            SELECT n.id, n.link, b.etag, b.last_modified, b.attempts
+            FROM news n JOIN article_bodies b ON b.news_id = n.id
+            WHERE n.pub_date >= ? AND b.status IN (200, 304)
+        """, (since,)) if row[0] not in seen]
+    return targets
+
+
+def store(conn, body_conn, news_id, url, result, attempts):
+    """응답 하나 저장: 상태는 conn(fda_news.db), 본문은 body_conn (304 면 본문은 그대로 두고 확인 시각만)
+
+    반환: 저장한 본문 글자 수
+    """
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    if result['status'] == 304:
+        conn.execute("""
+            UPDATE article_bodies SET status = 304, fetched_at = ?, attempts = 0 WHERE news_id = ?
+        """, (now, news_id))
+        return 0
+    text = ''
+    if result['content'] is not None:
+        text = clean_body(decode(result['content'], result['encoding']))
+    ok = result['status'] == 200
+    conn.execute("""
+        INSERT INTO article_bodies (news_id, url, status, etag, last_modified, fetched_at, attempts, raw_bytes, chars)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(news_id) DO UPDATE SET
+            url = excluded.url, status = excluded.status, etag = excluded.etag,
+            last_modified = excluded.last_modified, fetched_at = excluded.fetched_at,
+            attempts = excluded.attempts, raw_bytes = excluded.raw_bytes,
+            chars = excluded.chars
+    """, (news_id, url, result['status'], result['etag'] if ok else None, result['last_modified'] if ok else None,
+          now, 0 if ok else attempts + 1, len(result['content'] or b''), len(text)))
+    save_body(body_conn, news_id, text)
+    return len(text)
+
+
+def save_body(body_conn, news_id, text):
+    if text:
+        body_conn.execute("INSERT OR REPLACE INTO bodies (news_id, body) VALUES (?, ?)",
+                          (news_id, zlib.compress(text.encode(), 9)))
+    else:
+        body_conn.execute("DELETE FROM bodies WHERE news_id = ?", (news_id,))
+
+
+def fetch_articles(db_path='fda_news.db', limit=BATCH_SIZE, include_analyzed=False, refresh_days=0):
+    print("\n" + "=" * 60)
+    print("📄 기사 본문 가져오기")
+    print("=" * 60 + "\n")
+
+    run = PipelineRun('article_fetcher', db_path=db_path)
+    conn = sqlite3.connect(db_path)
+    migrate(conn)
+    init_article_tables(conn)
+    body_conn = open_body_db(conn)
+
+    with run.span('select') as span:
+        targets = select_targets(conn, limit, include_analyzed, refresh_days)
+        span.count = len(targets)
+    if not targets:
+        print("✅ 받을 본문 없음")
+        conn.close()
+        body_conn.close()
+        run.finish(status='empty')
+        return 0
+
+    limiter = HostLimiter()
+    stored = not_modified = failed = 0
+    with run.span('fetch', workers=MAX_WORKERS, per_host=PER_HOST) as span:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            futures = {pool.submit(fetch, limiter, link, etag, last_modified): (news_id, link, attempts)
+                       for news_id, link, etag, last_modified, attempts in targets}
+            # 저장은 메인 스레드에서 (sqlite 연결 하나)
+            for future in as_completed(futures):
+                news_id, link, attempts = futures[future]
+                result = future.result()
+                if result['skipped']:
+                    # 호스트가 안 되는 동안은 시도 횟수도 올리지 않음 (다음 실행 때 다시)
+                    span.skipped += 1
+                    continue
+                span.bytes += len(result['content'] or b'')
+                if result['content'] is not None:
+                    cache_put(link, result['content'])
+                with run.timer('store') as store_span:
+                    chars = store(conn, body_conn, news_id, link, result, attempts)
+                    store_span.count += 1
+                if result['status'] == 304:
+                    not_modified += 1
+                elif chars:
+                    stored += 1
+                else:
+                    failed += 1
+                    print(f"  ⚠️ #{news_id} {result['status'] or result['error']} {link[:70]}")
+        span.count = stored
+        span.meta['not_modified'] = not_modified
+        span.meta['failed'] = failed
+
+    # 본문 먼저 (상태만 커밋되고 본문이 없으면 다시 받지 않음)
+    body_conn.commit()
+    body_conn.close()
+    conn.commit()
+    conn.close()
+    removed = prune_cache()
+    run.finish()
+    skipped = len(targets) - stored - not_modified - failed
+    print(f"🎉 본문 {stored}건 저장, 변경 없음 {not_modified}건, 실패 {failed}건"
+          + (f", 연결 안 되는 호스트라 건너뜀 {skipped}건" if skipped else "")
+          + (f", 오래된 캐시 {removed}개 삭제" if removed else ""))
+    return stored
+
+
+def reextract(db_path='fda_news.db'):
+    """디스크 캐시에 있는 HTML 로 본문만 다시 추리기 (네트워크 없음)"""
+    conn = sqlite3.connect(db_path)
+    migrate(conn)
+    init_article_tables(conn)
+    body_conn = open_body_db(conn)
+    updated = 0
+    for news_id, url in conn.execute("SELECT news_id, url FROM article_bodies WHERE status IN (200, 304)").fetchall():
+        content = cache_get(url)
+        if content is None:
+            continue
+        text = clean_body(decode(content, None))
+        conn.execute("UPDATE article_bodies SET chars = ? WHERE news_id = ?", (len(text), news_id))
+        save_body(body_conn, news_id, text)
+        updated += 1
+    body_conn.commit()
+    body_conn.close()
+    conn.commit()
+    conn.close()
+    return updated
+
+
+# ------------------------------------------------------------------ 읽기 (필요한 곳만)
+def load_bodies(ids, path=BODY_DB):
+    """{news_id: 본문} - 받아 둔 것만 (본문 DB 가 없으면 빈 dict). 읽기 전용으로 따로 엶"""
+    ids = list(ids)
+    if not ids or not os.path.exists(path):
+        return {}
+    bodies = {}
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            for news_id, body in conn.execute(f"""
+                SELECT news_id, body FROM bodies
+                WHERE news_id IN ({','.join('?' * len(chunk))})
+            """, chunk):
+                bodies[news_id] = zlib.decompress(body).decode()
+    except sqlite3.OperationalError:
+        return {}
+    finally:
+        conn.close()
+    return bodies
+
+
+def load_body(news_id, path=BODY_DB):
+    return load_bodies([news_id], path).get(news_id)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="기사 본문 가져오기 (상태: article_bodies, 본문: BODY_DB)")
+    ap.add_argument("--db", default="fda_news.db")
+    ap.add_argument("--limit", type=int, default=BATCH_SIZE)
+    ap.add_argument("--all", action="store_true", help="분석된 뉴스도 (최신순)")
+    ap.add_argument("--refresh", type=int, default=0, metavar="DAYS", help="최근 N일 글은 조건부 GET 으로 다시 확인")
+    ap.add_argument("--reextract", action="store_true", help="캐시된 HTML 로 본문만 다시 추리기")
+    args = ap.parse_args()
+
+    if args.reextract:
+        print(f"📄 본문 {reextract(args.db)}건 다시 추림")
+    else:
+        fetch_articles(args.db, args.limit, args.all, args.refresh)
@@ -0,0 +1,356 @@
+# backtest.py - impact_score 이벤트 스터디 백테스트
+# 분석된 뉴스마다 발표 이후 주가가 실제로 점수 방향으로 움직였는지 측정
+# 사용법:
+#   python backtest.py                                  (prices/ 의 가격 파일 + fda_news.db)
+#   python backtest.py --horizons 1,5,20 --benchmark SPY --out backtest_report.json
+#   python backtest.py --db bench_data/news_100000.db --events-csv events.csv
+#
+# 가격 파일: prices/<TICKER>.csv 또는 .parquet (티커당 하나)
+#   date, close 필수 / open 있으면 장중 뉴스 진입가로 사용 / adj_close 있으면 수정주가로 계산
+# 발표시간(pub_date, 미 동부 시간 기준) → 거래일 정렬:
+#   장 시작 전(09:30 전)   → 당일이 0일째, 진입가 = 직전 거래일 종가
+#   장중(09:30~16:00)      → 당일이 0일째, 진입가 = 당일 시가 (시가 없으면 직전 종가)
+#   장 마감 후 / 휴장일      → 다음 거래일이 0일째, 진입가 = 직전 거래일 종가
+#   h일 수익률 = (h-1)일째 종가 / 진입가 - 1, 초과수익률 = 같은 구간 벤치마크(XBI) 수익률을 뺀 값
+# 정렬과 수익률 계산은 전부 NumPy 배열 연산 (이벤트 행 단위 루프 없음)
+import argparse
+import glob
+import json
+import os
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+from calibration import SCORE_SQL
+from snapshot import JUNK_TICKERS
+
+PRICE_DIR = os.getenv("OWNDRUG_PRICE_DIR", "prices")
+BENCHMARK = 'XBI'  # 바이오텍 ETF
+HORIZONS = (1, 3, 5, 10, 20)
+
+MARKET_OPEN = 9 * 60 + 30  # 분
+MARKET_CLOSE = 16 * 60
+NEUTRAL = 5.0  # 점수 5 = 방향 없음 (적중률에서 제외)
+
+SCORE_BINS = [0, 2, 4, 6, 8, 10]
+SCORE_LABELS = ['0-2', '2-4', '4-6', '6-8', '8-10']
+
+DAY_BITS = 20  # 1970-01-01 기준 일수 (< 2^20 → 4840년까지)
+
+
+def read_price_file(path):
+    """가격 파일 하나 → (일수 int64, 시가, 종가). 수정주가가 있으면 시가도 같은 비율로 보정"""
+    if path.endswith('.parquet'):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path)
+    df.columns = [str(c).strip().lower().replace(' ', '_') for c in df.columns]
+    if 'date' not in df or 'close' not in df:
+        raise ValueError(f"{path}: date/close 컬럼 없음")
+
+    close = df['close'].astype(float)
+    if 'adj_close' in df:
+        factor = df['adj_close'].astype(float) / close.replace(0, np.nan)
+        close = df['adj_close'].astype(float)
+    else:
+        factor = 1.0
+    opens = df['open'].astype(float) * factor if 'open' in df else pd.Series(np.nan, index=df.index)
+
+    days = pd.to_datetime(df['date'], errors='coerce').to_numpy().astype('datetime64[D]')
+    ok = ~np.isnat(days) & close.notna().to_numpy()
+    table = pd.DataFrame({'day': days[ok].astype(np.int64), 'open': opens.to_numpy()[ok], 'close': close.to_numpy()[ok]})
+    table = table.drop_duplicates('day', keep='last').sort_values('day')
+    return table['day'].to_numpy(), table['open'].to_numpy(), table['close'].to_numpy()
+
+
+class PriceTable:
+    """모든 티커의 가격을 (티커 코드, 날짜) 순으로 이어 붙인 긴 배열 하나
+
+    key = 코드 << DAY_BITS | 일수 → 이벤트 전체를 searchsorted 한 번으로 정렬
+    """
+
+    def __init__(self, series):
+        self.tickers = sorted(series)
+        self.index = pd.Index(self.tickers)
+        parts = [series[t] for t in self.tickers]
+        lengths = np.array([len(p[0]) for p in parts], dtype=np.int64)
+        self.offsets = np.concatenate([[0], np.cumsum(lengths)])
+        self.code = np.repeat(np.arange(len(self.tickers), dtype=np.int64), lengths)
+        self.day = np.concatenate([p[0] for p in parts]) if parts else np.zeros(0, np.int64)
+        self.open = np.concatenate([p[1] for p in parts]) if parts else np.zeros(0)
+        self.close = np.concatenate([p[2] for p in parts]) if parts else np.zeros(0)
+        self.key = (self.code << DAY_BITS) | self.day
+
+    def __len__(self):
+        return len(self.tickers)
+
+
+def load_prices(price_dir=PRICE_DIR, tickers=None):
+    """price_dir 의 CSV/Parquet → PriceTable (tickers 가 있으면 그 티커만 읽음)"""
+    paths = {}
+    for path in glob.glob(os.path.join(price_dir, '*.csv')) + glob.glob(os.path.join(price_dir, '*.parquet')):
+        paths[os.path.splitext(os.path.basename(path))[0].upper()] = path
+    if tickers is not None:
+        paths = {t: p for t, p in paths.items() if t in tickers}
+
+    series = {}
+    for ticker, path in paths.items():
+        try:
+            series[ticker] = read_price_file(path)
+        except Exception as e:
+            print(f"⚠️ 가격 파일 건너뜀 ({path}): {e}")
+    return PriceTable(series)
+
+
+def load_events(db_path='fda_news.db', calibrated=False):
+    """calibrated=True 면 보정 점수 (calibration.py) 로 평가"""
+    score = SCORE_SQL if calibrated else 'impact_score'
+    conn = sqlite3.connect(db_path)
+    try:
+        events = pd.read_sql_query(f"""
+            SELECT id, ticker, pub_date, {score} AS impact_score, news_type, source
+            FROM news
+            WHERE analyzed = 1 AND ticker IS NOT NULL AND ticker != '' AND ticker != 'NONE'
+              AND ticker NOT IN ({','.join('?' * len(JUNK_TICKERS))})
+              AND impact_score IS NOT NULL AND pub_date IS NOT NULL
+        """, conn, params=JUNK_TICKERS)
+    finally:
+        conn.close()
+    events['ticker'] = events['ticker'].str.upper()
+    events['news_type'] = events['news_type'].fillna('unknown')
+    events['source'] = events['source'].fillna('fda')
+    return events
+
+
+def align_events(events, prices):
+    """이벤트 → (0일째 가격 위치, 진입가, 장중 여부). 가격이 없는 이벤트는 위치 -1"""
+    ts = pd.to_datetime(events['pub_date'], errors='coerce', format='mixed')
+    stamp = ts.to_numpy()
+    valid_ts = ~np.isnat(stamp)
+    day = np.where(valid_ts, stamp.astype('datetime64[D]').astype(np.int64), 0)
+    minute = np.where(valid_ts, (ts.dt.hour * 60 + ts.dt.minute).fillna(0).to_numpy(np.int64), 0)
+
+    code = prices.index.get_indexer(events['ticker']).astype(np.int64)
+    after_close = minute >= MARKET_CLOSE
+    # 장 마감 후면 다음 날부터 찾음 (휴장일은 searchsorted 가 다음 거래일로 넘겨 줌)
+    target = day + after_close
+    i0 = np.searchsorted(prices.key, (np.maximum(code, 0) << DAY_BITS) | target, side='left')
+
+    n = len(prices.key)
+    safe = np.minimum(i0, max(n - 1, 0))
+    ok = valid_ts & (code >= 0) & (i0 < n)
+    if n:
+        ok &= prices.code[safe] == code
+    # 진입가는 직전 거래일 종가가 필요 → 그 티커의 첫 거래일이면 제외 (장중 시가 진입 제외)
+    has_prev = ok & (i0 > prices.offsets[np.maximum(code, 0)])
+    prev = np.maximum(i0 - 1, 0)
+
+    intraday = ok & ~after_close & (minute >= MARKET_OPEN)
+    if n:
+        intraday &= prices.day[safe] == day
+        open_price = prices.open[safe]
+        prev_close = prices.close[prev]
+    else:
+        open_price = prev_close = np.zeros(len(events))
+    intraday &= ~np.isnan(open_price)
+
+    entry = np.where(intraday, open_price, np.where(has_prev, prev_close, np.nan))
+    pos = np.where(ok & ~np.isnan(entry), i0, -1)
+    return pos, entry, intraday
+
+
+def benchmark_returns(prices, bench, entry_day_pos, intraday, horizons):
+    """같은 진입/청산일의 벤치마크 수익률 (날짜 → 벤치마크 위치도 searchsorted)"""
+    bday, bopen, bclose = bench
+    out = {}
+
+    def lookup(day):
+        i = np.searchsorted(bday, day)
+        i = np.minimum(i, len(bday) - 1)
+        return np.where(bday[i] == day, i, -1)
+
+    entry_i = lookup(prices.day[np.maximum(entry_day_pos, 0)])
+    entry = np.where(intraday, bopen[np.maximum(entry_i, 0)], bclose[np.maximum(entry_i, 0)])
+    entry = np.where((entry_i >= 0) & (entry_day_pos >= 0), entry, np.nan)
+    for h, exit_pos in horizons.items():
+        exit_i = lookup(prices.day[np.maximum(exit_pos, 0)])
+        exit_ = np.where((exit_i >= 0) & (exit_pos >= 0), bclose[np.maximum(exit_i, 0)], np.nan)
+        out[h] = exit_ / entry - 1
+    return out
+
+
+def run_backtest(events, prices, horizons=HORIZONS, benchmark=BENCHMARK):
+    """이벤트별 수익률/초과수익률 컬럼을 붙인 DataFrame"""
+    pos, entry, intraday = align_events(events, prices)
+    ev = events.copy()
+    ev['intraday'] = intraday
+    ev['entry'] = entry
+    valid = pos >= 0
+    code = np.maximum(prices.index.get_indexer(events['ticker']).astype(np.int64), 0)
+    end = prices.offsets[code + 1] if len(prices) else np.zeros(len(ev), np.int64)
+
+    exits = {}
+    for h in horizons:
+        exit_pos = pos + h - 1
+        ok = valid & (exit_pos < end)
+        exit_pos = np.where(ok, exit_pos, -1)
+        exits[h] = exit_pos
+        close = prices.close[np.maximum(exit_pos, 0)] if len(prices.close) else np.zeros(len(ev))
+        ev[f'ret_{h}'] = np.where(ok, close / entry - 1, np.nan)
+
+    bench = None
+    if benchmark and benchmark in prices.index:
+        b = prices.index.get_loc(benchmark)
+        sl = slice(prices.offsets[b], prices.offsets[b + 1])
+        bench = (prices.day[sl], prices.open[sl], prices.close[sl])
+    if bench is not None and len(bench[0]):
+        # 진입 기준일: 장중이면 0일째(시가), 아니면 직전 거래일(종가)
+        entry_day_pos = np.where(valid, np.where(intraday, pos, pos - 1), -1)
+        bench_ret = benchmark_returns(prices, bench, entry_day_pos, intraday, exits)
+        for h in horizons:
+            ev[f'abn_{h}'] = ev[f'ret_{h}'] - bench_ret[h]
+    else:
+        for h in horizons:
+            ev[f'abn_{h}'] = ev[f'ret_{h}']
+
+    ev['pred'] = np.sign(ev['impact_score'].to_numpy(float) - NEUTRAL)
+    ev['score_bin'] = pd.cut(ev['impact_score'], SCORE_BINS, labels=SCORE_LABELS, include_lowest=True)
+    return ev
+
+
+def hit_columns(ev, horizons):
+    """적중 = 예측 방향과 초과수익률 부호가 같음 (중립 점수/수익률 없음은 NaN → 평균에서 빠짐)"""
+    hits = {}
+    pred = ev['pred'].to_numpy()
+    for h in horizons:
+        abn = ev[f'abn_{h}'].to_numpy()
+        usable = (pred != 0) & ~np.isnan(abn) & (abn != 0)
+        hits[f'hit_{h}'] = np.where(usable, (np.sign(abn) == pred).astype(float), np.nan)
+    return pd.DataFrame(hits, index=ev.index)
+
+
+def summarize(ev, horizons, by=None):
+    """그룹별 이벤트 수 / 적중률 / 평균 초과수익률 / 점수-초과수익률 순위 상관(IC)"""
+    frame = pd.concat([ev, hit_columns(ev, horizons)], axis=1)
+    frame['_g'] = frame[by] if by else '전체'
+    grouped = frame.groupby('_g', observed=True)
+
+    agg = {'events': ('id', 'size')}
+    for h in horizons:
+        agg[f'n_{h}'] = (f'abn_{h}', 'count')
+        agg[f'hit_{h}'] = (f'hit_{h}', 'mean')
+        agg[f'abn_{h}'] = (f'abn_{h}', 'mean')
+    table = grouped.agg(**agg)
+
+    # Spearman = 그룹 안에서 (수익률 있는 이벤트끼리) 순위를 매긴 뒤 Pearson
+    for h in horizons:
+        col = f'abn_{h}'
+        sub = frame.loc[frame[col].notna(), ['_g', col, 'impact_score']]
+        ranks = sub.groupby('_g', observed=True)[[col, 'impact_score']].rank()
+        ranks['_g'] = sub['_g']
+        table[f'ic_{h}'] = ranks.groupby('_g', observed=True).apply(
+            lambda g: g[col].corr(g['impact_score']) if len(g) > 2 else np.nan)
+    table.index.name = by
+    return table
+
+
+def calibration(ev, horizon):
+    """점수 구간별 실제 평균 수익률/초과수익률 (점수가 높을수록 올라야 보정이 된 것)"""
+    hits = hit_columns(ev, [horizon])
+    frame = pd.concat([ev, hits], axis=1)
+    return frame.groupby('score_bin', observed=False).agg(
+        events=(f'ret_{horizon}', 'count'),
+        ret=(f'ret_{horizon}', 'mean'),
+        abn=(f'abn_{horizon}', 'mean'),
+        abn_median=(f'abn_{horizon}', 'median'),
+        hit=(f'hit_{horizon}', 'mean'),
+    )
+
+
+def format_table(table):
+    """수익률/적중률은 %, IC 는 소수 셋째 자리"""
+    view = table.copy()
+    for col in view.columns:
+        if col.startswith(('hit', 'abn', 'ret')):
+            view[col] = (view[col] * 100).round(2)
+        elif col.startswith('ic'):
+            view[col] = view[col].round(3)
+    return view.to_string()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="impact_score 이벤트 스터디 백테스트")
+    ap.add_argument("--db", default="fda_news.db")
+    ap.add_argument("--prices", default=PRICE_DIR, help="티커별 가격 파일 폴더 (CSV/Parquet)")
+    ap.add_argument("--benchmark", default=BENCHMARK, help="초과수익률 기준 티커 (가격 폴더에 있어야 함, '' 이면 원수익률)")
+    ap.add_argument("--horizons", default=','.join(map(str, HORIZONS)), help="거래일 수 (쉼표 구분)")
+    ap.add_argument("--out", default=None, help="JSON 리포트 경로")
+    ap.add_argument("--events-csv", default=None, help="이벤트별 결과 CSV 경로")
+    ap.add_argument("--calibrated", action="store_true", help="보정 점수(impact_calibrated)로 평가")
+    args = ap.parse_args()
+    horizons = [int(h) for h in args.horizons.split(',') if h]
+
+    print("\n" + "="*70)
+    print("📊 impact_score 백테스트 (이벤트 스터디)")
+    print("="*70 + "\n")
+
+    started = time.perf_counter()
+    events = load_events(args.db, args.calibrated)
+    wanted = set(events['ticker']) | ({args.benchmark.upper()} if args.benchmark else set())
+    prices = load_prices(args.prices, wanted)
+    loaded = time.perf_counter()
+    print(f"📰 이벤트 {len(events):,}건 | 💹 가격 {len(prices):,}종목 {len(prices.day):,}행 ({loaded - started:.2f}s)")
+    if not len(prices):
+        print(f"❌ {args.prices}/ 에 가격 파일이 없습니다 (<TICKER>.csv: date, open, close)")
+        return
+
+    benchmark = args.benchmark.upper() if args.benchmark else None
+    if benchmark and benchmark not in prices.index:
+        print(f"⚠️ 벤치마크 {benchmark} 가격 없음 → 초과수익률 대신 원수익률")
+        benchmark = None
+
+    ev = run_backtest(events, prices, horizons, benchmark)
+    matched = ev['entry'].notna().sum()
+    print(f"🔗 가격과 맞춘 이벤트 {matched:,}건 (장중 {int(ev['intraday'].sum()):,}건) | 계산 {time.perf_counter() - loaded:.2f}s\n")
+
+    main_h = 5 if 5 in horizons else horizons[0]
+    overall = summarize(ev, horizons)
+    by_type = summarize(ev, horizons, 'news_type')
+    by_source = summarize(ev, horizons, 'source')
+    calib = calibration(ev, main_h)
+
+    print("🎯 전체 (hit=적중률%, abn=평균 초과수익률%, ic=점수-초과수익률 순위상관)")
+    print(format_table(overall))
+    print("\n🏷️ 뉴스 유형별")
+    print(format_table(by_type))
+    print("\n📡 출처별")
+    print(format_table(by_source))
+    print(f"\n📐 점수 구간별 보정 ({main_h}거래일)")
+    print(format_table(calib))
+
+    if args.events_csv:
+        ev.to_csv(args.events_csv, index=False)
+        print(f"\n💾 이벤트별 결과: {args.events_csv}")
+    if args.out:
+        def records(table):
+            return json.loads(table.reset_index().to_json(orient='records', force_ascii=False))
+        report = {
+            'db': args.db,
+            'benchmark': benchmark,
+            'horizons': horizons,
+            'events': int(len(ev)),
+            'matched': int(matched),
+            'overall': records(overall),
+            'by_news_type': records(by_type),
+            'by_source': records(by_source),
+            'calibration': {'horizon': main_h, 'bins': records(calib)},
+        }
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 리포트: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+# benchmark.py - 대시보드/CLI 쿼리 경로 벤치마크
+# 사용법:
+#   python benchmark.py --sizes 1000,10000,100000
+#   python benchmark.py --compare bench_report_before.json bench_report.json
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from database import migrate
+from news_store import NewsStore, dashboard_frame
+from ranking import ensure_ranks
+from snapshot import build_dashboard
+from synthetic_db import create_synthetic_db
+
+# 데이터베이스별로 한 번 적재해 둔 NewsStore (app.py 의 st.cache_resource 와 같은 역할)
+_warm_stores = {}
+
+
+def prepare_db(db_path):
+    """스냅샷/대시보드가 읽는 rank_score 를 미리 채우고 NewsStore 를 한 번 적재 (측정 밖)"""
+    conn = sqlite3.connect(db_path)
+    try:
+        migrate(conn)
+        ensure_ranks(conn)
+    finally:
+        conn.close()
+    store = _warm_stores[db_path] = NewsStore(db_path)
+    store.refresh()
+
+
+def case_snapshot_build(conn):
+    # snapshot.py: 파이프라인이 대시보드 첫 화면을 미리 계산하는 쿼리
+    return build_dashboard(conn)['rows']
+
+
+def case_store_cold(db_path):
+    # news_store.py: 프로세스 첫 로드 (전체 컬럼 적재)
+    store = NewsStore(db_path)
+    store.refresh()
+    return store.column('id')
+
+
+def case_app_load_data(db_path):
+    # app.py load_data(): 스냅샷이 없을 때의 경로 = 증분 갱신 + 첫 화면 DataFrame
+    store = _warm_stores[db_path]
+    store.refresh()
+    return dashboard_frame(store)
+
+
+def case_check_stats(conn):
+    # check.py 1~2번 (전체 통계 + 날짜 범위)
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM news")
+    cursor.execute("SELECT COUNT(*) FROM news WHERE analyzed = 1")
+    cursor.execute("SELECT COUNT(*) FROM news WHERE analyzed = 0")
+    cursor.execute("SELECT MIN(pub_date), MAX(pub_date) FROM news")
+    return cursor.fetchall()
+
+
+def case_check_pending_recent(conn):
+    return conn.execute("""
+        SELECT pub_date, title
+        FROM news
+        WHERE analyzed = 0
+        ORDER BY pub_date DESC
+        LIMIT 10
+    """).fetchall()
+
+
+def case_check_analyzed_recent(conn):
+    return conn.execute("""
+        SELECT pub_date, title, ticker, impact_score
+        FROM news
+        WHERE analyzed = 1
+        AND ticker IS NOT NULL
+        AND ticker != ''
+        ORDER BY pub_date DESC
+        LIMIT 10
+    """).fetchall()
+
+
+def case_analyzer_pending(conn):
+    # analyzer.py 에서 분석 대상 가져오기
+    return conn.execute("SELECT id, title, summary, ticker, pub_date FROM news WHERE analyzed = 0 LIMIT 100").fetchall()
+
+
+def case_collector_dedup(conn):
+    # collector*.py 중복 체크: RSS 한 번에 50개 항목 link 조회 (절반은 신규)
+    links = [r[0] for r in conn.execute("SELECT link FROM news ORDER BY id DESC LIMIT 25")]
+    links += [f"https://example.com/new/{i}" for i in range(25)]
+    cursor = conn.cursor()
+    for link in links:
+        cursor.execute("SELECT id FROM news WHERE link = ?", (link,))
+        cursor.fetchone()
+    return links
+
+
+# (이름, 함수) - 새 쿼리 경로가 생기면 여기에 추가
+CASES = [
+    ('snapshot.build_dashboard', case_snapshot_build),
+    ('check.stats', case_check_stats),
+    ('check.pending_recent', case_check_pending_recent),
+    ('check.analyzed_recent', case_check_analyzed_recent),
+    ('analyzer.pending', case_analyzer_pending),
+    ('collector.dedup_50', case_collector_dedup),
+]
+
+# 커넥션 대신 DB 경로를 받는 케이스 (NewsStore 가 직접 연결)
+PATH_CASES = [
+    ('news_store.cold_load', case_store_cold),
+    ('app.load_data', case_app_load_data),
+]
+
+
+def time_case(db_path, func, repeat, connect=True):
+    """매 회 새 커넥션 (app.py/스크립트와 동일 조건). connect=False 면 func(db_path)"""
+    timings = []
+    result_rows = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if connect:
+            conn = sqlite3.connect(db_path)
+            result = func(conn)
+            conn.close()
+        else:
+            result = func(db_path)
+        timings.append((time.perf_counter() - start) * 1000)
+        result_rows = len(result)
+    timings.sort()
+    return {
+        'runs': repeat,
+        'min_ms': round(timings[0], 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        'mean_ms': round(statistics.fmean(timings), 3),
+        'rows': result_rows,
+    }
+
+
+def run_benchmark(sizes, repeat=5, data_dir='bench_data', regen=False, only=None, seed=42):
+    report = {
+        'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'pandas': pd.__version__,
+        'repeat': repeat,
+        'seed': seed,
+        'sizes': {},
+    }
+    os.makedirs(data_dir, exist_ok=True)
+
+    for size in sizes:
+        db_path = os.path.join(data_dir, f"news_{size}.db")
+        if regen or not os.path.exists(db_path):
+            create_synthetic_db(db_path, size, seed=seed)
+        prepare_db(db_path)
+
+        print(f"\n📊 {size:,}건 ({os.path.getsize(db_path) / 1e6:.1f} MB)")
+        results = {}
+        cases = [(name, func, True) for name, func in CASES] + [(name, func, False) for name, func in PATH_CASES]
+        for name, func, connect in cases:
+            if only and not any(o in name for o in only):
+                continue
+            results[name] = time_case(db_path, func, repeat, connect)
+            r = results[name]
+            print(f"  {name:28s} median {r['median_ms']:9.2f} ms | p95 {r['p95_ms']:9.2f} ms | rows {r['rows']}")
+
+        report['sizes'][str(size)] = {
+            'db_bytes': os.path.getsize(db_path),
+            'cases': results,
+        }
+    return report
+
+
+def compare_reports(before_path, after_path):
+    """두 리포트의 median 비교 (인덱스/캐시 변경 전후)"""
+    with open(before_path, encoding='utf-8') as f:
+        before = json.load(f)
+    with open(after_path, encoding='utf-8') as f:
+        after = json.load(f)
+
+    print(f"\n🔍 {before_path} → {after_path}")
+    for size, data in after['sizes'].items():
+        old = before['sizes'].get(size)
+        if not old:
+            continue
+        print(f"\n📊 {int(size):,}건")
+        for name, r in data['cases'].items():
+            if name not in old['cases']:
+                continue
+            b = old['cases'][name]['median_ms']
+            a = r['median_ms']
+            ratio = b / a if a > 0 else float('inf')
+            mark = "🟢" if ratio >= 1.1 else "🔴" if ratio <= 0.9 else "⚪"
+            print(f"  {mark} {name:28s} {b:9.2f} → {a:9.2f} ms (x{ratio:.2f})")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="대시보드/CLI 쿼리 벤치마크")
+    ap.add_argument("--sizes", default="1000,10000,100000", help="DB 크기 목록 (쉼표 구분)")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--data-dir", default="bench_data")
+    ap.add_argument("--out", default="bench_report.json")
+    ap.add_argument("--regen", action="store_true", help="DB 다시 생성")
+    ap.add_argument("--only", default=None, help="이름에 포함된 케이스만 (쉼표 구분)")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="리포트 두 개 비교")
+    args = ap.parse_args()
+
+    if args.compare:
+        compare_reports(*args.compare)
+    else:
+        sizes = [int(s) for s in args.sizes.split(",") if s]
+        only = args.only.split(",") if args.only else None
+        report = run_benchmark(sizes, repeat=args.repeat, data_dir=args.data_dir,
+                               regen=args.regen, only=only, seed=args.seed)
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ 리포트 저장: {args.out}")
@@ -0,0 +1,85 @@
+# build_assets.py - 게임 프론트엔드를 해시 이름으로 빌드
+# game_src/<name>.html → static/games/<name>.<hash>.html
+# game_src 를 수정했으면 실행하고 static/games 까지 같이 커밋하세요.
+# --precompress: .gz/.br 도 만듦 (serve_static.py / nginx / CDN 으로 서빙할 때만 의미 있음, 커밋하지 않음)
+#   Streamlit 정적 서빙(기본 배포)은 압축본을 보내지 않고 장기 캐시 헤더도 없음
+import argparse
+import gzip
+import hashlib
+import json
+import os
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SRC_DIR = 'game_src'
+OUT_DIR = os.path.join('static', 'games')
+MANIFEST = os.path.join(OUT_DIR, 'manifest.json')
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:10]
+
+
+def write_if_changed(path, data):
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+
+def build_asset(name, data, precompress=False):
+    ext = os.path.splitext(name)[1]
+    stem = os.path.splitext(name)[0]
+    filename = f"{stem}.{content_hash(data)}{ext}"
+    path = os.path.join(OUT_DIR, filename)
+
+    write_if_changed(path, data)
+    if precompress:
+        # mtime=0 → 내용이 같으면 .gz도 매번 같은 바이트 (서버 ETag 가 그대로)
+        write_if_changed(path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli is not None:
+            write_if_changed(path + '.br', brotli.compress(data, quality=11))
+    else:
+        for ext in ('.gz', '.br'):
+            if os.path.exists(path + ext):
+                os.remove(path + ext)
+
+    # 같은 이름의 예전 해시 파일 정리
+    for old in os.listdir(OUT_DIR):
+        if old.startswith(stem + '.') and not old.startswith(filename):
+            os.remove(os.path.join(OUT_DIR, old))
+
+    return filename
+
+
+def build_all(precompress=False):
+    os.makedirs(OUT_DIR, exist_ok=True)
+    manifest = {}
+    for name in sorted(os.listdir(SRC_DIR)):
+        with open(os.path.join(SRC_DIR, name), 'rb') as f:
+            data = f.read()
+        filename = build_asset(name, data, precompress)
+        manifest[os.path.splitext(name)[0]] = filename
+        if precompress:
+            gz_size = os.path.getsize(os.path.join(OUT_DIR, filename + '.gz'))
+            print(f"✅ {name} → {filename} ({len(data):,} B, gzip {gz_size:,} B)")
+        else:
+            print(f"✅ {name} → {filename} ({len(data):,} B)")
+
+    write_if_changed(MANIFEST, (json.dumps(manifest, indent=2, sort_keys=True) + "\n").encode())
+    if precompress and brotli is None:
+        print("💡 brotli 미설치 → .br 생략 (pip install brotli)")
+    return manifest
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="게임 프론트엔드 빌드")
+    ap.add_argument("--precompress", action="store_true", help=".gz/.br 도 생성 (serve_static.py / CDN 용)")
+    args = ap.parse_args()
+    build_all(precompress=args.precompress)
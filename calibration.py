@@ -0,0 +1,327 @@
+# calibration.py - 출처/뉴스 유형별 impact_score 보정
+# LLM 점수는 출처마다 분포가 다름 (FierceBiotech 논평 vs FDA 보도자료)
+# 분석기가 회사를 못 찾은 행(티커/유형 없음, 3.0 자리 채움)은 맞추지도 적용하지도 않음 → impact_calibrated NULL
+# → (source, news_type) 마다 점수 → 보정 점수 구간 선형 함수를 맞춰 calibration_params 에 저장하고
+#    news.impact_calibrated 에 적용. 화면 색상(7+, 2 이하)은 보정 점수 기준 (SCORE_SQL)
+#   quantile: 그룹 점수 분포를 같은 뉴스 유형의 전체(출처 무관) 분포에 맞춤 (기본, 결과 데이터 불필요)
+#   isotonic: 실제 초과수익률(backtest.py)에 단조 회귀(PAV) → "전체 기준으로 같은 기대 수익률"인 점수로
+# API 호출 없이 언제든 다시 맞출 수 있음. GitHub Actions 에는 numpy 가 없어서 표준 라이브러리만 사용
+# 사용법: python calibration.py [--method isotonic --prices prices --horizon 5]
+import argparse
+import bisect
+import hashlib
+import json
+import sqlite3
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from database import get_state, migrate, set_state
+
+# 화면/집계에서 쓰는 점수 (보정 전 행은 원래 점수)
+SCORE_SQL = "COALESCE(impact_calibrated, impact_score)"
+
+ANY = '*'
+MIN_GROUP = 30     # 이보다 적으면 출처 단위 → 전체 단위로 대체
+VERSION_KEY = 'calibration.version'  # 맞춘 곡선의 해시 (곡선이 바뀔 때만 바뀜 → 화면/정적 페이지 캐시 키)
+
+# 보정 대상: LLM 이 회사/유형까지 판단한 행 (회사를 못 찾은 행의 3.0 은 점수가 아니라 자리 채움 값)
+CALIBRATED_SQL = """
+    analyzed = 1 AND impact_score IS NOT NULL
+    AND news_type IS NOT NULL AND ticker IS NOT NULL AND ticker != 'NONE'
+"""
+
+
+def init_calibration_tables(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS calibration_params (
+            source TEXT NOT NULL,
+            news_type TEXT NOT NULL,
+            method TEXT NOT NULL,
+            knots TEXT NOT NULL,
+            n INTEGER,
+            fitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (source, news_type)
+        )
+    """)
+    conn.commit()
+
+
+def group_key(source, news_type):
+    return (source or 'fda', news_type)
+
+
+# ------------------------------------------------------------------ 구간 선형 함수
+def interp(x, xs, ys):
+    """np.interp 와 같음 (양 끝은 끝 값 유지)"""
+    if x <= xs[0]:
+        return ys[0]
+    if x >= xs[-1]:
+        return ys[-1]
+    i = bisect.bisect_right(xs, x)
+    x0, x1, y0, y1 = xs[i - 1], xs[i], ys[i - 1], ys[i]
+    return y0 + (y1 - y0) * (x - x0) / (x1 - x0)
+
+
+def quantile(sorted_values, p):
+    """선형 보간 분위수 (numpy 기본 방식)"""
+    pos = p * (len(sorted_values) - 1)
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def fit_quantile(values, reference):
+    """점수 v → 그룹 안 순위(중간 순위) → reference 의 같은 분위수"""
+    counts = Counter(values)
+    n = len(values)
+    xs, ys = [], []
+    below = 0
+    for v in sorted(counts):
+        c = counts[v]
+        xs.append(v)
+        ys.append(quantile(reference, (below + c / 2) / n))
+        below += c
+    return xs, ys
+
+
+def pav(xs, ys):
+    """Pool Adjacent Violators: x 순서로 y 를 단조 증가로 맞춘 값 (x 는 고유값, 가중치 = 건수)"""
+    by_x = defaultdict(list)
+    for x, y in zip(xs, ys):
+        by_x[x].append(y)
+    blocks = []  # [합, 건수, 시작 x 번호, 끝 x 번호]
+    ux = sorted(by_x)
+    for i, x in enumerate(ux):
+        blocks.append([sum(by_x[x]), len(by_x[x]), i, i])
+        while len(blocks) > 1 and blocks[-2][0] / blocks[-2][1] > blocks[-1][0] / blocks[-1][1]:
+            s, c, _, end = blocks.pop()
+            blocks[-1][0] += s
+            blocks[-1][1] += c
+            blocks[-1][3] = end
+    fitted = [0.0] * len(ux)
+    for s, c, start, end in blocks:
+        for i in range(start, end + 1):
+            fitted[i] = s / c
+    return ux, fitted
+
+
+def invert(curve_x, curve_y, target):
+    """단조 증가 곡선 y = f(x) 에서 f(x) = target 인 x (평평한 구간은 가운데)"""
+    if target <= curve_y[0]:
+        return curve_x[0]
+    if target >= curve_y[-1]:
+        return curve_x[-1]
+    lo = bisect.bisect_left(curve_y, target)
+    hi = bisect.bisect_right(curve_y, target)
+    if lo < hi:
+        return (curve_x[lo] + curve_x[hi - 1]) / 2
+    x0, x1, y0, y1 = curve_x[lo - 1], curve_x[lo], curve_y[lo - 1], curve_y[lo]
+    return x0 + (x1 - x0) * (target - y0) / (y1 - y0)
+
+
+def ranks(values):
+    """평균 순위 (같은 값은 같은 순위)"""
+    order = sorted(range(len(values)), key=values.__getitem__)
+    out = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            out[order[k]] = (i + j) / 2
+        i = j + 1
+    return out
+
+
+def rank_corr(xs, ys):
+    """Spearman 순위 상관"""
+    rx, ry = ranks(xs), ranks(ys)
+    n = len(rx)
+    mx, my = sum(rx) / n, sum(ry) / n
+    cov = sum((a - mx) * (b - my) for a, b in zip(rx, ry))
+    vx = sum((a - mx) ** 2 for a in rx)
+    vy = sum((b - my) ** 2 for b in ry)
+    return cov / (vx * vy) ** 0.5 if vx and vy else 0.0
+
+
+def fit_isotonic(pairs, pooled):
+    """그룹의 (점수, 초과수익률) → 단조 회귀 → 전체 곡선에서 같은 기대 수익률이 나오는 점수"""
+    gx, gy = pav([p[0] for p in pairs], [p[1] for p in pairs])
+    return gx, [invert(pooled[0], pooled[1], y) for y in gy]
+
+
+# ------------------------------------------------------------------ 학습
+def load_rows(conn):
+    return conn.execute(f"""
+        SELECT id, source, news_type, impact_score
+        FROM news
+        WHERE {CALIBRATED_SQL}
+    """).fetchall()
+
+
+def load_outcomes(db_path, prices_dir, horizon, benchmark):
+    """backtest.py 로 이벤트별 초과수익률 {news id: abn} (pandas/numpy 필요 → 로컬 전용)"""
+    from backtest import load_events, load_prices, run_backtest
+
+    events = load_events(db_path)
+    prices = load_prices(prices_dir, set(events['ticker']) | {benchmark})
+    if not len(prices):
+        print(f"⚠️ {prices_dir}/ 에 가격 파일이 없습니다 → quantile 로 대체")
+        return {}
+    ev = run_backtest(events, prices, [horizon], benchmark if benchmark in prices.index else None)
+    ev = ev[ev[f'abn_{horizon}'].notna()]
+    return dict(zip(ev['id'].tolist(), ev[f'abn_{horizon}'].tolist()))
+
+
+def fit(conn, outcomes=None):
+    """모든 그룹의 보정 함수를 다시 맞춤 → calibration_params 교체 (커밋 포함)"""
+    rows = load_rows(conn)
+    groups = defaultdict(list)
+    # 기준 분포: 뉴스 유형별 / 전체 점수 (출처 무관)
+    reference = defaultdict(list)
+    for news_id, source, news_type, score in rows:
+        key = group_key(source, news_type)
+        groups[key].append((news_id, score))
+        groups[(key[0], ANY)].append((news_id, score))
+        groups[(ANY, ANY)].append((news_id, score))
+        reference[news_type].append(score)
+        reference[ANY].append(score)
+    for values in reference.values():
+        values.sort()
+    if not reference[ANY]:
+        print("⚠️ 보정할 분석 결과가 없습니다")
+        return 0
+
+    pooled = None
+    if outcomes:
+        pairs = [(score, outcomes[i]) for i, score in groups[(ANY, ANY)] if i in outcomes]
+        if len(pairs) >= MIN_GROUP:
+            # 점수가 수익률을 전혀 설명 못 하면 전체 곡선이 평평 → 역함수가 0/10 으로 튐 → quantile 로
+            ic = rank_corr([p[0] for p in pairs], [p[1] for p in pairs])
+            if ic > 2 / len(pairs) ** 0.5:
+                pooled = pav([p[0] for p in pairs], [p[1] for p in pairs])
+            else:
+                print(f"⚠️ 점수-초과수익률 순위상관 {ic:.3f} (n={len(pairs)}) 이 유의하지 않음 → quantile 로 대체")
+
+    fitted = []
+    for (source, news_type), items in groups.items():
+        if len(items) < MIN_GROUP and (source, news_type) != (ANY, ANY):
+            continue
+        pairs = [(score, outcomes[i]) for i, score in items if i in outcomes] if pooled else []
+        if len(pairs) >= MIN_GROUP:
+            method = 'isotonic'
+            xs, ys = fit_isotonic(pairs, pooled)
+        else:
+            method = 'quantile'
+            ref = reference.get(news_type) if news_type != ANY else None
+            xs, ys = fit_quantile([score for _, score in items], ref or reference[ANY])
+        knots = {'x': xs, 'y': [round(y, 3) for y in ys]}
+        fitted.append((source, news_type, method, json.dumps(knots), len(items)))
+
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    conn.execute("DELETE FROM calibration_params")
+    conn.executemany("""
+        INSERT INTO calibration_params (source, news_type, method, knots, n, fitted_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, [(*f, now) for f in fitted])
+    # 매 실행 다시 맞춰도 곡선이 같으면 버전 그대로 (n / fitted_at 은 제외)
+    version = hashlib.sha1(json.dumps(sorted(f[:4] for f in fitted)).encode()).hexdigest()[:12]
+    if get_state(conn, VERSION_KEY) != version:
+        set_state(conn, VERSION_KEY, version)
+    conn.commit()
+    return len(fitted)
+
+
+# ------------------------------------------------------------------ 적용
+def load_params(conn):
+    params = {}
+    try:
+        for source, news_type, knots in conn.execute("SELECT source, news_type, knots FROM calibration_params"):
+            k = json.loads(knots)
+            params[(source, news_type)] = (k['x'], k['y'])
+    except sqlite3.OperationalError:
+        pass
+    return params
+
+
+def calibrate(params, source, news_type, score):
+    """(그룹 → 출처 → 전체) 순서로 보정 함수를 찾아 적용. 없으면 원래 점수"""
+    if score is None:
+        return None
+    key = group_key(source, news_type)
+    curve = params.get(key) or params.get((key[0], ANY)) or params.get((ANY, ANY))
+    if curve is None:
+        return score
+    return round(min(10.0, max(0.0, interp(score, *curve))), 1)
+
+
+def apply_calibration(conn, ids=None, params=None):
+    """impact_calibrated 갱신. ids 가 없으면 전체 (UPDATE 한 번, 행마다 SQLite 함수로 계산)
+
+    보정 대상이 아닌 행(회사를 못 찾은 3.0)은 NULL 로 → 화면에는 원래 점수
+    커밋은 호출한 쪽에서 (분석기는 분석 결과와 같은 트랜잭션)
+    """
+    params = load_params(conn) if params is None else params
+    if not params:
+        return 0
+    conn.create_function('calibrate_score', 3, lambda s, t, v: calibrate(params, s, t, v), deterministic=True)
+    sqls = [
+        f"UPDATE news SET impact_calibrated = calibrate_score(source, news_type, impact_score) WHERE {CALIBRATED_SQL}",
+        f"UPDATE news SET impact_calibrated = NULL WHERE impact_calibrated IS NOT NULL AND NOT ({CALIBRATED_SQL})",
+    ]
+    if ids is None:
+        return sum(conn.execute(sql).rowcount for sql in sqls)
+    ids = list(ids)
+    updated = 0
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        for sql in sqls:
+            updated += conn.execute(sql + f" AND id IN ({','.join('?' * len(chunk))})", chunk).rowcount
+    return updated
+
+
+def calibration_version(conn):
+    try:
+        return get_state(conn, VERSION_KEY)
+    except sqlite3.OperationalError:
+        return None
+
+
+if __name__ == "__main__":
+    from ranking import rank_all
+    from ticker_stats import init_ticker_tables, rebuild
+
+    ap = argparse.ArgumentParser(description="impact_score 보정")
+    ap.add_argument("--db", default="fda_news.db")
+    ap.add_argument("--method", choices=["quantile", "isotonic"], default="quantile")
+    ap.add_argument("--prices", default="prices", help="isotonic: 가격 파일 폴더")
+    ap.add_argument("--horizon", type=int, default=5, help="isotonic: 초과수익률 기간 (거래일)")
+    ap.add_argument("--benchmark", default="XBI")
+    args = ap.parse_args()
+
+    print("\n" + "="*60)
+    print(f"📐 impact_score 보정 ({args.method})")
+    print("="*60 + "\n")
+
+    conn = sqlite3.connect(args.db)
+    migrate(conn)
+    init_calibration_tables(conn)
+    outcomes = load_outcomes(args.db, args.prices, args.horizon, args.benchmark) if args.method == 'isotonic' else None
+    groups = fit(conn, outcomes)
+    updated = apply_calibration(conn)
+    # 집계도 보정 점수 기준이라 다시 계산
+    init_ticker_tables(conn)
+    rebuild(conn)
+    conn.commit()
+    # 중요도 순위도 보정 점수 기준
+    rank_all(conn)
+
+    for source, news_type, method, n, knots in conn.execute("""
+        SELECT source, news_type, method, n, knots FROM calibration_params ORDER BY source, news_type
+    """):
+        k = json.loads(knots)
+        probe = ' '.join(f"{x:g}→{interp(x, k['x'], k['y']):.1f}" for x in (2, 5, 7))
+        print(f"  {source:<8} {news_type:<14} {method:<8} n={n:<6} {probe}")
+    conn.close()
+    print(f"\n✅ 그룹 {groups}개 | 뉴스 {updated}건 보정")
@@ -0,0 +1,89 @@
+# case_bank.py - FDA Drug Hunter 케이스 뱅크 로더
+# 직접 쓴 케이스는 game_data/fda_cases.json ({"version": N, "cases": [...]}),
+# 뉴스에서 자동 생성된 케이스는 fda_news.db 의 game_cases (case_gen.py)
+# 프로세스당 한 번만 읽음. 세션은 케이스 번호를 섞어 둔 덱만 들고 다님
+import json
+import os
+import random
+import sqlite3
+
+CASES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'game_data', 'fda_cases.json')
+DB_PATH = 'fda_news.db'
+
+REQUIRED_FIELDS = ('name', 'company', 'indication', 'phase3_result', 'primary_endpoint',
+                   'biomarker', 'advisory_vote', 'safety', 'answer', 'reason', 'ticker')
+
+
+def db_cases_version(db_path=DB_PATH):
+    """case_gen.py 가 새 케이스를 넣을 때마다 바꾸는 값 (pipeline_state 한 줄)"""
+    if not os.path.exists(db_path):
+        return None
+    conn = sqlite3.connect(db_path)
+    try:
+        row = conn.execute("SELECT value FROM pipeline_state WHERE key = 'case_gen.version'").fetchone()
+        return row[0] if row else None
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+
+
+def bank_version(path=CASES_FILE, db_path=DB_PATH):
+    """캐시 키: 파일 (mtime, size) + 자동 생성 케이스 버전"""
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size, db_cases_version(db_path))
+
+
+def load_db_cases(db_path=DB_PATH):
+    if not os.path.exists(db_path):
+        return []
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(game_cases)")}
+        if not columns:
+            # 아직 case_gen.py 를 안 돌린 DB
+            return []
+        # 넣은 순서 (seq 가 없는 예전 DB 는 news_id 순 = seq 를 처음 채울 때와 같은 순서)
+        order = 'seq' if 'seq' in columns else 'news_id'
+        rows = conn.execute(f"""
+            SELECT name, company, indication, phase3_result, primary_endpoint,
+                   biomarker, advisory_vote, safety, answer, reason, ticker
+            FROM game_cases
+            ORDER BY {order}
+        """).fetchall()
+    finally:
+        conn.close()
+    return [dict(row, answer=bool(row['answer'])) for row in rows]
+
+
+def load_cases(path=CASES_FILE, db_path=DB_PATH):
+    """케이스 목록을 읽어 튜플로 돌려줌 (필수 항목 빠진 케이스, 같은 이름은 건너뜀)
+
+    순서는 JSON → game_cases(넣은 순서 seq) 로 고정이라 케이스가 늘어나도
+    기존 번호는 그대로 → 진행 중인 세션의 덱이 깨지지 않음
+    """
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+
+    cases = []
+    seen = set()
+    for case in data.get('cases', []) + load_db_cases(db_path):
+        missing = [k for k in REQUIRED_FIELDS if k not in case]
+        if missing:
+            print(f"⚠️ 케이스 건너뜀 ({case.get('name', '?')}): {', '.join(missing)} 없음")
+            continue
+        if case['name'] in seen:
+            continue
+        seen.add(case['name'])
+        cases.append(case)
+
+    print(f"📚 케이스 뱅크 v{data.get('version', '?')}: {len(cases)}개")
+    return tuple(cases)
+
+
+def new_deck(size, rng=random):
+    """0..size-1 을 섞은 덱. 앞에서부터 하나씩 꺼내면 중복 없이 O(1)"""
+    deck = list(range(size))
+    rng.shuffle(deck)
+    return deck
@@ -0,0 +1,259 @@
+# case_gen.py - 분석된 뉴스로 FDA Drug Hunter 케이스 자동 생성
+# 승인/반려/경고 뉴스 → LLM이 "결정 전" 케이스 카드로 정리 → game_cases 테이블
+# - 지난 실행 이후 새로 분석된 뉴스만 처리 (pipeline_state 의 (analyzed_at, id) 위치)
+# - 뉴스 여러 건을 한 번에 묻고, 건별 결과는 llm_cache 에 저장 (재실행/실패 재시도 시 재호출 없음)
+import html
+import json
+import re
+import sqlite3
+import time
+from datetime import datetime
+
+from analyzer import cache_get, cache_key, cache_put, call_llm, test_api
+from database import get_state, migrate, set_state
+from tracing import PipelineRun
+
+CASE_TYPES = ('approval', 'rejection', 'warning')
+BATCH_SIZE = 8
+MAX_ROWS = 200  # 한 번 실행에 처리할 최대 뉴스 수
+
+STATE_KEY = 'case_gen.hwm'           # 마지막으로 처리한 (analyzed_at, id)
+BACKFILL_KEY = 'case_gen.backfill_id'  # analyzed_at 이 없는 예전 행은 id 순서로
+
+CASE_FIELDS = ('name', 'company', 'indication', 'phase3_result', 'primary_endpoint',
+               'biomarker', 'advisory_vote', 'safety', 'reason')
+
+PROMPT_VERSION = 'v1'
+PROMPT_HEADER = """아래 제약바이오 뉴스들을 "FDA 승인 예측 게임"의 문제 카드로 만들어 주세요.
+카드에는 FDA 결정 **이전**에 알 수 있던 정보만 넣고, 결과는 decision 과 reason 에만 쓰세요.
+FDA(또는 규제기관)의 승인/반려(CRL)/철회 결정에 관한 뉴스가 아니면 decision 을 "none" 으로 하세요.
+
+각 뉴스마다 아래 키를 가진 JSON 객체를 만들어, 뉴스 순서대로 JSON 배열 하나만 출력하세요:
+{"idx": 번호, "decision": "approved|rejected|withdrawn|none",
+ "name": "제품명 (성분명)", "company": "회사", "indication": "적응증 (한국어)",
+ "phase3_result": "핵심 임상 결과 요약", "primary_endpoint": "1차 평가변수와 수치",
+ "biomarker": "바이오마커/대리지표 (없으면 N/A)", "advisory_vote": "자문위원회 결과 (없으면 N/A)",
+ "safety": "주요 안전성 이슈 (없으면 N/A)", "reason": "실제 결정과 그 이유 (한국어 1~2문장)"}
+모르는 항목은 "N/A" 로 쓰세요.
+"""
+
+
+def init_case_tables(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS game_cases (
+            news_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            company TEXT,
+            indication TEXT,
+            phase3_result TEXT,
+            primary_endpoint TEXT,
+            biomarker TEXT,
+            advisory_vote TEXT,
+            safety TEXT,
+            answer INTEGER NOT NULL,
+            reason TEXT,
+            ticker TEXT,
+            link TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_game_cases_name ON game_cases(name)")
+    # 넣은 순서 번호 (case_bank 의 케이스 번호 순서). news_id 는 예전 뉴스가 나중에 들어올 수 있어서 안 됨
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(game_cases)")}
+    if 'seq' not in columns:
+        conn.execute("ALTER TABLE game_cases ADD COLUMN seq INTEGER")
+        # 기존 케이스는 지금까지 쓰던 순서(news_id) 그대로
+        conn.execute("""
+            UPDATE game_cases SET seq = (SELECT COUNT(*) FROM game_cases g WHERE g.news_id <= game_cases.news_id)
+        """)
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_game_cases_seq ON game_cases(seq)")
+    conn.commit()
+
+
+def clean_text(text):
+    # FierceBiotech 제목에는 <a> 태그가 들어있음
+    return html.unescape(re.sub(r'<[^>]+>', '', text or '')).strip()
+
+
+def item_key(row):
+    news_id, title, summary, ticker, news_type = row[:5]
+    return cache_key('case_gen', PROMPT_VERSION, clean_text(title), clean_text(summary)[:500], ticker)
+
+
+def build_prompt(rows):
+    lines = [PROMPT_HEADER]
+    for idx, row in enumerate(rows):
+        news_id, title, summary, ticker, news_type = row[:5]
+        lines.append(f"[{idx}] ({ticker}, {news_type}) {clean_text(title)}\n{clean_text(summary)[:500]}")
+    return "\n\n".join(lines)
+
+
+def parse_cases(content):
+    """응답에서 JSON 배열만 꺼냄 (```json 감싸기 등 허용)"""
+    match = re.search(r'\[.*\]', content or '', re.S)
+    if not match:
+        return []
+    try:
+        items = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return []
+    return [item for item in items if isinstance(item, dict)]
+
+
+def extract_batch(conn, rows, run):
+    """rows → {news_id: case dict 또는 None}. 캐시에 있는 건 묻지 않음"""
+    results = {}
+    todo = []
+    with run.timer('llm_cache') as span:
+        for row in rows:
+            cached = cache_get(conn, item_key(row))
+            if cached is None:
+                todo.append(row)
+            else:
+                results[row[0]] = json.loads(cached)
+                span.count += 1
+
+    # 응답에서 빠진 뉴스는 한 번 더 (그래도 없으면 캐시하지 않음 → 다시 돌릴 때 또 물어봄)
+    for _ in range(2):
+        if not todo:
+            break
+        try:
+            content = call_llm(build_prompt(todo), max_tokens=350 * len(todo), temperature=0.1,
+                               run=run, timeout=90)
+        except Exception as e:
+            print(f"❌ {e}")
+            content = None
+        if content is None:
+            return results, False  # API 오류 → 위치를 옮기지 않고 다음 실행에서 재시도
+        by_idx = {item.get('idx'): item for item in parse_cases(content)}
+        missing = []
+        for idx, row in enumerate(todo):
+            item = by_idx.get(idx)
+            if item is None:
+                missing.append(row)
+                continue
+            results[row[0]] = item
+            cache_put(conn, item_key(row), json.dumps(item, ensure_ascii=False))
+        conn.commit()
+        todo = missing
+
+    return results, True
+
+
+def to_case(row, item):
+    news_id, title, summary, ticker, news_type, link = row[:6]
+    if not item or item.get('decision') not in ('approved', 'rejected', 'withdrawn'):
+        return None
+    case = {k: str(item.get(k) or 'N/A').strip()[:300] for k in CASE_FIELDS}
+    if case['name'] == 'N/A':
+        return None
+    return (news_id, case['name'], case['company'], case['indication'], case['phase3_result'],
+            case['primary_endpoint'], case['biomarker'], case['advisory_vote'], case['safety'],
+            1 if item['decision'] == 'approved' else 0, case['reason'], ticker or 'N/A', link)
+
+
+def select_rows(conn, limit):
+    """새로 분석된 후보 뉴스 + 아직 안 본 예전(analyzed_at 없음) 뉴스"""
+    placeholders = ','.join('?' * len(CASE_TYPES))
+    backfill_id = int(get_state(conn, BACKFILL_KEY, 0))
+    old = conn.execute(f"""
+        SELECT id, title, summary, ticker, news_type, link, analyzed_at
+        FROM news
+        WHERE analyzed = 1 AND analyzed_at IS NULL AND id > ?
+          AND news_type IN ({placeholders}) AND ticker IS NOT NULL AND ticker != 'NONE'
+        ORDER BY id
+        LIMIT ?
+    """, (backfill_id, *CASE_TYPES, limit)).fetchall()
+
+    hwm_at, hwm_id = (get_state(conn, STATE_KEY) or '|0').split('|')
+    new = conn.execute(f"""
+        SELECT id, title, summary, ticker, news_type, link, analyzed_at
+        FROM news
+        WHERE analyzed_at >= ? AND (analyzed_at > ? OR id > ?)
+          AND news_type IN ({placeholders}) AND ticker IS NOT NULL AND ticker != 'NONE'
+        ORDER BY analyzed_at, id
+        LIMIT ?
+    """, (hwm_at, hwm_at, int(hwm_id), *CASE_TYPES, max(0, limit - len(old)))).fetchall()
+    return old + new
+
+
+def advance(conn, row):
+    """이 행까지 처리했다고 기록 (케이스 저장과 같은 트랜잭션)"""
+    news_id, analyzed_at = row[0], row[6]
+    if analyzed_at is None:
+        set_state(conn, BACKFILL_KEY, news_id)
+    else:
+        set_state(conn, STATE_KEY, f"{analyzed_at}|{news_id}")
+
+
+def generate_cases(db_path='fda_news.db', limit=MAX_ROWS):
+    print("\n" + "="*60)
+    print("🎮 FDA Drug Hunter 케이스 생성")
+    print("="*60 + "\n")
+
+    run = PipelineRun('case_gen', db_path=db_path)
+    conn = sqlite3.connect(db_path)
+    migrate(conn)
+    init_case_tables(conn)
+
+    with run.span('select_new') as span:
+        rows = select_rows(conn, limit)
+        span.count = len(rows)
+
+    if not rows:
+        print("✅ 새로 처리할 뉴스 없음")
+        conn.close()
+        run.finish(status='empty')
+        return 0
+
+    if not test_api():
+        conn.close()
+        run.finish(status='api_error')
+        return 0
+
+    print(f"📰 후보 뉴스 {len(rows)}건\n")
+    created = 0
+    status = 'ok'
+
+    for start in range(0, len(rows), BATCH_SIZE):
+        batch = rows[start:start + BATCH_SIZE]
+        results, ok = extract_batch(conn, batch, run)
+        if not ok:
+            status = 'api_error'
+            break
+
+        with run.timer('insert') as span:
+            for row in batch:
+                case = to_case(row, results.get(row[0]))
+                span.count += 1
+                if case:
+                    cur = conn.execute("""
+                        INSERT OR IGNORE INTO game_cases
+                            (news_id, name, company, indication, phase3_result, primary_endpoint,
+                             biomarker, advisory_vote, safety, answer, reason, ticker, link, seq)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                                (SELECT COALESCE(MAX(seq), 0) + 1 FROM game_cases))
+                    """, case)
+                    if cur.rowcount:
+                        created += 1
+                        print(f"  ✅ {case[1]} ({'승인' if case[9] else '반려/철회'})")
+                else:
+                    span.skipped += 1
+                advance(conn, row)
+            if created:
+                set_state(conn, 'case_gen.version', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            conn.commit()
+
+        time.sleep(1)
+
+    conn.close()
+    run.finish(status=status)
+
+    print("\n" + "="*60)
+    print(f"🎉 새 케이스 {created}개 (후보 {len(rows)}건)")
+    print("="*60)
+    return created
+
+
+if __name__ == "__main__":
+    generate_cases()
@@ -0,0 +1,402 @@
+# catalysts.py - 규제 일정 (PDUFA 목표일 / FDA 자문위원회) 추출 → catalysts 테이블
+# 분석기가 분석을 마친 새 행만 (analyzed_at|id 기준 진행 위치) 한 번에 모아서 처리
+# 본문을 받아 둔 글(article_fetcher.py)은 본문에서, 아니면 RSS 요약에서
+#   1. 정규식: "PDUFA" / "advisory committee" 같은 말 바로 뒤(없으면 바로 앞)의 날짜 표현
+#      날짜 문법: July 23, 2026 / 23 July 2026 / 2026-07-23 / July 2026 / Q3 2026 / second half of 2026 / year-end 2026
+#      날짜가 기간이면 마지막 날로 저장 (그 날까지는 결정이 나옴) + 정밀도(day/month/quarter/half/year)
+#   2. 일정 단어는 있는데 날짜를 못 찾은 행만 LLM (분석기의 cached_completion → 같은 글은 다시 안 부름)
+#      호출이 실패한 행은 진행 위치와 따로 pipeline_state 에 남겨 다음 실행에 다시 (MAX_RETRIES 번까지)
+# 캘린더 화면은 catalysts(event_date) 인덱스 구간만 읽음 → 몇 년 치가 쌓여도 바로 열림
+# 문법을 고치면 다음 실행 때 전체 다시 추출 (문법 해시를 pipeline_state 에 저장)
+# 사용법: python catalysts.py [--rebuild] [--llm] [--days 90]
+import argparse
+import calendar
+import hashlib
+import json
+import re
+import sqlite3
+from datetime import date, datetime, timedelta
+
+from article_fetcher import load_bodies
+from database import get_state, migrate, set_state
+from entities import clean_text
+
+HWM_KEY = 'catalysts.hwm'          # 마지막으로 본 "analyzed_at|id"
+GRAMMAR_KEY = 'catalysts.grammar'
+RETRY_KEY = 'catalysts.retry'      # LLM 호출이 실패한 행 {id: 시도 횟수} → 다음 실행에 다시
+VERSION_KEY = 'catalysts.version'
+
+BATCH_SIZE = 500
+MAX_RETRIES = 3
+WINDOW_AFTER = 160   # 일정 단어 뒤 이만큼 안의 날짜
+WINDOW_BEFORE = 80   # 뒤에 없으면 앞 ("On March 5, 2026, the advisory committee ...")
+LLM_TEXT_LIMIT = 1500
+
+EVENT_LABELS = {'pdufa': 'PDUFA', 'adcom': '자문위원회'}
+PRECISION_LABELS = {'day': '일', 'month': '월', 'quarter': '분기', 'half': '반기', 'year': '연'}
+
+EVENTS = [
+    ('pdufa', r'PDUFA|Prescription Drug User Fee Act|(?:target )?action date|goal date'),
+    # CDC 예방접종 자문위원회(ACIP)는 FDA 일정이 아님
+    ('adcom', r'advisory committee(?! (?:on|for) immunization)|\badcom\b|\bODAC\b|\bVRBPAC\b|\bCTGTAC\b'),
+]
+EVENT_RES = [(kind, re.compile(pattern, re.IGNORECASE)) for kind, pattern in EVENTS]
+
+MONTHS = {
+    'January': 1, 'February': 2, 'March': 3, 'April': 4, 'May': 5, 'June': 6, 'July': 7,
+    'August': 8, 'September': 9, 'October': 10, 'November': 11, 'December': 12,
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'Jun': 6, 'Jul': 7, 'Aug': 8,
+    'Sep': 9, 'Sept': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12,
+}
+ORDINALS = {'first': 1, '1st': 1, 'second': 2, '2nd': 2, 'third': 3, '3rd': 3, 'fourth': 4, '4th': 4}
+
+# 월 이름은 대소문자 구분 (소문자 may 는 조동사)
+MONTH = r'(' + '|'.join(sorted(MONTHS, key=len, reverse=True)) + r')\.?'
+YEAR = r'((?:19|20)\d{2})'
+ORDINAL = r'(?i:(first|second|third|fourth|1st|2nd|3rd|4th))'
+
+# (정밀도, 정규식) - 앞에 있는 것이 우선 (겹치면 먼저 잡힌 것)
+DATE_PATTERNS = [
+    ('day', rf'\b{MONTH}\s+(\d{{1,2}})(?:st|nd|rd|th)?,?\s+{YEAR}\b'),
+    ('day_dmy', rf'\b(\d{{1,2}})\s+{MONTH}\s+{YEAR}\b'),
+    ('day_iso', rf'\b{YEAR}-(\d{{2}})-(\d{{2}})\b'),
+    ('month', rf'\b{MONTH},?\s+(?:of\s+)?{YEAR}\b'),
+    ('quarter', rf'\b(?:Q([1-4])|([1-4])Q|{ORDINAL}[- ](?i:quarter)(?:\s+of)?)[\s,]*{YEAR}\b'),
+    ('half', rf'\b(?:H([12])|([12])H|{ORDINAL}[- ](?i:half)(?:\s+of)?)[\s,]*{YEAR}\b'),
+    ('year', rf'(?i:\b(?:(?:by )?(?:the )?end of|year-end|year end)\s+){YEAR}\b'),
+]
+DATE_RES = [(kind, re.compile(pattern)) for kind, pattern in DATE_PATTERNS]
+SENTENCE_BREAK = re.compile(r'[.!?;]\s+[A-Z]|\n')
+
+LLM_PROMPT = """Find FDA regulatory catalyst dates in this biotech news.
+
+Title: {title}
+Text: {text}
+
+Answer in this exact format (write NONE if the date is not stated):
+PDUFA: [PDUFA target action date, e.g. July 23, 2026 or Q3 2026]
+AdCom: [FDA advisory committee meeting date, e.g. March 5, 2026]"""
+LLM_LINE = re.compile(r'^\W*(PDUFA|AdCom)\W*:\s*(.+)$', re.IGNORECASE | re.MULTILINE)
+
+
+def grammar_hash():
+    data = [EVENTS, DATE_PATTERNS, WINDOW_AFTER, WINDOW_BEFORE]
+    return hashlib.sha1(json.dumps(data).encode()).hexdigest()[:12]
+
+
+def init_catalyst_tables(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS catalysts (
+            id INTEGER PRIMARY KEY,
+            news_id INTEGER NOT NULL,
+            ticker TEXT,
+            event_type TEXT NOT NULL,   -- pdufa / adcom
+            event_date TEXT NOT NULL,   -- YYYY-MM-DD (기간이면 마지막 날)
+            precision TEXT NOT NULL,    -- day / month / quarter / half / year
+            label TEXT,                 -- 2026-07-23 / 2026 Q3 ...
+            snippet TEXT,
+            method TEXT NOT NULL,       -- regex / llm
+            UNIQUE (news_id, event_type, event_date)
+        )
+    """)
+    # 캘린더: 날짜 구간 / 티커 하나의 일정을 날짜순으로
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_catalysts_date ON catalysts(event_date)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_catalysts_ticker ON catalysts(ticker, event_date)")
+
+
+# ------------------------------------------------------------------ 날짜 문법
+def month_end(year, month):
+    return date(year, month, calendar.monthrange(year, month)[1])
+
+
+def to_event_date(kind, groups):
+    """정규식 그룹 → (마지막 날, 정밀도, 표시용). 없는 날짜(2월 30일)면 None"""
+    try:
+        if kind == 'day':
+            month, day, year = MONTHS[groups[0]], int(groups[1]), int(groups[2])
+        elif kind == 'day_dmy':
+            day, month, year = int(groups[0]), MONTHS[groups[1]], int(groups[2])
+        elif kind == 'day_iso':
+            year, month, day = map(int, groups)
+        elif kind == 'month':
+            year, month = int(groups[1]), MONTHS[groups[0]]
+            return month_end(year, month), 'month', f"{year}-{month:02d}"
+        elif kind == 'quarter':
+            n = int(groups[0] or groups[1] or ORDINALS[groups[2].lower()])
+            year = int(groups[3])
+            return month_end(year, n * 3), 'quarter', f"{year} Q{n}"
+        elif kind == 'half':
+            n = int(groups[0] or groups[1] or ORDINALS[groups[2].lower()])
+            if n > 2:
+                return None
+            year = int(groups[3])
+            return month_end(year, n * 6), 'half', f"{year} H{n}"
+        else:
+            year = int(groups[0])
+            return date(year, 12, 31), 'year', str(year)
+        return date(year, month, day), 'day', f"{year}-{month:02d}-{day:02d}"
+    except ValueError:
+        return None
+
+
+def find_dates(text):
+    """[(시작, 끝, 날짜, 정밀도, 표시용)] 글 순서대로 (겹치는 표현은 앞 패턴이 우선)"""
+    found = []
+    taken = []
+    for kind, regex in DATE_RES:
+        for match in regex.finditer(text):
+            start, end = match.span()
+            if any(start < e and s < end for s, e in taken):
+                continue
+            parsed = to_event_date(kind, match.groups())
+            if parsed:
+                taken.append((start, end))
+                found.append((start, end, *parsed))
+    return sorted(found)
+
+
+def plausible(event_date, pub_date):
+    """발표일 기준 1년 전 ~ 3년 뒤 (그 밖은 연도 오인식이거나 다른 이야기)"""
+    try:
+        year = int(pub_date[:4])
+    except (TypeError, ValueError):
+        year = date.today().year
+    return year - 1 <= event_date.year <= year + 3
+
+
+def extract(title, summary, pub_date=None):
+    """문서 → [(종류, 날짜, 정밀도, 표시용, 문장 조각)]. 일정 단어가 있는데 날짜를 못 찾으면 None"""
+    text = ' '.join(clean_text(f"{title or ''}. {summary or ''}").split())
+    dates = None
+    events = {}
+    mentioned = False
+    for kind, regex in EVENT_RES:
+        for match in regex.finditer(text):
+            mentioned = True
+            if dates is None:
+                dates = find_dates(text)
+            s, e = match.span()
+            # 같은 문장 안, 뒤쪽 가장 가까운 날짜 → 없으면 앞쪽 가장 가까운 날짜
+            after = [d for d in dates if e <= d[0] <= e + WINDOW_AFTER and not SENTENCE_BREAK.search(text, e, d[0])]
+            before = [d for d in dates if s - WINDOW_BEFORE <= d[1] <= s and not SENTENCE_BREAK.search(text, d[1], s)]
+            near = after[0] if after else (before[-1] if before else None)
+            if near is None or not plausible(near[2], pub_date):
+                continue
+            start, end, event_date, precision, label = near
+            snippet = text[max(0, min(s, start) - 40):max(e, end) + 40].strip()
+            events.setdefault((kind, event_date), (kind, event_date.isoformat(), precision, label, snippet))
+    if mentioned and not events:
+        return None
+    return list(events.values())
+
+
+def extract_llm(llm, title, summary, pub_date=None):
+    """정규식으로 못 찾은 글 → LLM 답을 같은 날짜 문법으로 읽음
+
+    호출이 실패하면 None (일정 없음 [] 과 구분 → 호출한 쪽이 나중에 다시)
+    """
+    text = ' '.join(clean_text(summary).split())[:LLM_TEXT_LIMIT]
+    try:
+        content = llm(LLM_PROMPT.format(title=clean_text(title), text=text or 'N/A'))
+    except Exception as e:
+        # 보조 단계라 실패해도 분석 결과 저장/스냅샷은 계속
+        print(f"⚠️ 일정 LLM 실패: {e}")
+        return None
+    if content is None:
+        return None
+    events = []
+    for name, value in LLM_LINE.findall(content):
+        dates = find_dates(value)
+        if not dates or not plausible(dates[0][2], pub_date):
+            continue
+        _, _, event_date, precision, label = dates[0]
+        events.append(('pdufa' if name.lower() == 'pdufa' else 'adcom',
+                       event_date.isoformat(), precision, label, value.strip()[:200]))
+    return events
+
+
+# ------------------------------------------------------------------ 저장
+def extract_rows(conn, rows, llm=None, failed=None):
+    """[(id, ticker, title, summary, pub_date)] 추출 (그 행의 이전 일정은 지우고 다시). 커밋은 호출한 쪽에서
+
+    llm 이 없으면 LLM 으로 찾았던 일정은 그대로 둠. LLM 호출이 실패한 행은 건드리지 않고 failed 에 id 추가
+    반환: 저장한 일정 수
+    """
+    # 본문을 받아 둔 글은 본문에서 (요약은 앞부분만이라 날짜가 잘려 있는 일이 많음)
+    bodies = load_bodies([row[0] for row in rows])
+    found = []
+    skipped = set()
+    for news_id, ticker, title, summary, pub_date in rows:
+        summary = bodies.get(news_id) or summary
+        events = extract(title, summary, pub_date)
+        method = 'regex'
+        if events is None:
+            if llm is None:
+                continue
+            events, method = extract_llm(llm, title, summary, pub_date), 'llm'
+            if events is None:
+                skipped.add(news_id)
+                continue
+        found += [(news_id, ticker, *event, method) for event in events]
+    if failed is not None:
+        failed += sorted(skipped)
+
+    keep = "" if llm is not None else "AND method = 'regex'"
+    news_ids = [row[0] for row in rows if row[0] not in skipped]
+    deleted = 0
+    for start in range(0, len(news_ids), 500):
+        chunk = news_ids[start:start + 500]
+        deleted += conn.execute(f"DELETE FROM catalysts WHERE news_id IN ({','.join('?' * len(chunk))}) {keep}",
+                                chunk).rowcount
+    conn.executemany("""
+        INSERT OR IGNORE INTO catalysts (news_id, ticker, event_type, event_date, precision, label, snippet, method)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, found)
+    if found or deleted:
+        set_state(conn, VERSION_KEY, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    return len(found)
+
+
+def extract_new(conn, llm=None):
+    """진행 위치 이후에 분석된 행만 BATCH_SIZE 씩 (분석기가 분석 직후 호출). 커밋은 호출한 쪽에서
+
+    처음 실행 / 문법이 바뀌었으면 분석된 행 전체 (analyzed_at 이 없는 예전 행 포함)
+    """
+    migrate(conn)
+    init_catalyst_tables(conn)
+    hwm = get_state(conn, HWM_KEY)
+    if get_state(conn, GRAMMAR_KEY) != grammar_hash():
+        hwm = None
+    retries = json.loads(get_state(conn, RETRY_KEY) or '{}')
+    failed = []
+    extracted = 0
+    if hwm is None:
+        last_id = 0
+        while True:
+            rows = conn.execute("""
+                SELECT id, ticker, title, summary, pub_date FROM news
+                WHERE analyzed = 1 AND id > ? ORDER BY id LIMIT ?
+            """, (last_id, BATCH_SIZE)).fetchall()
+            if not rows:
+                break
+            extracted += extract_rows(conn, rows, llm, failed)
+            last_id = rows[-1][0]
+        row = conn.execute("""
+            SELECT analyzed_at, id FROM news WHERE analyzed_at IS NOT NULL
+            ORDER BY analyzed_at DESC, id DESC LIMIT 1
+        """).fetchone()
+        set_state(conn, HWM_KEY, f"{row[0]}|{row[1]}" if row else "|0")
+        set_state(conn, GRAMMAR_KEY, grammar_hash())
+        # 전체를 다시 봤으니 예전 재시도 목록은 이번 실패로 대체
+        save_retries(conn, {}, failed, llm)
+        return extracted
+
+    # 지난번에 LLM 호출이 실패한 행부터 (진행 위치는 이미 지나갔음)
+    if retries and llm is not None:
+        ids = [int(i) for i in retries]
+        rows = conn.execute(f"""
+            SELECT id, ticker, title, summary, pub_date FROM news
+            WHERE analyzed = 1 AND id IN ({','.join('?' * len(ids))})
+        """, ids).fetchall()
+        extracted += extract_rows(conn, rows, llm, failed)
+
+    at, _, news_id = hwm.rpartition('|')
+    news_id = int(news_id or 0)
+    while True:
+        rows = conn.execute("""
+            SELECT id, ticker, title, summary, pub_date, analyzed_at FROM news
+            WHERE analyzed = 1 AND (analyzed_at > ? OR (analyzed_at = ? AND id > ?))
+            ORDER BY analyzed_at, id
+            LIMIT ?
+        """, (at, at, news_id, BATCH_SIZE)).fetchall()
+        if not rows:
+            break
+        extracted += extract_rows(conn, [row[:5] for row in rows], llm, failed)
+        at, news_id = rows[-1][5], rows[-1][0]
+        set_state(conn, HWM_KEY, f"{at}|{news_id}")
+        if len(rows) < BATCH_SIZE:
+            break
+    save_retries(conn, retries, failed, llm)
+    return extracted
+
+
+def save_retries(conn, retries, failed, llm):
+    """LLM 호출이 실패한 행을 다음 실행에 다시 (MAX_RETRIES 번까지). llm 없이 돌렸으면 목록 그대로"""
+    if llm is None:
+        return
+    pending = {}
+    for news_id in failed:
+        attempts = retries.get(str(news_id), 0) + 1
+        if attempts < MAX_RETRIES:
+            pending[str(news_id)] = attempts
+        else:
+            print(f"⚠️ 일정 LLM {attempts}번 실패 → 포기: news {news_id}")
+    value = json.dumps(pending, sort_keys=True)
+    if value != (get_state(conn, RETRY_KEY) or '{}'):
+        set_state(conn, RETRY_KEY, value)
+
+
+# ------------------------------------------------------------------ 조회
+def upcoming(conn, start, end, ticker=None, event_types=None, limit=500):
+    """start <= 날짜 < end 일정, 날짜순 (같은 티커/종류/날짜는 가장 최근 뉴스 하나만)
+
+    반환: [(날짜, 정밀도, 표시용, 종류, 티커, 한줄요약, 발표시간, 원문, 방법)]
+    """
+    where = ["c.event_date >= ?", "c.event_date < ?"]
+    params = [str(start), str(end)]
+    if ticker:
+        where.append("c.ticker = ?")
+        params.append(ticker)
+    if event_types:
+        where.append(f"c.event_type IN ({','.join('?' * len(event_types))})")
+        params += list(event_types)
+    params.append(limit)
+    # MAX(pub_date) 와 같이 고른 컬럼은 그 행의 값 (SQLite)
+    return conn.execute(f"""
+        SELECT c.event_date, c.precision, c.label, c.event_type, c.ticker,
+               COALESCE(n.summary_ko, n.title), MAX(n.pub_date), n.link, c.method
+        FROM catalysts c JOIN news n ON n.id = c.news_id
+        WHERE {' AND '.join(where)}
+        GROUP BY COALESCE(c.ticker, c.news_id), c.event_type, c.event_date
+        ORDER BY c.event_date, c.ticker
+        LIMIT ?
+    """, params).fetchall()
+
+
+def catalysts_version(db_path='fda_news.db'):
+    """화면 캐시 키 (일정이 바뀔 때마다 바뀜)"""
+    conn = sqlite3.connect(db_path)
+    try:
+        return get_state(conn, VERSION_KEY)
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="PDUFA / 자문위원회 일정 추출")
+    ap.add_argument("--db", default="fda_news.db")
+    ap.add_argument("--rebuild", action="store_true", help="분석된 뉴스 전체 다시 추출")
+    ap.add_argument("--llm", action="store_true", help="날짜를 못 찾은 글은 LLM 으로 (PERPLEXITY_API_KEY 필요)")
+    ap.add_argument("--days", type=int, default=90, help="앞으로 N일 일정 출력")
+    args = ap.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    migrate(conn)
+    init_catalyst_tables(conn)
+    if args.rebuild:
+        set_state(conn, GRAMMAR_KEY, '')
+    llm = None
+    if args.llm:
+        from analyzer import cached_completion
+        llm = lambda prompt: cached_completion(conn, prompt, max_tokens=80, temperature=0)
+    extracted = extract_new(conn, llm)
+    conn.commit()
+    print(f"📅 일정 {extracted}건 추출")
+
+    today = date.today()
+    for event_date, precision, label, kind, ticker, summary, _, _, method in upcoming(
+            conn, today, today + timedelta(days=args.days)):
+        print(f"  {label:<10} {EVENT_LABELS[kind]:<6} {ticker or '-':<6} {method:<5} {clean_text(summary)[:60]}")
+    conn.close()
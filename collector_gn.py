@@ -1,8 +1,12 @@
 # collector_gn.py
 import feedparser
+import requests
 import sqlite3
 from datetime import datetime
 
+from entities import tag_new
+from tracing import PipelineRun
+
 from dateutil import parser  # 맨 위 import 쪽에 추가
 
 CLINICAL_KEYWORDS = [
@@ -26,13 +30,31 @@ def collect_news():
     print("📰 globalnewswire 뉴스 수집 시작")
     print("="*70 + "\n")
 
-    # RSS 파싱
+    run = PipelineRun('collector', source='globe')
+
+    # RSS 가져오기 + 파싱
     print(f"🔗 RSS: {RSS_URL}")
-    feed = feedparser.parse(RSS_URL)
+    with run.span('fetch', url=RSS_URL) as span:
+        try:
+            r = requests.get(RSS_URL, headers={'User-Agent': feedparser.USER_AGENT}, timeout=30)
+            raw = r.content
+            span.bytes = len(raw)
+            if r.status_code != 200:
+                span.status = f"http_{r.status_code}"
+        except Exception as e:
+            print(f"❌ RSS 요청 실패: {e}")
+            span.status = 'error'
+            span.meta['error'] = str(e)[:200]
+            raw = b''
+
+    with run.span('parse') as span:
+        feed = feedparser.parse(raw)
+        span.count = len(feed.entries)
 
     if not feed.entries:
         print("❌ RSS에서 뉴스를 가져오지 못했습니다!")
         print("📦 feedparser 설치 확인: pip install feedparser")
+        run.finish(status='empty')
         return
 
     print(f"✅ RSS에서 {len(feed.entries)}개 항목 발견\n")
@@ -50,14 +72,22 @@ def collect_news():
         summary = entry.get('summary', entry.get('description', ''))[:500]
         guid = entry.get('id', link)
 
-        text = f"{title} {summary}".lower()
-        if not any(k in text for k in CLINICAL_KEYWORDS):
+        with run.timer('filter') as span:
+            text = f"{title} {summary}".lower()
+            relevant = any(k in text for k in CLINICAL_KEYWORDS)
+            span.count += 1
+            span.skipped += not relevant
+        if not relevant:
             skip_count += 1
             continue
 
         # 중복 체크 (link 기준) - FDA/다른 소스와도 공통으로 막힘
-        cursor.execute("SELECT id FROM news WHERE link = ?", (link,))
-        if cursor.fetchone():
+        with run.timer('dedup') as span:
+            cursor.execute("SELECT id FROM news WHERE link = ?", (link,))
+            duplicate = cursor.fetchone() is not None
+            span.count += 1
+            span.skipped += duplicate
+        if duplicate:
             skip_count += 1
             continue
 
@@ -80,23 +110,33 @@ def collect_news():
 
         # DB 저장 (source='globe')
         try:
-            cursor.execute("""
-INSERT INTO news (guid, title, link, pub_date, summary, analyzed, source)
-VALUES (?, ?, ?, ?, ?, 0, 'globe')
-""", (guid, title, link, pub_date_str, summary))
+            with run.timer('insert') as span:
+                cursor.execute("""
+    INSERT INTO news (guid, title, link, pub_date, summary, analyzed, source)
+    VALUES (?, ?, ?, ?, ?, 0, 'globe')
+    """, (guid, title, link, pub_date_str, summary))
+                span.count += 1
 
             print(f"✅ [globe] [{pub_date_str}] {title[:70]}...")
             new_count += 1
         except sqlite3.IntegrityError:
             # UNIQUE 제약 위반 (guid/guid+link 중복)
+            span.skipped += 1
             skip_count += 1
             continue
         except Exception as e:
             print(f"❌ 저장 실패: {e}")
             continue
 
-    conn.commit()
+    with run.timer('insert'):
+        conn.commit()
+    
+    # 약물/적응증 태깅 (entities.py): 방금 넣은 행만
+    with run.span('entities') as span:
+        span.count = tag_new(conn)
+        conn.commit()
     conn.close()
+    run.finish()
 
     print("\n" + "="*70)
     print(f"🎉 GlobeNewswire(Biotech) 수집 완료: 신규 {new_count}건 | 중복 {skip_count}건")
@@ -1,9 +1,83 @@
 # database.py
 import sqlite3
 
+# 처음 스키마 이후에 추가된 컬럼들 (기존 DB는 migrate()에서 ALTER TABLE)
+EXTRA_COLUMNS = {
+    'source': "TEXT DEFAULT 'fda'",
+    'summary_ko': 'TEXT',
+    'analyzed_at': 'TIMESTAMP',
+    'impact_calibrated': 'REAL',  # calibration.py
+    'rank_score': 'REAL',         # ranking.py
+    'topic_id': 'INTEGER',        # topics.py
+}
 
-def init_database():
-    conn = sqlite3.connect('fda_news.db')
+
+def migrate(conn):
+    """기존 fda_news.db에 빠진 컬럼/인덱스 추가 (여러 번 실행해도 안전)"""
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(news)")}
+    for name, col_type in EXTRA_COLUMNS.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE news ADD COLUMN {name} {col_type}")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_news_analyzed_at ON news(analyzed_at)")
+    # 티커 상세 페이지: 티커 하나의 뉴스를 발표시간 순으로 (정렬 없이 인덱스 순서대로)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_news_ticker_pub ON news(ticker, pub_date)")
+    # 대시보드 중요도 순: 인덱스를 뒤에서부터 읽다가 30건 모이면 끝
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_news_rank ON news(rank_score)")
+    # 주제 필터: 주제 하나를 중요도 순으로
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_news_topic ON news(topic_id, rank_score)")
+
+    # 배치 파이프라인 진행 위치 (어디까지 처리했는지) - key/value
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS pipeline_state (
+            key TEXT PRIMARY KEY,
+            value TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    # LLM 응답 캐시 (같은 프롬프트는 다시 호출하지 않음)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            key TEXT PRIMARY KEY,
+            model TEXT,
+            response TEXT,
+            tokens INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.commit()
+
+
+# analyzed_at 을 거치지 않는 일괄 변경(reset.py 등)마다 +1 → NewsStore 가 전체 재동기화
+NEWS_GENERATION_KEY = 'news.generation'
+
+
+def get_state(conn, key, default=None):
+    row = conn.execute("SELECT value FROM pipeline_state WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else default
+
+
+def set_state(conn, key, value):
+    """커밋은 호출한 쪽에서 (처리 결과와 같은 트랜잭션으로 저장)"""
+    conn.execute("""
+        INSERT INTO pipeline_state (key, value, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+    """, (key, str(value)))
+
+
+def bump_news_generation(conn):
+    """커밋은 호출한 쪽에서"""
+    set_state(conn, NEWS_GENERATION_KEY, int(get_state(conn, NEWS_GENERATION_KEY, 0)) + 1)
+
+
+def news_generation(conn):
+    try:
+        return get_state(conn, NEWS_GENERATION_KEY)
+    except sqlite3.OperationalError:
+        return None
+
+
+def init_database(db_path='fda_news.db'):
+    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -23,14 +97,18 @@ def init_database():
             impact_score REAL,
             analyzed INTEGER DEFAULT 0,
             source TEXT DEFAULT 'fda',
+            summary_ko TEXT,
+            analyzed_at TIMESTAMP,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     """)
 
     conn.commit()
+    migrate(conn)
     conn.close()
     print("✅ 데이터베이스 생성 완료!")
 
 
 if __name__ == "__main__":
     init_database()
+
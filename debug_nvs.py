@@ -1,9 +1,11 @@
 # debug_nvs.py
-import sqlite3
 import pandas as pd
 from datetime import datetime, timedelta
 
-conn = sqlite3.connect('fda_news.db')
+from news_store import NewsStore
+
+store = NewsStore('fda_news.db')
+store.refresh()
 
 print("\n" + "="*70)
 print("🔍 NVS 데이터 디버깅")
@@ -11,77 +13,50 @@ print("="*70 + "\n")
 
 # 1. Novartis 관련 모든 뉴스 확인
 print("📰 1. Novartis 관련 전체 뉴스 (analyzed 무관)")
-df1 = pd.read_sql_query("""
-SELECT id, pub_date, title, ticker, analyzed, impact_score
-FROM news
-WHERE title LIKE '%Novartis%' OR title LIKE '%NVS%' OR title LIKE '%Itvisma%'
-ORDER BY id DESC
-""", conn)
+titles = pd.Series(store.column('title')).fillna('')
+nvs = titles.str.contains('Novartis|NVS|Itvisma', case=False).to_numpy()
+df1 = store.frame(['id', 'pub_date', 'title', 'ticker', 'analyzed', 'impact_score'], nvs, newest_first=False)[::-1]
 print(df1)
 print(f"\n총 {len(df1)}건\n")
 
 # 2. 11월 24일 모든 뉴스 확인
 print("="*70)
 print("📅 2. 11월 24일 전체 뉴스")
-df2 = pd.read_sql_query("""
-SELECT id, pub_date, title, ticker, analyzed
-FROM news
-WHERE pub_date LIKE '%2025-11-24%'
-ORDER BY id DESC
-""", conn)
+pub_dates = pd.Series(store.column('pub_date')).fillna('')
+nov24 = pub_dates.str.contains('2025-11-24', regex=False).to_numpy()
+df2 = store.frame(['id', 'pub_date', 'title', 'ticker', 'analyzed'], nov24, newest_first=False)[::-1]
 print(df2)
 print(f"\n총 {len(df2)}건\n")
 
 # 3. 최근 수집된 뉴스 (날짜 순)
 print("="*70)
 print("🕐 3. 최근 20개 뉴스 (DB 날짜 순)")
-df3 = pd.read_sql_query("""
-SELECT id, pub_date, title, ticker, analyzed
-FROM news
-ORDER BY id DESC
-LIMIT 20
-""", conn)
+df3 = store.frame(['id', 'pub_date', 'title', 'ticker', 'analyzed'], newest_first=False)[::-1][:20]
 print(df3)
 
 # 4. 7일 필터링 테스트
 print("\n" + "="*70)
 print("⏰ 4. 7일 필터링 테스트")
-df4 = pd.read_sql_query("""
-SELECT pub_date, title, ticker, analyzed
-FROM news
-WHERE analyzed = 1 AND ticker IS NOT NULL
-ORDER BY id DESC
-LIMIT 30
-""", conn)
-df4['pub_date_converted'] = pd.to_datetime(df4['pub_date'], errors='coerce')
+has_ticker = store.mask(analyzed=True) & (store.column('ticker') >= 0)
+df4 = store.frame(['id', 'pub_date', 'pub_ts', 'title', 'ticker', 'analyzed'], has_ticker, newest_first=False)[::-1][:30]
 seven_days_ago = datetime.now() - timedelta(days=7)
 print(f"오늘: {datetime.now()}")
 print(f"7일 전: {seven_days_ago}")
 print(f"\n필터링 전: {len(df4)}건")
-df4_filtered = df4[df4['pub_date_converted'] >= seven_days_ago]
+df4_filtered = df4[df4['pub_ts'] >= seven_days_ago]
 print(f"필터링 후: {len(df4_filtered)}건\n")
 print(df4_filtered[['pub_date', 'title', 'ticker']])
 
 # 5. analyzed=0 확인
 print("\n" + "="*70)
 print("⏳ 5. 미분석 뉴스")
-cursor = conn.cursor()
-cursor.execute("SELECT COUNT(*) FROM news WHERE analyzed = 0")
-pending = cursor.fetchone()[0]
+pending = store.pending()
 print(f"미분석 뉴스: {pending}건")
 
 if pending > 0:
-    df5 = pd.read_sql_query("""
-    SELECT id, pub_date, title
-    FROM news
-    WHERE analyzed = 0
-    ORDER BY id DESC
-    LIMIT 10
-    """, conn)
+    df5 = store.frame(['id', 'pub_date', 'title'], store.mask(analyzed=False), newest_first=False)[::-1][:10]
     print(df5)
 
-conn.close()
-
 print("\n" + "="*70)
 print("✅ 디버깅 완료!")
 print("="*70 + "\n")
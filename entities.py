@@ -0,0 +1,405 @@
+# entities.py - 약물/표적/모달리티/적응증 추출 + 역색인 (news_entities)
+# 사전 기반 (LLM 호출 없음): 제목 + 원문 요약에서
+#   - 사전에 있는 이름/브랜드명/약어 → 정규식 하나로 한 번에 (긴 이름 먼저)
+#   - 사전에 없는 약물은 INN 접미사 (-mab, -nib, -siran ...) 로 잡고 모달리티도 같이 붙임
+#   - 약물이 나오면 그 약의 표적도 같이 붙임 (Keytruda → pembrolizumab + PD-1)
+# news_entities(entity_id, news_id) 가 PRIMARY KEY 순서 그대로 역색인
+#   → "Keytruda 또는 PD-1 뉴스" = 엔티티 2개의 색인 구간 읽기 (LIKE 로 본문 전체 훑기 없음)
+# 수집기가 저장 직후 마지막으로 태깅한 id 이후 행만 태깅 (한 건 = 정규식 세 번, 0.2ms 정도)
+# 사전을 고치면 다음 실행 때 전체 다시 태깅 (사전 해시를 pipeline_state 에 저장)
+# 사용법: python entities.py [--rebuild] [--search keytruda pd-1]
+import argparse
+import hashlib
+import html
+import json
+import re
+import sqlite3
+from datetime import datetime
+
+from calibration import SCORE_SQL
+from database import get_state, migrate, set_state
+
+LAST_ID_KEY = 'entities.last_id'
+DICT_KEY = 'entities.dict'
+VERSION_KEY = 'entities.version'
+
+KIND_LABELS = {'drug': '약물', 'target': '표적', 'modality': '모달리티', 'indication': '적응증'}
+
+# 약물: 성분명 → (브랜드/코드명, 표적)
+DRUGS = {
+    'pembrolizumab': (['Keytruda'], ['PD-1']),
+    'nivolumab': (['Opdivo'], ['PD-1']),
+    'cemiplimab': (['Libtayo'], ['PD-1']),
+    'atezolizumab': (['Tecentriq'], ['PD-L1']),
+    'durvalumab': (['Imfinzi'], ['PD-L1']),
+    'ipilimumab': (['Yervoy'], ['CTLA-4']),
+    'semaglutide': (['Ozempic', 'Wegovy', 'Rybelsus'], ['GLP-1']),
+    'tirzepatide': (['Mounjaro', 'Zepbound'], ['GLP-1', 'GIP']),
+    'liraglutide': (['Victoza', 'Saxenda'], ['GLP-1']),
+    'orforglipron': ([], ['GLP-1']),
+    'retatrutide': ([], ['GLP-1', 'GIP']),
+    'cagrilintide': ([], ['amylin']),
+    'lecanemab': (['Leqembi'], ['amyloid beta']),
+    'donanemab': (['Kisunla'], ['amyloid beta']),
+    'aducanumab': (['Aduhelm'], ['amyloid beta']),
+    'adalimumab': (['Humira'], ['TNF']),
+    'dupilumab': (['Dupixent'], ['IL-4R']),
+    'trastuzumab': (['Herceptin'], ['HER2']),
+    'trastuzumab deruxtecan': (['Enhertu'], ['HER2']),
+    'sacituzumab govitecan': (['Trodelvy'], ['TROP2']),
+    'datopotamab deruxtecan': (['Datroway'], ['TROP2']),
+    'osimertinib': (['Tagrisso'], ['EGFR']),
+    'amivantamab': (['Rybrevant'], ['EGFR']),
+    'sotorasib': (['Lumakras'], ['KRAS']),
+    'adagrasib': (['Krazati'], ['KRAS']),
+    'olaparib': (['Lynparza'], ['PARP']),
+    'palbociclib': (['Ibrance'], ['CDK4/6']),
+    'abemaciclib': (['Verzenio'], ['CDK4/6']),
+    'ibrutinib': (['Imbruvica'], ['BTK']),
+    'zanubrutinib': (['Brukinsa'], ['BTK']),
+    'venetoclax': (['Venclexta'], ['BCL-2']),
+    'daratumumab': (['Darzalex'], ['CD38']),
+    'teclistamab': (['Tecvayli'], ['BCMA', 'CD3']),
+    'ciltacabtagene autoleucel': (['Carvykti', 'cilta-cel'], ['BCMA']),
+    'idecabtagene vicleucel': (['Abecma', 'ide-cel'], ['BCMA']),
+    'axicabtagene ciloleucel': (['Yescarta', 'axi-cel'], ['CD19']),
+    'tisagenlecleucel': (['Kymriah'], ['CD19']),
+    'blinatumomab': (['Blincyto'], ['CD19', 'CD3']),
+    'apixaban': (['Eliquis'], ['factor Xa']),
+    'rivaroxaban': (['Xarelto'], ['factor Xa']),
+    'empagliflozin': (['Jardiance'], ['SGLT2']),
+    'dapagliflozin': (['Farxiga'], ['SGLT2']),
+    'inclisiran': (['Leqvio'], ['PCSK9']),
+    'evolocumab': (['Repatha'], ['PCSK9']),
+    'elexacaftor/tezacaftor/ivacaftor': (['Trikafta'], ['CFTR']),
+    'nusinersen': (['Spinraza'], ['SMN2']),
+    'onasemnogene abeparvovec': (['Zolgensma'], ['SMN1']),
+    'delandistrogene moxeparvovec': (['Elevidys'], ['dystrophin']),
+    'exagamglogene autotemcel': (['Casgevy', 'exa-cel'], ['BCL11A']),
+    'patisiran': (['Onpattro'], ['TTR']),
+    'vutrisiran': (['Amvuttra'], ['TTR']),
+    'tafamidis': (['Vyndaqel', 'Vyndamax'], ['TTR']),
+    'nirsevimab': (['Beyfortus'], ['RSV']),
+    'lenacapavir': (['Sunlenca', 'Yeztugo'], ['HIV capsid']),
+    'bimekizumab': (['Bimzelx'], ['IL-17']),
+    'risankizumab': (['Skyrizi'], ['IL-23']),
+    'upadacitinib': (['Rinvoq'], ['JAK']),
+    'resmetirom': (['Rezdiffra'], ['THR-beta']),
+    'mRNA-1273': (['Spikevax'], ['SARS-CoV-2']),
+    'BNT162b2': (['Comirnaty'], ['SARS-CoV-2']),
+}
+
+# 표적 / 모달리티: 이름 → 다른 표기
+TARGETS = {
+    'PD-1': ['PD1'], 'PD-L1': ['PDL1'], 'CTLA-4': ['CTLA4'], 'GLP-1': ['GLP1', 'GLP-1RA'], 'GIP': [],
+    'amylin': [], 'amyloid beta': ['amyloid-beta', 'beta-amyloid', 'amyloid'], 'tau': [], 'TNF': ['TNF-alpha'],
+    'IL-4R': [], 'IL-17': [], 'IL-23': [], 'HER2': [], 'TROP2': ['TROP-2'], 'EGFR': [], 'KRAS': ['KRAS G12C'],
+    'PARP': [], 'CDK4/6': [], 'BTK': [], 'BCL-2': ['BCL2'], 'CD38': [], 'BCMA': [], 'CD3': [], 'CD19': [],
+    'CD20': [], 'factor Xa': [], 'SGLT2': [], 'PCSK9': [], 'CFTR': [], 'SMN1': [], 'SMN2': [], 'dystrophin': [],
+    'BCL11A': [], 'TTR': ['transthyretin'], 'RSV': ['respiratory syncytial virus'], 'HIV capsid': [], 'JAK': [],
+    'THR-beta': [], 'SARS-CoV-2': ['COVID-19', 'COVID'], 'Claudin 18.2': ['CLDN18.2'], 'FcRn': [], 'C5': [],
+    'LRRK2': [], 'APOC3': [], 'Lp(a)': ['lipoprotein(a)'], 'MASP-2': [], 'TSLP': [], 'KIT': [], 'MET': ['c-Met'],
+}
+MODALITIES = {
+    'antibody': ['monoclonal antibody', 'antibodies'], 'bispecific antibody': ['bispecific', 'bispecifics'],
+    'ADC': ['antibody-drug conjugate', 'antibody drug conjugate'], 'CAR-T': ['CAR T', 'CAR-T cell therapy'],
+    'cell therapy': [], 'gene therapy': ['AAV gene therapy'], 'gene editing': ['CRISPR', 'base editing'],
+    'mRNA': ['mRNA vaccine'], 'siRNA': ['RNAi'], 'antisense': ['antisense oligonucleotide', 'ASO'],
+    'radiopharmaceutical': ['radioligand', 'radioligand therapy', 'radiopharmaceuticals'],
+    'vaccine': ['vaccines'], 'small molecule': [], 'kinase inhibitor': ['tyrosine kinase inhibitor', 'TKI'],
+    'biosimilar': ['biosimilars'], 'peptide': [],
+}
+INDICATIONS = {
+    'obesity': ['weight loss', 'chronic weight management', 'overweight'],
+    'type 2 diabetes': ['T2D', 'type 2 diabetes mellitus'], 'type 1 diabetes': ['T1D'],
+    "Alzheimer's disease": ["Alzheimer's", 'Alzheimer', 'Alzheimers'], "Parkinson's disease": ["Parkinson's", 'Parkinson'],
+    'ALS': ['amyotrophic lateral sclerosis'], 'multiple sclerosis': [],
+    'Duchenne muscular dystrophy': ['DMD', 'Duchenne'], 'spinal muscular atrophy': ['SMA'],
+    'non-small cell lung cancer': ['NSCLC', 'non-small-cell lung cancer'], 'lung cancer': ['SCLC', 'small cell lung cancer'],
+    'breast cancer': [], 'prostate cancer': [], 'pancreatic cancer': [], 'colorectal cancer': ['CRC'],
+    'gastric cancer': [], 'ovarian cancer': [], 'bladder cancer': ['urothelial carcinoma'], 'melanoma': [],
+    'hepatocellular carcinoma': ['HCC', 'liver cancer'], 'renal cell carcinoma': ['RCC', 'kidney cancer'],
+    'multiple myeloma': ['myeloma'], 'leukemia': ['AML', 'CLL', 'CML', 'acute myeloid leukemia'],
+    'lymphoma': ['DLBCL', 'large B-cell lymphoma', 'follicular lymphoma', "non-Hodgkin lymphoma"],
+    'heart failure': [], 'hypertension': [], 'hypercholesterolemia': ['high cholesterol', 'LDL cholesterol'],
+    'ATTR amyloidosis': ['ATTR-CM', 'ATTR cardiomyopathy', 'transthyretin amyloidosis'],
+    'MASH': ['NASH', 'nonalcoholic steatohepatitis', 'metabolic dysfunction-associated steatohepatitis'],
+    'chronic kidney disease': ['CKD'], 'atopic dermatitis': ['eczema'], 'psoriasis': ['plaque psoriasis'],
+    'rheumatoid arthritis': [], "Crohn's disease": ["Crohn's", 'Crohn'], 'ulcerative colitis': [],
+    'asthma': [], 'COPD': ['chronic obstructive pulmonary disease'], 'cystic fibrosis': [],
+    'sickle cell disease': ['sickle cell'], 'hemophilia': ['haemophilia'], 'HIV': [], 'RSV infection': [],
+    'influenza': ['flu'], 'schizophrenia': [], 'depression': ['major depressive disorder', 'MDD'],
+    'migraine': [], 'myasthenia gravis': ['gMG'], 'rare disease': ['rare diseases', 'orphan disease'],
+}
+
+# 사전에 없는 약물: INN 접미사 → 모달리티 (성분명은 소문자 한 단어)
+INN_SUFFIXES = [
+    ('mab', 'antibody'), ('tinib', 'kinase inhibitor'), ('rafenib', 'kinase inhibitor'), ('nib', 'kinase inhibitor'),
+    ('ciclib', 'kinase inhibitor'), ('lisib', 'kinase inhibitor'), ('parib', 'small molecule'),
+    ('siran', 'siRNA'), ('rsen', 'antisense'), ('glutide', 'peptide'), ('glipron', 'small molecule'),
+    ('tide', 'peptide'), ('vec', 'gene therapy'), ('leucel', 'CAR-T'), ('temcel', 'cell therapy'),
+]
+INN_MIN_LENGTH = 7
+INN_EXCLUDE = frozenset(['nucleotide', 'peptide', 'polypeptide', 'oligonucleotide', 'dipeptide', 'nucleotides'])
+INN_RE = re.compile(r'\b([a-z]{3,}(?:' + '|'.join(s for s, _ in INN_SUFFIXES) + r'))\b')
+
+TAG_RE = re.compile(r'<[^>]+>')
+
+
+def init_entity_tables(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS entities (
+            entity_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE,
+            kind TEXT NOT NULL,
+            aliases TEXT,            -- 검색 표시용 (브랜드명 등, 쉼표 구분)
+            news_count INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    # 역색인: 엔티티 → 뉴스 (PK 순서), 뉴스 → 엔티티 (다시 태깅할 때 지우기용)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS news_entities (
+            entity_id INTEGER NOT NULL,
+            news_id INTEGER NOT NULL,
+            PRIMARY KEY (entity_id, news_id)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_news_entities_news ON news_entities(news_id)")
+    conn.commit()
+
+
+# ------------------------------------------------------------------ 사전
+def build_lexicon():
+    """별칭 → (이름, 종류, 같이 붙일 엔티티 목록)"""
+    lexicon = {}
+
+    def add(alias, name, kind, implies=()):
+        lexicon.setdefault(alias.lower(), (name, kind, tuple(implies)))
+
+    for name, aliases in TARGETS.items():
+        for alias in [name] + aliases:
+            add(alias, name, 'target')
+    for name, aliases in MODALITIES.items():
+        for alias in [name] + aliases:
+            add(alias, name, 'modality')
+    for name, aliases in INDICATIONS.items():
+        for alias in [name] + aliases:
+            add(alias, name, 'indication')
+    for name, (brands, targets) in DRUGS.items():
+        implies = [(t, 'target') for t in targets]
+        for alias in [name] + brands:
+            lexicon[alias.lower()] = (name, 'drug', tuple(implies))
+    return lexicon
+
+
+def compile_matchers():
+    """짧은 대문자 약어(AML, HER2, PD-1 ...)는 대소문자 구분, 나머지는 무시 → 정규식 두 개"""
+    exact, folded = [], []
+    for alias in build_aliases():
+        if len(alias) <= 4 and alias.upper() == alias:
+            exact.append(alias)
+        else:
+            folded.append(alias)
+
+    def pattern(words, flags):
+        words = sorted(set(words), key=len, reverse=True)
+        return re.compile(r'(?<![\w-])(' + '|'.join(re.escape(w) for w in words) + r')(?![\w-])', flags)
+
+    return pattern(exact, 0), pattern(folded, re.IGNORECASE)
+
+
+def build_aliases():
+    aliases = []
+    for name, extra in list(TARGETS.items()) + list(MODALITIES.items()) + list(INDICATIONS.items()):
+        aliases += [name] + extra
+    for name, (brands, _) in DRUGS.items():
+        aliases += [name] + brands
+    return aliases
+
+
+LEXICON = build_lexicon()
+EXACT_RE, FOLDED_RE = compile_matchers()
+
+
+def dictionary_hash():
+    data = [DRUGS, TARGETS, MODALITIES, INDICATIONS, INN_SUFFIXES, INN_MIN_LENGTH, sorted(INN_EXCLUDE)]
+    return hashlib.sha1(json.dumps(data, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def clean_text(text):
+    return html.unescape(TAG_RE.sub(' ', text or ''))
+
+
+def extract(title, summary):
+    """문서 → {(이름, 종류)}"""
+    text = clean_text(f"{title or ''} . {summary or ''}")
+    found = set()
+    for regex in (EXACT_RE, FOLDED_RE):
+        for match in regex.findall(text):
+            name, kind, implies = LEXICON[match.lower()]
+            found.add((name, kind))
+            found.update(implies)
+    # 사전에서 이미 잡은 이름의 일부 (datopotamab deruxtecan 의 datopotamab) 는 건너뜀
+    known = {w for name, _ in found for w in name.lower().split()}
+    lower = text.lower()
+    for word in INN_RE.findall(lower):
+        if len(word) < INN_MIN_LENGTH or word in INN_EXCLUDE or word in LEXICON or word in known:
+            continue
+        for suffix, modality in INN_SUFFIXES:
+            if word.endswith(suffix):
+                found.add((word, 'drug'))
+                found.add((modality, 'modality'))
+                break
+    return found
+
+
+# ------------------------------------------------------------------ 저장
+def entity_ids(conn, names):
+    """(이름, 종류) → entity_id (없으면 추가)"""
+    ids = {}
+    for name, kind in names:
+        row = conn.execute("SELECT entity_id FROM entities WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            aliases = None
+            if kind == 'drug' and name in DRUGS:
+                aliases = ', '.join(DRUGS[name][0])
+            elif kind == 'target':
+                aliases = ', '.join(TARGETS.get(name, []))
+            elif kind == 'modality':
+                aliases = ', '.join(MODALITIES.get(name, []))
+            elif kind == 'indication':
+                aliases = ', '.join(INDICATIONS.get(name, []))
+            ids[(name, kind)] = conn.execute("INSERT INTO entities (name, kind, aliases) VALUES (?, ?, ?)",
+                                             (name, kind, aliases or None)).lastrowid
+        else:
+            ids[(name, kind)] = row[0]
+    return ids
+
+
+def tag_rows(conn, rows):
+    """[(id, title, summary)] 태깅 (이전 태그는 지우고 다시). 커밋은 호출한 쪽에서. 반환: 붙인 태그 수"""
+    if not rows:
+        return 0
+    found = {news_id: extract(title, summary) for news_id, title, summary in rows}
+    ids = entity_ids(conn, set().union(*found.values()))
+    touched = set(ids.values())
+    news_ids = list(found)
+    for start in range(0, len(news_ids), 500):
+        chunk = news_ids[start:start + 500]
+        marks = ','.join('?' * len(chunk))
+        touched.update(e for (e,) in conn.execute(
+            f"SELECT DISTINCT entity_id FROM news_entities WHERE news_id IN ({marks})", chunk))
+        conn.execute(f"DELETE FROM news_entities WHERE news_id IN ({marks})", chunk)
+    pairs = [(ids[e], news_id) for news_id, names in found.items() for e in names]
+    conn.executemany("INSERT OR IGNORE INTO news_entities (entity_id, news_id) VALUES (?, ?)", pairs)
+    # 건수는 바뀐 엔티티만 (색인 구간 세기)
+    conn.executemany("""
+        UPDATE entities SET news_count = (SELECT COUNT(*) FROM news_entities ne WHERE ne.entity_id = entities.entity_id)
+        WHERE entity_id = ?
+    """, [(e,) for e in touched])
+    set_state(conn, VERSION_KEY, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    return len(pairs)
+
+
+def tag_new(conn):
+    """마지막으로 태깅한 id 이후 행만 (수집기가 저장 직후 호출). 사전이 바뀌었으면 전체. 커밋은 호출한 쪽에서"""
+    migrate(conn)
+    init_entity_tables(conn)
+    if get_state(conn, DICT_KEY) != dictionary_hash():
+        conn.execute("DELETE FROM news_entities")
+        conn.execute("DELETE FROM entities")
+        set_state(conn, LAST_ID_KEY, 0)
+        set_state(conn, DICT_KEY, dictionary_hash())
+    last_id = int(get_state(conn, LAST_ID_KEY, 0))
+    rows = conn.execute("SELECT id, title, summary FROM news WHERE id > ? ORDER BY id", (last_id,)).fetchall()
+    if not rows:
+        return 0
+    tagged = tag_rows(conn, rows)
+    set_state(conn, LAST_ID_KEY, rows[-1][0])
+    return tagged
+
+
+# ------------------------------------------------------------------ 검색
+def entity_options(db_path='fda_news.db'):
+    """검색창 목록 [(entity_id, 이름, 종류, 별칭, 뉴스 수)] 많이 나온 순"""
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("""
+            SELECT entity_id, name, kind, aliases, news_count FROM entities
+            WHERE news_count > 0
+            ORDER BY news_count DESC, name
+        """).fetchall()
+    except sqlite3.OperationalError:
+        return []
+    finally:
+        conn.close()
+
+
+def find_entities(conn, words):
+    """검색어(이름/브랜드명/약어) → entity_id 목록"""
+    ids = []
+    for word in words:
+        key = word.strip().lower()
+        name = LEXICON[key][0] if key in LEXICON else key
+        row = conn.execute("SELECT entity_id FROM entities WHERE name = ? COLLATE NOCASE", (name,)).fetchone()
+        if row:
+            ids.append(row[0])
+    return ids
+
+
+def entity_news(conn, ids, limit=30, topic_id=None):
+    """엔티티 중 하나라도 붙은 뉴스 (OR), 중요도 순. 역색인 구간만 읽고 해당 뉴스만 정렬"""
+    if not ids:
+        return []
+    marks = ','.join('?' * len(ids))
+    topic_sql = "AND topic_id = ?" if topic_id is not None else ""
+    params = list(ids) + ([topic_id] if topic_id is not None else []) + [limit]
+    return conn.execute(f"""
+        SELECT pub_date, COALESCE(summary_ko, title), ticker, {SCORE_SQL}, link
+        FROM news
+        WHERE id IN (SELECT news_id FROM news_entities WHERE entity_id IN ({marks}))
+          AND analyzed = 1 {topic_sql}
+        ORDER BY rank_score DESC
+        LIMIT ?
+    """, params).fetchall()
+
+
+def entities_version(db_path='fda_news.db'):
+    """화면 캐시 키 (태깅할 때마다 바뀜)"""
+    conn = sqlite3.connect(db_path)
+    try:
+        return get_state(conn, VERSION_KEY)
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="약물/표적/적응증 추출")
+    ap.add_argument("--db", default="fda_news.db")
+    ap.add_argument("--rebuild", action="store_true", help="전체 다시 태깅")
+    ap.add_argument("--search", nargs='+', help="예: --search keytruda pd-1")
+    args = ap.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    migrate(conn)
+    init_entity_tables(conn)
+    if args.rebuild:
+        set_state(conn, DICT_KEY, '')
+    tagged = tag_new(conn)
+    conn.commit()
+    print(f"💊 태그 {tagged}개 추가")
+
+    if args.search:
+        ids = find_entities(conn, args.search)
+        rows = entity_news(conn, ids, limit=20)
+        print(f"🔎 {' / '.join(args.search)} → 엔티티 {len(ids)}개, 뉴스 {len(rows)}건")
+        for pub_date, summary, ticker, score, _ in rows:
+            print(f"  {pub_date[:10]} {ticker or '-':<6} {score if score is not None else '-':>4} {clean_text(summary)[:70]}")
+    else:
+        for name, kind, count in conn.execute("""
+            SELECT name, kind, news_count FROM entities ORDER BY news_count DESC LIMIT 20
+        """):
+            print(f"  {KIND_LABELS[kind]:<5} {name:<30} {count:>4}건")
+    conn.close()
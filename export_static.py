@@ -0,0 +1,266 @@
+# export_static.py - 뉴스 대시보드를 정적 HTML/JSON 으로 내보내기
+# 사용법: python export_static.py [--out site]
+#   → python serve_static.py --root site  (또는 nginx/CDN 에 site/ 를 그대로 올림)
+# 읽기만 하는 방문자는 정적 파일로, Streamlit 앱은 게임/관리 페이지용으로
+#
+# 증분 생성: site/manifest.json 에 티커별 (건수, 마지막 id, 마지막 분석 시각)과
+# 파일별 내용 해시를 저장 → 바뀐 티커만 다시 조회/렌더링, 내용이 같은 파일은 쓰지 않음
+# 보정을 다시 맞추면(calibration.version) 점수가 전부 바뀌므로 티커 페이지 전부 다시
+import argparse
+import gzip
+import hashlib
+import html
+import json
+import os
+import re
+import sqlite3
+
+from build_assets import brotli, write_if_changed
+from calibration import SCORE_SQL, calibration_version
+from database import migrate
+from ranking import ensure_ranks
+from snapshot import JUNK_TICKERS, build_dashboard, parse_date, score_style
+from tracing import PipelineRun
+
+SITE_DIR = 'site'
+TICKER_PATTERN = re.compile(r'^[A-Z][A-Z.\-]{0,7}$')  # 파일 이름으로 써도 안전한 티커만
+TICKER_LIMIT = 200
+
+STYLE = """
+body{font-family:-apple-system,BlinkMacSystemFont,'Malgun Gothic',sans-serif;margin:0 auto;max-width:1100px;padding:24px;color:#1f2937}
+h1{margin:0 0 4px}a{color:#2563eb;text-decoration:none}a:hover{text-decoration:underline}
+.caption{color:#6b7280;font-size:14px}.info{background:#eff6ff;border-radius:8px;padding:12px 16px;margin:16px 0}
+.metrics{display:flex;gap:16px;flex-wrap:wrap;margin:16px 0}.metric{flex:1;min-width:140px;background:#f9fafb;border-radius:8px;padding:12px 16px}
+.metric b{display:block;font-size:28px}table{width:100%;border-collapse:collapse;font-size:14px}
+th,td{border-bottom:1px solid #e5e7eb;padding:8px;text-align:left;vertical-align:top}th{background:#f3f4f6}
+td.num{text-align:right;white-space:nowrap}.tickers a{display:inline-block;margin:4px 8px 4px 0}
+footer{margin-top:32px;color:#9ca3af;font-size:12px}
+"""
+
+
+def page(title, body, root=''):
+    return f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(title)}</title>
+<style>{STYLE}</style>
+</head>
+<body>
+<p class="caption"><a href="{root}index.html">🔬 Own Drug</a> · <a href="{root}tickers.html">티커 목록</a></p>
+{body}
+<footer>© Own Drug | AI 분석 powered by Perplexity | AI 분석/티커 식별은 오류가 있을 수 있으며, 투자 결정의 책임은 사용자에게 있습니다.</footer>
+</body>
+</html>
+"""
+
+
+def ticker_link(ticker, root=''):
+    if TICKER_PATTERN.match(ticker or ''):
+        return f'<a href="{root}ticker/{ticker}.html">{html.escape(ticker)}</a>'
+    return html.escape(ticker or '')
+
+
+def score_cell(score):
+    if score is None:
+        return '<td class="num">-</td>'
+    return f'<td class="num" style="{score_style(score)}">{score:.1f} ⭐</td>'
+
+
+def render_index(snapshot, updated_at):
+    m = snapshot['metrics']
+    rows = "\n".join(
+        f"<tr><td>{html.escape(when)}</td><td>{html.escape(summary)}</td><td>{ticker_link(ticker)}</td>"
+        f"{score_cell(score)}<td><a href=\"{html.escape(link or '')}\" rel=\"noopener\">원문</a></td></tr>"
+        for when, summary, ticker, score, link in snapshot['rows']
+    ) or '<tr><td colspan="5">📡 최근 30일 이내 분석된 뉴스가 없습니다!</td></tr>'
+    avg = f"{m['avg']:.1f}" if m['avg'] is not None else "N/A"
+    body = f"""
+<h1>🔬 Own Drug</h1>
+<p class="caption">바이오테크 투자를 위한 뉴스 AI 분석 · 마지막 분석 {html.escape(updated_at + ' UTC' if updated_at else '-')}</p>
+<div class="metrics">
+<div class="metric">총 뉴스(30일)<b>{m['total']}</b></div>
+<div class="metric">고영향 (7+)<b>{m['high']}</b></div>
+<div class="metric">평균 점수<b>{avg}</b></div>
+<div class="metric">분석 대기<b>{m['pending']}</b></div>
+</div>
+<table>
+<tr><th>발표시간</th><th>한줄요약</th><th>티커</th><th>주가영향</th><th>원문</th></tr>
+{rows}
+</table>
+<p class="info">📢 주가영향 점수가 10점에 가까울수록 큰 주가 상승을, 0점에 가까울수록 큰 주가 하락을 예측합니다.</p>
+"""
+    return page("Own Drug 💊", body)
+
+
+def render_tickers(signatures):
+    links = "\n".join(
+        f'<a href="ticker/{t}.html">{html.escape(t)} <span class="caption">({count})</span></a>'
+        for t, (count, _, _) in sorted(signatures.items(), key=lambda kv: (-kv[1][0], kv[0]))
+    )
+    body = f"""
+<h1>📈 티커 목록</h1>
+<p class="caption">분석된 뉴스가 있는 종목 {len(signatures)}개 (뉴스 많은 순)</p>
+<div class="tickers">{links}</div>
+"""
+    return page("티커 목록 | Own Drug", body)
+
+
+def render_ticker(ticker, rows):
+    scores = [r[3] for r in rows if r[3] is not None and r[3] > 0]
+    avg = f"{sum(scores) / len(scores):.1f}" if scores else "N/A"
+    table = "\n".join(
+        f"<tr><td>{html.escape(when)}</td><td>{html.escape(summary)}</td><td>{html.escape(news_type or '')}</td>"
+        f"{score_cell(score)}<td><a href=\"{html.escape(link or '')}\" rel=\"noopener\">원문</a></td></tr>"
+        for when, summary, news_type, score, link in rows
+    )
+    body = f"""
+<h1>{html.escape(ticker)}</h1>
+<p class="caption">분석된 뉴스 {len(rows)}건 · 평균 주가영향 {avg}</p>
+<table>
+<tr><th>발표시간</th><th>한줄요약</th><th>유형</th><th>주가영향</th><th>원문</th></tr>
+{table}
+</table>
+"""
+    return page(f"{ticker} 뉴스 | Own Drug", body, root='../')
+
+
+def ticker_signatures(conn):
+    """티커별 (건수, 마지막 id, 마지막 분석 시각) - 하나라도 바뀌면 그 티커 페이지만 다시 만듦"""
+    placeholders = ','.join('?' * len(JUNK_TICKERS))
+    rows = conn.execute(f"""
+        SELECT ticker, COUNT(*), MAX(id), COALESCE(MAX(analyzed_at), '')
+        FROM news
+        WHERE analyzed = 1 AND ticker IS NOT NULL AND ticker != '' AND ticker != 'NONE'
+          AND ticker NOT IN ({placeholders})
+        GROUP BY ticker
+    """, JUNK_TICKERS).fetchall()
+    return {t: [count, max_id, last] for t, count, max_id, last in rows if TICKER_PATTERN.match(t)}
+
+
+def ticker_rows(conn, ticker):
+    rows = conn.execute(f"""
+        SELECT pub_date, COALESCE(summary_ko, title), news_type, {SCORE_SQL}, link
+        FROM news
+        WHERE ticker = ? AND analyzed = 1
+        ORDER BY pub_date DESC
+        LIMIT ?
+    """, (ticker, TICKER_LIMIT)).fetchall()
+    out = []
+    for pub_date, summary, news_type, score, link in rows:
+        dt = parse_date(pub_date)
+        out.append([dt.strftime('%Y-%m-%d %H:%M') if dt else (pub_date or ''), summary or '', news_type, score, link])
+    return out
+
+
+class Publisher:
+    """내용 해시가 바뀐 파일만 쓰고 .gz/.br 을 같이 만듦"""
+
+    def __init__(self, out_dir, hashes):
+        self.out_dir = out_dir
+        self.hashes = hashes
+        self.written = 0
+        self.bytes = 0
+
+    def publish(self, rel_path, text):
+        data = text.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()[:16]
+        path = os.path.join(self.out_dir, rel_path)
+        if self.hashes.get(rel_path) == digest and os.path.exists(path):
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_if_changed(path, data)
+        write_if_changed(path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli is not None:
+            write_if_changed(path + '.br', brotli.compress(data, quality=11))
+        self.hashes[rel_path] = digest
+        self.written += 1
+        self.bytes += len(data)
+        return True
+
+    def remove(self, rel_path):
+        path = os.path.join(self.out_dir, rel_path)
+        for p in (path, path + '.gz', path + '.br'):
+            if os.path.exists(p):
+                os.remove(p)
+        self.hashes.pop(rel_path, None)
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, 'manifest.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'tickers': {}, 'files': {}}
+
+
+def export_site(db_path='fda_news.db', out_dir=SITE_DIR, full=False):
+    print("\n" + "="*60)
+    print(f"🌐 정적 사이트 내보내기 → {out_dir}/")
+    print("="*60 + "\n")
+
+    run = PipelineRun('export', db_path=db_path)
+    manifest = {'tickers': {}, 'files': {}} if full else load_manifest(out_dir)
+    pub = Publisher(out_dir, manifest['files'])
+    conn = sqlite3.connect(db_path)
+    migrate(conn)
+    ensure_ranks(conn)  # 첫 화면은 중요도 순
+
+    try:
+        with run.span('index') as span:
+            snapshot = build_dashboard(conn)
+            updated_at = conn.execute("SELECT MAX(analyzed_at) FROM news").fetchone()[0]
+            dashboard = {k: snapshot[k] for k in ('columns', 'rows', 'metrics')}
+            pub.publish('index.html', render_index(snapshot, updated_at))
+            pub.publish('data/dashboard.json', json.dumps(dashboard, ensure_ascii=False, separators=(',', ':')))
+            span.count = len(snapshot['rows'])
+
+        with run.span('signatures') as span:
+            signatures = ticker_signatures(conn)
+            calibration = calibration_version(conn)
+            # 보정 함수가 바뀌면 건수/id 는 그대로여도 점수가 다름 → 전부 다시
+            old = manifest['tickers'] if manifest.get('calibration') == calibration else {}
+            changed = [t for t, sig in signatures.items() if old.get(t) != sig]
+            removed = [t for t in manifest['tickers'] if t not in signatures]
+            span.count = len(signatures)
+            span.skipped = len(signatures) - len(changed)
+
+        with run.span('tickers') as span:
+            pub.publish('tickers.html', render_tickers(signatures))
+            for t in changed:
+                rows = ticker_rows(conn, t)
+                pub.publish(f'ticker/{t}.html', render_ticker(t, rows))
+                pub.publish(f'data/ticker/{t}.json', json.dumps(rows, ensure_ascii=False, separators=(',', ':')))
+            for t in removed:
+                pub.remove(f'ticker/{t}.html')
+                pub.remove(f'data/ticker/{t}.json')
+            span.count = len(changed)
+            span.bytes = pub.bytes
+
+        manifest['tickers'] = signatures
+        manifest['calibration'] = calibration
+        os.makedirs(out_dir, exist_ok=True)
+        write_if_changed(os.path.join(out_dir, 'manifest.json'),
+                         (json.dumps(manifest, ensure_ascii=False, indent=1, sort_keys=True) + "\n").encode())
+    except Exception as e:
+        conn.close()
+        run.finish(status='error', error=str(e))
+        print(f"❌ 내보내기 실패: {e}")
+        raise
+
+    conn.close()
+    run.finish()
+    print(f"✅ 티커 {len(signatures)}개 중 {len(changed)}개 갱신 | 파일 {pub.written}개 기록 ({pub.bytes:,} B)")
+    if brotli is None:
+        print("💡 brotli 미설치 → .br 생략 (pip install brotli)")
+    return pub.written
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="뉴스 대시보드 정적 내보내기")
+    ap.add_argument("--db", default="fda_news.db")
+    ap.add_argument("--out", default=SITE_DIR)
+    ap.add_argument("--full", action="store_true", help="manifest 무시하고 전부 다시 생성")
+    args = ap.parse_args()
+    export_site(args.db, args.out, full=args.full)
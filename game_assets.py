@@ -0,0 +1,35 @@
+# game_assets.py - 게임 프론트엔드(static/games) 로더
+# 게임 HTML은 해시 이름의 정적 파일로 브라우저가 캐시하고, 파이썬은 iframe 주소만 보냄
+import json
+import os
+
+import streamlit.components.v1 as components
+
+MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'games', 'manifest.json')
+
+# 기본은 Streamlit 정적 서빙 (.streamlit/config.toml enableStaticServing)
+#   → 해시 이름 덕분에 새 빌드는 바로 반영되지만, 장기 캐시 헤더(immutable)와 .br/.gz 는 없음
+# 장기 캐시 + 사전 압축까지 쓰려면 build_assets.py --precompress 후 serve_static.py(또는 CDN)를 띄우고
+# OWNDRUG_ASSET_BASE 로 그 주소를 지정
+ASSET_BASE = os.getenv("OWNDRUG_ASSET_BASE", "app/static/games").rstrip('/')
+
+_manifest = {'mtime': None, 'files': {}}
+
+
+def load_manifest():
+    """프로세스 전체에서 한 번 읽고, build_assets.py 로 다시 빌드되면 갱신"""
+    mtime = os.path.getmtime(MANIFEST)
+    if _manifest['mtime'] != mtime:
+        with open(MANIFEST, encoding='utf-8') as f:
+            _manifest['files'] = json.load(f)
+        _manifest['mtime'] = mtime
+    return _manifest['files']
+
+
+def asset_url(name):
+    return f"{ASSET_BASE}/{load_manifest()[name]}"
+
+
+def render_game(name, height, fragment=""):
+    # fragment(#...)는 서버로 안 가서 캐시된 파일을 그대로 씀
+    components.iframe(asset_url(name) + fragment, height=height, scrolling=False)
@@ -0,0 +1,142 @@
+# leaderboard.py - 미니게임 리더보드 (뉴스 DB와 분리된 leaderboard.db)
+# 게임 점수 쓰기는 백그라운드 스레드가 모아서 한 트랜잭션으로 저장
+# → 동시 접속이 많아도 세션은 큐에 넣고 바로 돌아가고, fda_news.db 는 건드리지 않음
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+from datetime import datetime
+
+LEADERBOARD_DB = os.getenv("OWNDRUG_LEADERBOARD_DB", "leaderboard.db")
+
+FLUSH_INTERVAL = 1.0  # 초
+BATCH_SIZE = 100
+
+
+def connect(db_path=LEADERBOARD_DB):
+    conn = sqlite3.connect(db_path, timeout=10)
+    # WAL: 읽기(순위 조회)와 쓰기(점수 저장)가 서로 막지 않음
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def init_leaderboard(db_path=LEADERBOARD_DB):
+    conn = connect(db_path)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS scores (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            game TEXT NOT NULL,
+            player TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            accuracy REAL,
+            correct INTEGER,
+            played INTEGER,
+            best_streak INTEGER,
+            finished_at TIMESTAMP NOT NULL
+        )
+    """)
+    # 순위 조회 = 인덱스 순서 그대로 앞에서 N개
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_scores_rank
+        ON scores(game, score DESC, accuracy DESC, finished_at)
+    """)
+    conn.commit()
+    conn.close()
+
+
+class ScoreWriter:
+    """점수 저장 큐. submit() 은 바로 리턴하고, 스레드가 모아서 저장"""
+
+    def __init__(self, db_path=LEADERBOARD_DB):
+        self.db_path = db_path
+        self.queue = queue.Queue()
+        init_leaderboard(db_path)
+        self.thread = threading.Thread(target=self._run, name="leaderboard-writer", daemon=True)
+        self.thread.start()
+        atexit.register(self.flush)
+
+    def submit(self, game, player, score, accuracy=None, correct=None, played=None, best_streak=None):
+        self.queue.put((
+            game, player.strip()[:20] or "익명", int(score), accuracy, correct, played, best_streak,
+            datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        ))
+
+    def _drain(self, first=None):
+        rows = [] if first is None else [first]
+        while len(rows) < BATCH_SIZE:
+            try:
+                rows.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def _write(self, rows):
+        if not rows:
+            return
+        conn = connect(self.db_path)
+        try:
+            with conn:
+                conn.executemany("""
+                    INSERT INTO scores (game, player, score, accuracy, correct, played, best_streak, finished_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+        except Exception as e:
+            print(f"⚠️ 리더보드 저장 실패 ({len(rows)}건): {e}")
+        finally:
+            conn.close()
+
+    def _run(self):
+        while True:
+            try:
+                first = self.queue.get(timeout=FLUSH_INTERVAL)
+            except queue.Empty:
+                continue
+            self._write(self._drain(first))
+
+    def flush(self):
+        """남은 점수를 지금 저장 (종료 시 / 테스트용)"""
+        while not self.queue.empty():
+            self._write(self._drain())
+
+
+def top_scores(game, limit=10, db_path=LEADERBOARD_DB):
+    """게임별 상위 N개 (idx_scores_rank 를 그대로 타는 쿼리)"""
+    if not os.path.exists(db_path):
+        return []
+    conn = connect(db_path)
+    try:
+        return conn.execute("""
+            SELECT player, score, accuracy, best_streak, finished_at
+            FROM scores
+            WHERE game = ?
+            ORDER BY score DESC, accuracy DESC, finished_at
+            LIMIT ?
+        """, (game, limit)).fetchall()
+    except sqlite3.OperationalError:
+        return []
+    finally:
+        conn.close()
+
+
+def player_rank(game, score, db_path=LEADERBOARD_DB):
+    """이 점수가 몇 등인지 (같은 점수는 같은 등수)"""
+    if not os.path.exists(db_path):
+        return 1
+    conn = connect(db_path)
+    try:
+        higher = conn.execute(
+            "SELECT COUNT(*) FROM scores WHERE game = ? AND score > ?", (game, score)
+        ).fetchone()[0]
+        return higher + 1
+    except sqlite3.OperationalError:
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    init_leaderboard()
+    for player, score, accuracy, streak, at in top_scores('fda_hunter', 20):
+        print(f"🏆 {player:<20} {score:>5}점  {accuracy or 0:5.1f}%  🔥{streak or 0}  {at}")
@@ -0,0 +1,143 @@
+# map_gen.py - 약물 수집 RPG 맵 생성기 (시드 고정, NumPy)
+# 같은 시드 → 항상 같은 맵. 결과는 Uint8 격자 1장을 zlib + base64url 로 묶어서
+# iframe 주소의 #fragment 로 넘김 (game_src/rpg.html 의 loadMapPayload 가 풀어서 씀)
+#
+# 칸 하나 = 1바이트
+#   bit 0    : 바닥 (0 = 밝음, 1 = 어두움)
+#   bit 1~7  : 물체 코드 (0 빈칸, 1 나무, 2 바위, 3.. 약물, 그 뒤 환자)
+import base64
+import zlib
+from datetime import date
+from urllib.parse import urlencode
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+# rpg.html 의 drugDatabase / patientDatabase 와 같은 키 (순서는 페이로드에 같이 실어 보냄)
+DRUGS = ['aspirin', 'insulin', 'penicillin', 'morphine', 'metformin',
+         'warfarin', 'lisinopril', 'omeprazole', 'albuterol', 'levothyroxine']
+CORRECT_DRUGS = {
+    'headache': ['aspirin'],
+    'fever': ['aspirin'],
+    'diabetes': ['insulin', 'metformin'],
+    'infection': ['penicillin'],
+    'severe_pain': ['morphine'],
+    'blood_clot': ['warfarin'],
+    'hypertension': ['lisinopril'],
+    'acid_reflux': ['omeprazole'],
+    'asthma': ['albuterol'],
+    'hypothyroid': ['levothyroxine'],
+}
+DISEASES = list(CORRECT_DRUGS)
+
+TREE, ROCK = 1, 2
+DRUG_BASE = 3
+PATIENT_BASE = DRUG_BASE + len(DRUGS)
+
+
+def daily_seed(day=None):
+    """오늘의 맵: 날짜(YYYYMMDD)가 시드"""
+    day = day or date.today()
+    return int(day.strftime('%Y%m%d'))
+
+
+def reachable_from(passable, start):
+    """start 에서 상하좌우로 갈 수 있는 칸 (배열 단위 flood fill)"""
+    reached = np.zeros_like(passable)
+    reached[start[1], start[0]] = True
+    while True:
+        grown = reached.copy()
+        grown[1:, :] |= reached[:-1, :]
+        grown[:-1, :] |= reached[1:, :]
+        grown[:, 1:] |= reached[:, :-1]
+        grown[:, :-1] |= reached[:, 1:]
+        grown &= passable
+        if np.array_equal(grown, reached):
+            return reached
+        reached = grown
+
+
+def generate_map(seed, size=100, obstacles=200, patients=30, extra_drugs=50, dark_ratio=0.4):
+    """시드 하나로 맵 전체를 만들고 (size, size) uint8 격자와 시작 위치를 돌려줌
+
+    장애물을 먼저 깔고 시작점에서 갈 수 있는 칸에만 환자/약물을 놓으므로
+    모든 환자와 약물은 항상 도달 가능
+    """
+    rng = np.random.default_rng(seed)
+    start = (size // 2, size // 2)
+
+    grid = (rng.random((size, size)) < dark_ratio).astype(np.uint8)
+    objects = np.zeros((size, size), dtype=np.uint8)
+
+    # 시작점 주변 5x5 는 비워 둠
+    safe = np.ones((size, size), dtype=bool)
+    safe[max(0, start[1] - 2):start[1] + 3, max(0, start[0] - 2):start[0] + 3] = False
+
+    free = np.flatnonzero(safe)
+    picked = rng.choice(free, size=min(obstacles, len(free)), replace=False)
+    objects.flat[picked] = rng.choice([TREE, ROCK], size=len(picked)).astype(np.uint8)
+
+    reachable = reachable_from(objects == 0, start)
+    free = np.flatnonzero(reachable & safe)
+    rng.shuffle(free)
+
+    # 환자
+    patient_diseases = rng.integers(0, len(DISEASES), size=min(patients, len(free)))
+    objects.flat[free[:len(patient_diseases)]] = (PATIENT_BASE + patient_diseases).astype(np.uint8)
+    free = free[len(patient_diseases):]
+
+    # 약물: 환자 치료에 필요한 양의 2배 + 랜덤 추가분
+    needs = np.zeros(len(DRUGS), dtype=np.int64)
+    for d in patient_diseases:
+        for drug in CORRECT_DRUGS[DISEASES[d]]:
+            needs[DRUGS.index(drug)] += 1
+    drug_codes = np.concatenate([
+        np.repeat(np.arange(len(DRUGS)), needs * 2),
+        rng.integers(0, len(DRUGS), size=extra_drugs),
+    ])[:len(free)]
+    objects.flat[free[:len(drug_codes)]] = (DRUG_BASE + drug_codes).astype(np.uint8)
+
+    grid |= objects << 1
+    return grid, start
+
+
+def encode_grid(grid):
+    return base64.urlsafe_b64encode(zlib.compress(grid.tobytes(), 9)).decode().rstrip('=')
+
+
+def decode_grid(payload, size):
+    raw = zlib.decompress(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+    return np.frombuffer(raw, dtype=np.uint8).reshape(size, size)
+
+
+def map_fragment(seed, size=100):
+    """iframe 주소 뒤에 붙일 #fragment (서버로 안 가서 게임 파일 캐시가 그대로 유지됨)"""
+    grid, start = generate_map(seed, size=size)
+    return '#' + urlencode({
+        'v': FORMAT_VERSION,
+        'seed': seed,
+        'size': size,
+        'start': f"{start[0]},{start[1]}",
+        'drugs': ','.join(DRUGS),
+        'diseases': ','.join(DISEASES),
+        'grid': encode_grid(grid),
+    }, safe=',')
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description="RPG 맵 생성 (시드 고정)")
+    ap.add_argument("--seed", type=int, default=None, help="기본: 오늘 날짜")
+    ap.add_argument("--size", type=int, default=100)
+    args = ap.parse_args()
+
+    seed = args.seed if args.seed is not None else daily_seed()
+    grid, start = generate_map(seed, size=args.size)
+    objects = grid >> 1
+    print(f"🗺️ seed={seed} size={args.size} start={start}")
+    print(f"   장애물 {int(((objects == TREE) | (objects == ROCK)).sum())} | "
+          f"약물 {int(((objects >= DRUG_BASE) & (objects < PATIENT_BASE)).sum())} | "
+          f"환자 {int((objects >= PATIENT_BASE).sum())}")
+    print(f"   페이로드 {len(map_fragment(seed, args.size)):,} B")
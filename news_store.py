@@ -0,0 +1,304 @@
+# news_store.py - 프로세스 하나가 같이 쓰는 뉴스 컬럼 캐시 (NumPy 배열)
+# 처음 한 번만 전체를 읽고, 이후 refresh() 는
+#   1) id > 마지막 id 인 새 행만 뒤에 붙이고
+#   2) analyzed_at 이 지난번 이후인 행(분석 결과가 바뀐 행)만 제자리에서 고침
+# → 갱신 비용이 쌓인 뉴스 수와 무관. 화면은 마스크 + 인덱스로 필요한 행만 꺼내 DataFrame 으로
+# 티커/출처/유형은 정수 코드(categorical)로 저장 → 티커 필터가 정수 비교 한 번
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from calibration import calibration_version
+from database import news_generation
+from ranking import ranking_version
+from snapshot import DAYS, JUNK_TICKERS, LIMIT, parse_date
+
+DB_PATH = 'fda_news.db'
+
+NUMERIC_COLUMNS = {'id': np.int64, 'impact_score': np.float64, 'impact_calibrated': np.float64,
+                   'rank_score': np.float64, 'analyzed': np.int8, 'pub_ts': 'datetime64[s]'}
+FLOAT_COLUMNS = ('impact_score', 'impact_calibrated', 'rank_score')
+CATEGORY_COLUMNS = ('ticker', 'source', 'news_type')
+TEXT_COLUMNS = ('pub_date', 'title', 'summary_ko', 'link', 'analyzed_at')
+
+# 분석기/보정/순위가 바꾸는 컬럼 (패치 대상)
+ANALYSIS_COLUMNS = ('ticker', 'news_type', 'impact_score', 'impact_calibrated', 'rank_score',
+                    'summary_ko', 'analyzed', 'analyzed_at')
+LOAD_COLUMNS = ('id', 'pub_date', 'title', 'link', 'source') + ANALYSIS_COLUMNS
+# migrate() 전 DB 에는 없는 컬럼 → NULL 로 읽음
+OPTIONAL_COLUMNS = ('analyzed_at', 'impact_calibrated', 'rank_score')
+
+MIN_CAPACITY = 1024
+
+
+class Categories:
+    """문자열 ↔ 정수 코드. 없는 값(None)은 -1 (pd.Categorical.from_codes 규칙)"""
+
+    def __init__(self):
+        self.values = []
+        self.lookup = {}
+
+    def code(self, value):
+        if value is None:
+            return -1
+        code = self.lookup.get(value)
+        if code is None:
+            code = len(self.values)
+            self.lookup[value] = code
+            self.values.append(value)
+        return code
+
+    def encode(self, values):
+        return np.fromiter((self.code(v) for v in values), dtype=np.int32, count=len(values))
+
+    def codes_of(self, values):
+        """필터용: 처음 보는 값은 건너뜀"""
+        return [self.lookup[v] for v in values if v in self.lookup]
+
+
+def to_datetime64(values):
+    out = np.empty(len(values), dtype='datetime64[s]')
+    for i, value in enumerate(values):
+        dt = parse_date(value)
+        out[i] = np.datetime64(dt, 's') if dt else np.datetime64('NaT')
+    return out
+
+
+class NewsStore:
+    """news 테이블의 컬럼 캐시. st.cache_resource 로 세션끼리 공유"""
+
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.categories = {name: Categories() for name in CATEGORY_COLUMNS}
+        self.columns = {}
+        self.size = 0
+        self.last_id = 0
+        self.last_analyzed_at = ''
+        self.versions = None
+        self.refreshed_at = 0.0
+        self._allocate(MIN_CAPACITY)
+
+    # ------------------------------------------------------------------ 저장
+    def _allocate(self, capacity):
+        """용량을 2배씩 늘림 (기존 값은 복사, 뒤에 붙이는 건 분할 상환 O(1))"""
+        new = {}
+        for name, dtype in NUMERIC_COLUMNS.items():
+            new[name] = np.zeros(capacity, dtype=dtype)
+        for name in CATEGORY_COLUMNS:
+            new[name] = np.full(capacity, -1, dtype=np.int32)
+        for name in TEXT_COLUMNS:
+            new[name] = np.empty(capacity, dtype=object)
+        for name, arr in self.columns.items():
+            new[name][:self.size] = arr[:self.size]
+        self.columns = new
+
+    def _set_rows(self, index, rows, names):
+        """rows(SELECT 결과)를 index 위치에 씀. 컬럼 순서는 names"""
+        cols = list(zip(*rows))
+        for name, values in zip(names, cols):
+            if name == 'id':
+                continue
+            if name in CATEGORY_COLUMNS:
+                self.columns[name][index] = self.categories[name].encode(values)
+            elif name in FLOAT_COLUMNS:
+                self.columns[name][index] = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+            elif name == 'analyzed':
+                self.columns[name][index] = np.array([v or 0 for v in values], dtype=np.int8)
+            else:
+                self.columns[name][index] = values
+            if name == 'pub_date':
+                self.columns['pub_ts'][index] = to_datetime64(values)
+            if name == 'analyzed_at':
+                latest = max((v for v in values if v), default='')
+                self.last_analyzed_at = max(self.last_analyzed_at, latest)
+
+    def _append(self, rows, names):
+        n = len(rows)
+        if self.size + n > len(self.columns['id']):
+            capacity = len(self.columns['id'])
+            while capacity < self.size + n:
+                capacity *= 2
+            self._allocate(capacity)
+        start, end = self.size, self.size + n
+        self.columns['id'][start:end] = [r[0] for r in rows]
+        self._set_rows(slice(start, end), rows, names)
+        self.size = end
+        self.last_id = int(self.columns['id'][end - 1])
+
+    def _patch(self, rows, names):
+        """id 로 위치를 찾아 분석 컬럼만 덮어씀 (id 는 오름차순이라 이진 탐색)"""
+        ids = np.array([r[0] for r in rows], dtype=np.int64)
+        pos = np.searchsorted(self.columns['id'][:self.size], ids)
+        ok = (pos < self.size) & (self.columns['id'][np.minimum(pos, self.size - 1)] == ids)
+        if not ok.all():
+            rows = [r for r, keep in zip(rows, ok) if keep]
+            pos = pos[ok]
+        if rows:
+            self._set_rows(pos, rows, names)
+        return len(rows)
+
+    def _reset(self):
+        self.categories = {name: Categories() for name in CATEGORY_COLUMNS}
+        self.columns = {}
+        self.size = 0
+        self.last_id = 0
+        self.last_analyzed_at = ''
+        self._allocate(MIN_CAPACITY)
+
+    # ------------------------------------------------------------------ 갱신
+    def due(self, max_age=0):
+        return time.monotonic() - self.refreshed_at >= max_age
+
+    def refresh(self, max_age=0):
+        """새 행 추가 + 바뀐 분석 결과 반영. max_age 초 안에 갱신했으면 건너뜀
+
+        반환: {'appended', 'patched', 'resynced'} (건너뛰면 None)
+        """
+        with self.lock:
+            if not self.due(max_age):
+                return None
+            conn = sqlite3.connect(self.db_path)
+            try:
+                stats = self._refresh(conn)
+            finally:
+                conn.close()
+            self.refreshed_at = time.monotonic()
+            return stats
+
+    def _refresh(self, conn):
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(news)")}
+        has_at = 'analyzed_at' in existing
+        load_names = LOAD_COLUMNS
+        patch_names = ('id',) + ANALYSIS_COLUMNS
+        load_sql = ', '.join(n if n in existing or n not in OPTIONAL_COLUMNS else 'NULL' for n in load_names)
+        patch_sql = ', '.join(n if n in existing or n not in OPTIONAL_COLUMNS else 'NULL' for n in patch_names)
+        # 보정/순위를 전체 다시 계산하거나 reset.py 처럼 일괄로 바꾸면 analyzed_at 은 그대로라 버전으로 알아챔
+        versions = (calibration_version(conn), ranking_version(conn), news_generation(conn))
+        # 변경 신호는 인덱스 끝만 읽음 (rowid / idx_news_analyzed_at) → 표 크기와 무관
+        max_id = conn.execute("SELECT MAX(id) FROM news").fetchone()[0] or 0
+        stats = {'appended': 0, 'patched': 0, 'resynced': 0}
+
+        if max_id < self.last_id:
+            # 행이 지워졌음 → 처음부터 다시
+            self._reset()
+
+        if has_at and self.size:
+            # 이미 가진 행 중 다시 분석된 것 (처음엔 '' → NULL 이 아닌 행 전부)
+            # 같은 초에 분석된 행을 놓치지 않도록 >= (다시 덮어써도 결과는 같음)
+            rows = conn.execute(
+                f"SELECT {patch_sql} FROM news WHERE analyzed_at >= ? AND id <= ?",
+                (self.last_analyzed_at, self.last_id),
+            ).fetchall()
+            if rows:
+                stats['patched'] = self._patch(rows, patch_names)
+
+        rows = conn.execute(f"SELECT {load_sql} FROM news WHERE id > ? ORDER BY id", (self.last_id,)).fetchall()
+        if rows:
+            self._append(rows, load_names)
+            stats['appended'] = len(rows)
+
+        stale = versions != self.versions and self.size > stats['appended']
+        if not has_at:
+            # migrate() 전 DB: analyzed_at 이 없어 바뀐 행을 알 수 없음 → 예전처럼 개수로 확인 (전체 스캔)
+            count, analyzed = conn.execute("SELECT COUNT(*), COALESCE(SUM(analyzed), 0) FROM news").fetchone()
+            stale = stale or count != self.size or analyzed != int(self.columns['analyzed'][:self.size].sum())
+        if stale:
+            # analyzed_at 으로 잡히지 않는 변경 → 분석 컬럼만 전체 재동기화
+            rows = conn.execute(f"SELECT {patch_sql} FROM news ORDER BY id").fetchall()
+            if len(rows) != self.size:
+                self._reset()
+                rows = conn.execute(f"SELECT {load_sql} FROM news ORDER BY id").fetchall()
+                if rows:
+                    self._append(rows, load_names)
+            elif rows:
+                self._patch(rows, patch_names)
+            stats['resynced'] = len(rows)
+        self.versions = versions
+
+        return stats
+
+    # ------------------------------------------------------------------ 조회
+    def column(self, name):
+        """컬럼 전체 (복사 없는 view). 카테고리 컬럼은 정수 코드"""
+        return self.columns[name][:self.size]
+
+    def pending(self):
+        return int(self.size - self.column('analyzed').sum())
+
+    def mask(self, analyzed=None, tickers=None, exclude_tickers=(), has_ticker=False, since=None):
+        """조건에 맞는 행 = True 인 bool 배열"""
+        size = self.size
+        m = np.ones(size, dtype=bool)
+        if analyzed is not None:
+            m &= self.columns['analyzed'][:size] == (1 if analyzed else 0)
+        codes = self.columns['ticker'][:size]
+        if has_ticker:
+            m &= codes >= 0
+            empty = self.categories['ticker'].codes_of([''])
+            if empty:
+                m &= codes != empty[0]
+        if tickers is not None:
+            m &= np.isin(codes, self.categories['ticker'].codes_of(tickers))
+        if exclude_tickers:
+            junk = self.categories['ticker'].codes_of(exclude_tickers)
+            if junk:
+                m &= ~np.isin(codes, junk)
+        if since is not None:
+            m &= self.columns['pub_ts'][:size] >= np.datetime64(since, 's')
+        return m
+
+    def frame(self, names, mask=None, limit=None, newest_first=True, by='pub_ts'):
+        """mask 에 맞는 행만 꺼내 DataFrame (by 내림차순 = 발표시간/중요도 순, 앞에서 limit 개)
+
+        정렬/슬라이스는 선택된 행 번호로만 하고, 컬럼 값은 마지막에 그 행만 복사
+        """
+        size = self.size
+        idx = np.arange(size) if mask is None else np.flatnonzero(mask[:size])
+        if newest_first:
+            # NaT/NaN 은 맨 뒤로 (SQL 의 ORDER BY ... DESC 에서 NULL 과 같은 위치)
+            values = self.columns[by][idx]
+            if by == 'pub_ts':
+                key = np.where(np.isnat(values), np.datetime64('1970-01-01', 's'), values)
+            else:
+                key = np.where(np.isnan(values), -np.inf, values)
+            idx = idx[np.argsort(key, kind='stable')[::-1]]
+        if limit is not None:
+            idx = idx[:limit]
+
+        data = {}
+        for name in names:
+            values = self.columns[name][idx]
+            if name in CATEGORY_COLUMNS:
+                values = pd.Categorical.from_codes(values, categories=self.categories[name].values)
+            data[name] = values
+        return pd.DataFrame(data)
+
+
+def dashboard_frame(store, now=None):
+    """app.py 첫 화면 (스냅샷이 없을 때): 최근 30일, 중요도 순 (ranking.py) 30건"""
+    since = (now or datetime.now()) - timedelta(days=DAYS)
+    mask = store.mask(analyzed=True, has_ticker=True, exclude_tickers=JUNK_TICKERS, since=since)
+    rows = store.frame(['pub_ts', 'summary_ko', 'title', 'ticker', 'impact_score', 'impact_calibrated', 'link'],
+                       mask, limit=LIMIT, by='rank_score')
+    return pd.DataFrame({
+        '발표시간': rows['pub_ts'].dt.strftime('%m/%d %H:%M'),
+        '한줄요약': rows['summary_ko'].fillna(rows['title']).str[:60] + '...',
+        '티커': rows['ticker'].astype(object),
+        '주가영향': rows['impact_calibrated'].fillna(rows['impact_score']),  # 보정 점수 (calibration.py)
+        '원문': rows['link'],
+    })
+
+
+if __name__ == "__main__":
+    store = NewsStore()
+    started = time.perf_counter()
+    stats = store.refresh()
+    print(f"📦 뉴스 {store.size}건 로드 {(time.perf_counter() - started) * 1000:.0f}ms {stats}")
+    started = time.perf_counter()
+    stats = store.refresh()
+    print(f"🔄 재갱신 {(time.perf_counter() - started) * 1000:.1f}ms {stats}")
@@ -0,0 +1,396 @@
+# pages/1_FDA_승인_예측_게임.py - FDA Drug Hunter: 승인 예측 게임
+import urllib.parse
+
+import streamlit as st
+
+from case_bank import bank_version, load_cases, new_deck
+from leaderboard import ScoreWriter, player_rank, top_scores
+
+st.set_page_config(page_title="FDA Drug Hunter 🎮", layout="wide", page_icon="🎮")
+
+GAME_ID = 'fda_hunter'
+
+
+@st.cache_resource
+def score_writer():
+    # 프로세스당 하나: 모든 세션의 점수를 모아서 leaderboard.db 에 저장
+    return ScoreWriter()
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_top_scores(limit=10):
+    return top_scores(GAME_ID, limit)
+
+
+ROUND_SIZE = 20  # 한 게임 = 케이스 20개 (케이스 뱅크가 커져도 게임 길이는 같음)
+
+
+@st.cache_resource(max_entries=2)
+def cached_case_bank(version):
+    # version = 파일 (mtime, size) + case_gen.py 버전 → 케이스가 바뀌면 다음 실행 때 다시 읽음
+    return load_cases()
+
+
+def new_round():
+    """새 게임: 덱을 이어서 쓰고, 남은 케이스가 모자라거나 케이스가 늘었으면 새로 섞음"""
+    remaining = len(st.session_state.deck) - st.session_state.deck_pos
+    if st.session_state.deck_size != len(DRUG_CASES) or remaining < min(ROUND_SIZE, len(DRUG_CASES)):
+        st.session_state.deck = new_deck(len(DRUG_CASES))
+        st.session_state.deck_size = len(DRUG_CASES)
+        st.session_state.deck_pos = 0
+    st.session_state.round_start = st.session_state.deck_pos
+
+
+def round_length():
+    return min(ROUND_SIZE, len(st.session_state.deck) - st.session_state.round_start)
+
+
+def draw_case():
+    """덱에서 다음 케이스 (이번 게임 분량을 다 풀었으면 결과 화면)"""
+    if st.session_state.deck_pos - st.session_state.round_start >= round_length():
+        st.session_state.game_finished = True
+        return
+    st.session_state.current_case = DRUG_CASES[st.session_state.deck[st.session_state.deck_pos]]
+    st.session_state.deck_pos += 1
+    st.session_state.answered = False
+
+st.header("🎮 FDA Drug Hunter: 승인 예측 게임")
+st.caption("실제 FDA 심사 케이스를 바탕으로 당신의 규제 전문가 실력을 테스트하세요!")
+
+# FDA 케이스 뱅크 (game_data/fda_cases.json + 뉴스에서 만든 game_cases) - 프로세스당 한 번만 읽음
+DRUG_CASES = cached_case_bank(bank_version())
+
+# 세션 상태 초기화
+if 'game_score' not in st.session_state:
+    st.session_state.game_score = 0
+if 'game_streak' not in st.session_state:
+    st.session_state.game_streak = 0
+if 'total_played' not in st.session_state:
+    st.session_state.total_played = 0
+if 'correct_count' not in st.session_state:
+    st.session_state.correct_count = 0
+if 'current_case' not in st.session_state:
+    st.session_state.current_case = None
+if 'answered' not in st.session_state:
+    st.session_state.answered = False
+if 'deck' not in st.session_state or st.session_state.deck_size > len(DRUG_CASES):
+    # 케이스 번호를 미리 섞어 둔 덱. 케이스는 뒤에 추가만 되므로 늘어나도 기존 덱은 유효
+    # (늘어난 케이스는 다음 게임부터), 줄었을 때만 새 덱
+    st.session_state.deck = new_deck(len(DRUG_CASES))
+    st.session_state.deck_size = len(DRUG_CASES)
+    st.session_state.deck_pos = 0
+    st.session_state.round_start = 0
+if 'game_finished' not in st.session_state:
+    st.session_state.game_finished = False
+if 'best_streak' not in st.session_state:
+    st.session_state.best_streak = 0
+if 'score_submitted' not in st.session_state:
+    st.session_state.score_submitted = False
+
+# 게임 종료 체크
+if st.session_state.game_finished:
+    st.balloons()
+    
+    st.success("### 🎉 게임 완료! 이번 라운드의 FDA 케이스를 모두 정복했습니다!")
+    
+    # 최종 결과
+    accuracy = (st.session_state.correct_count / st.session_state.total_played * 100) if st.session_state.total_played > 0 else 0
+    
+    col_result1, col_result2, col_result3 = st.columns(3)
+    with col_result1:
+        st.metric("🏆 최종 점수", f"{st.session_state.game_score}점", 
+                  delta=f"{st.session_state.game_score - st.session_state.total_played*10:+d}점 (보너스)" if st.session_state.game_score > st.session_state.total_played*10 else None)
+    with col_result2:
+        st.metric("🎯 정답률", f"{accuracy:.1f}%")
+    with col_result3:
+        st.metric("🔥 최고 연속 정답", st.session_state.best_streak if st.session_state.best_streak > 0 else "기록 없음")
+    
+    # 등급 판정
+    st.markdown("---")
+    if accuracy >= 90:
+        grade = "FDA Commissioner"
+        emoji = "🥇"
+        message = "당신은 FDA 국장이 되기에 충분한 실력입니다. 자문위원회 반대도 뒤집을 수 있는 수준!"
+    elif accuracy >= 80:
+        grade = "Senior Reviewer"
+        emoji = "🥈"
+        message = "CDER의 시니어 심사관 수준입니다. Surrogate endpoint 평가에 능숙하시네요!"
+    elif accuracy >= 70:
+        grade = "Regulatory Affairs 전문가"
+        emoji = "🥉"
+        message = "제약사 RA 팀에서 일하기 충분한 실력입니다. NDA 준비 맡겨도 되겠어요!"
+    elif accuracy >= 60:
+        grade = "규제과학 학습자"
+        emoji = "📚"
+        message = "기본은 잡았지만 논란이 된 케이스들을 더 공부해보세요!"
+    else:
+        grade = "입문자"
+        emoji = "🔰"
+        message = "다시 도전해보세요! 희귀질환과 surrogate endpoint 개념을 복습하면 좋을 것 같아요."
+    
+    st.success(f"### {emoji} {grade} 급!")
+    st.markdown(message)
+
+    # 리더보드 등록
+    st.markdown("---")
+    st.markdown("### 🏆 리더보드 등록")
+    if st.session_state.score_submitted:
+        st.success(f"등록 완료! 현재 약 {player_rank(GAME_ID, st.session_state.game_score)}위 (순위표는 30초마다 갱신)")
+    else:
+        col_name, col_submit = st.columns([3, 1])
+        with col_name:
+            nickname = st.text_input("닉네임", max_chars=20, placeholder="리더보드에 표시될 이름",
+                                     label_visibility="collapsed")
+        with col_submit:
+            if st.button("🏆 등록", use_container_width=True, type="primary"):
+                score_writer().submit(
+                    GAME_ID, nickname,
+                    score=st.session_state.game_score,
+                    accuracy=round(accuracy, 1),
+                    correct=st.session_state.correct_count,
+                    played=st.session_state.total_played,
+                    best_streak=st.session_state.best_streak,
+                )
+                st.session_state.score_submitted = True
+                st.rerun()
+    
+    # 공유 링크 생성
+    st.markdown("---")
+    st.markdown("### 🔗 결과 공유하기")
+    
+    # 앱 URL (배포된 Streamlit 주소)
+    app_url = "https://owndrug-aigmgmxuay3ntjszaxupmv.streamlit.app"
+    
+    # 공유 메시지 생성
+    share_text = f"""🎮 FDA Drug Hunter 결과
+
+{emoji} 등급: {grade}
+🎯 정답률: {accuracy:.1f}%
+🏆 점수: {st.session_state.game_score}점
+
+나도 FDA 승인 예측 게임에 도전해보세요!
+"""
+    
+    # URL 인코딩
+    encoded_text = urllib.parse.quote(share_text)
+    encoded_url = urllib.parse.quote(app_url)
+    
+    # 공유 버튼들
+    col_share1, col_share2, col_share3 = st.columns(3)
+    
+    with col_share1:
+        twitter_url = f"https://twitter.com/intent/tweet?text={encoded_text}&url={encoded_url}"
+        st.markdown(f"[🐦 트위터로 공유]({twitter_url})")
+    
+    with col_share2:
+        # 카카오톡은 웹 공유 API 사용 (모바일에서만 작동)
+        kakao_text = share_text.replace('\n', '%0A')
+        st.markdown(f"💬 카카오톡으로 공유")
+        st.caption("(모바일에서 복사 후 전송)")
+    
+    with col_share3:
+        # 링크 복사용
+        st.code(app_url, language=None)
+        st.caption("링크 복사하기")
+    
+    # 텍스트 복사 영역
+    with st.expander("📋 공유 메시지 복사"):
+        st.text_area("아래 내용을 복사하세요", share_text + f"\n\n{app_url}", height=200)
+    
+    # 다시 시작 버튼
+    st.markdown("---")
+    col_btn1, col_btn2 = st.columns(2)
+    with col_btn1:
+        if st.button("🔄 처음부터 다시 시작", use_container_width=True, type="primary"):
+            st.session_state.game_score = 0
+            st.session_state.game_streak = 0
+            st.session_state.total_played = 0
+            st.session_state.correct_count = 0
+            st.session_state.current_case = None
+            st.session_state.answered = False
+            new_round()
+            st.session_state.game_finished = False
+            st.session_state.best_streak = 0
+            st.session_state.score_submitted = False
+            st.rerun()
+    
+    with col_btn2:
+        if st.button("📰 뉴스 페이지로", use_container_width=True):
+            st.session_state.game_score = 0
+            st.session_state.game_streak = 0
+            st.session_state.total_played = 0
+            st.session_state.correct_count = 0
+            st.session_state.current_case = None
+            st.session_state.answered = False
+            new_round()
+            st.session_state.game_finished = False
+            st.session_state.best_streak = 0
+            st.session_state.score_submitted = False
+            st.switch_page("app.py")
+
+else:
+    # 새 케이스 시작 (중복 방지)
+    if st.button("🎲 새로운 약물 케이스", use_container_width=True, type="primary"):
+        # 덱에서 다음 케이스 (모든 케이스를 다 본 경우 결과 화면)
+        draw_case()
+        st.rerun()
+
+    # 게임 표시
+    if st.session_state.current_case:
+        case = st.session_state.current_case
+        
+        # 약물 정보 카드
+        st.markdown("### 💊 FDA 심사 대상 약물")
+        
+        col1, col2 = st.columns([2, 1])
+        
+        with col1:
+            st.markdown(f"**약물명**: {case['name']}")
+            st.markdown(f"**제약사**: {case['company']}")
+            st.markdown(f"**적응증**: {case['indication']}")
+            st.markdown("---")
+            st.markdown("#### 📊 임상시험 데이터")
+            st.markdown(f"- **Phase 3 결과**: {case['phase3_result']}")
+            st.markdown(f"- **Primary Endpoint**: {case['primary_endpoint']}")
+            st.markdown(f"- **Biomarker/Surrogate**: {case['biomarker']}")
+            st.markdown(f"- **자문위원회**: {case['advisory_vote']}")
+            st.markdown(f"- **안전성**: {case['safety']}")
+        
+        with col2:
+            st.markdown("#### 🤔 당신의 판단은?")
+            st.markdown(f"**현재 점수**: {st.session_state.game_score}점")
+            st.markdown(f"**연속 정답**: {st.session_state.game_streak}회")
+            st.markdown(f"**진행 상황**: {st.session_state.deck_pos - st.session_state.round_start}/{round_length()}")
+            if st.session_state.total_played > 0:
+                accuracy = (st.session_state.correct_count / st.session_state.total_played * 100)
+                st.markdown(f"**정답률**: {accuracy:.1f}%")
+        
+        # 답변 버튼
+        if not st.session_state.answered:
+            col_btn1, col_btn2 = st.columns(2)
+            
+            with col_btn1:
+                if st.button("✅ 승인", use_container_width=True, type="primary"):
+                    st.session_state.answered = True
+                    st.session_state.total_played += 1
+                    
+                    if case['answer'] == True:
+                        st.session_state.correct_count += 1
+                        bonus = 5 if st.session_state.game_streak >= 2 else 0
+                        points = 10 + bonus
+                        st.session_state.game_score += points
+                        st.session_state.game_streak += 1
+                        st.session_state.best_streak = max(st.session_state.best_streak, st.session_state.game_streak)
+                        st.success(f"🎉 정답! +{points}점 {'(연속보너스 +5점!)' if bonus > 0 else ''}")
+                    else:
+                        st.session_state.game_streak = 0
+                        st.error("❌ 오답!")
+                    
+                    st.rerun()
+            
+            with col_btn2:
+                if st.button("❌ 반려/철회", use_container_width=True, type="secondary"):
+                    st.session_state.answered = True
+                    st.session_state.total_played += 1
+                    
+                    if case['answer'] == False:
+                        st.session_state.correct_count += 1
+                        bonus = 5 if st.session_state.game_streak >= 2 else 0
+                        points = 10 + bonus
+                        st.session_state.game_score += points
+                        st.session_state.game_streak += 1
+                        st.session_state.best_streak = max(st.session_state.best_streak, st.session_state.game_streak)
+                        st.success(f"🎉 정답! +{points}점 {'(연속보너스 +5점!)' if bonus > 0 else ''}")
+                    else:
+                        st.session_state.game_streak = 0
+                        st.error("❌ 오답!")
+                    
+                    st.rerun()
+        
+        # 정답 공개
+        if st.session_state.answered:
+            if case['answer']:
+                st.success("### ✅ FDA 결정: 승인")
+            else:
+                st.error("### ❌ FDA 결정: 반려/철회")
+            
+            st.info(f"**💡 해설**: {case['reason']}")
+            
+            if case['ticker'] != "N/A":
+                st.markdown(f"**💰 관련 종목**: `{case['ticker']}`")
+            
+            # 다음 케이스 또는 결과 화면
+            if st.button("➡️ 다음 케이스", use_container_width=True):
+                # 덱에서 다음 케이스 (모든 케이스를 다 본 경우 → 결과 화면)
+                draw_case()
+                st.rerun()
+
+    else:
+        st.info("👆 위의 '새로운 약물 케이스' 버튼을 눌러 게임을 시작하세요!")
+        
+        # 게임 설명
+        with st.expander("📖 게임 방법"):
+            st.markdown(f"""
+            ### 게임 규칙
+            1. **실제 FDA 심사 케이스** {len(DRUG_CASES)}개 중 {ROUND_SIZE}개의 임상시험 데이터가 제공됩니다 (뉴스에서 계속 추가)
+            2. 제공된 정보를 보고 **승인 또는 반려**를 예측하세요
+            3. 정답 시 **10점**, 3연속 정답 시 **보너스 +5점**
+            4. **중복 없이** {ROUND_SIZE}개 케이스를 모두 풀면 **최종 결과 화면**이 나옵니다
+            5. 결과를 **SNS로 공유**하여 친구들에게 도전장을 내밀 수 있습니다!
+            
+            ### 주요 케이스
+            - **Aduhelm**: 자문위원 0:10 반대했지만 승인
+            - **Exondys 51**: 12명 데이터로 승인
+            - **Opdivo 간암**: 타 적응증 성공해도 p=0.075로 반려
+            - **Nuplazid**: 사망률 논란에도 대안 부재로 승인 유지
+            
+            ### 팁
+            - **Surrogate endpoint**만 개선되고 임상적 benefit이 불명확하면 위험
+            - **희귀질환**은 데이터가 부족해도 승인될 수 있음
+            - **자문위원회 반대**를 뒤집고 승인된 케이스도 있음
+            - **안전성 시그널**이 있으면 효과가 좋아도 반려될 수 있음
+            """)
+
+    # 리더보드
+    st.markdown("---")
+    col_stat1, col_stat2, col_stat3, col_stat4 = st.columns(4)
+    with col_stat1:
+        st.metric("🏆 총점", st.session_state.game_score)
+    with col_stat2:
+        st.metric("🔥 연속 정답", st.session_state.game_streak)
+    with col_stat3:
+        st.metric("📊 플레이 횟수", st.session_state.total_played)
+    with col_stat4:
+        if st.session_state.total_played > 0:
+            accuracy = (st.session_state.correct_count / st.session_state.total_played * 100)
+            st.metric("🎯 정답률", f"{accuracy:.1f}%")
+        else:
+            st.metric("🎯 정답률", "0%")
+
+    # 글로벌 리더보드
+    st.markdown("#### 🏆 명예의 전당 (TOP 10)")
+    top = cached_top_scores()
+    if top:
+        st.dataframe(
+            [{"순위": i, "닉네임": player, "점수": score, "정답률": f"{acc or 0:.1f}%",
+              "최고 연속": streak or 0, "날짜": (at or '')[:10]}
+             for i, (player, score, acc, streak, at) in enumerate(top, 1)],
+            use_container_width=True,
+            hide_index=True,
+        )
+    else:
+        st.caption(f"아직 등록된 기록이 없습니다. {ROUND_SIZE}개 케이스를 모두 풀고 첫 번째 주인공이 되어보세요!")
+
+    if st.button("🔄 게임 리셋"):
+        st.session_state.game_score = 0
+        st.session_state.game_streak = 0
+        st.session_state.total_played = 0
+        st.session_state.correct_count = 0
+        st.session_state.current_case = None
+        st.session_state.answered = False
+        new_round()
+        st.session_state.game_finished = False
+        st.session_state.best_streak = 0
+        st.session_state.score_submitted = False
+        st.rerun()
+
@@ -0,0 +1,38 @@
+# pages/2_약사_피하기.py - 약사 피하기 게임 (PC + 모바일 지원)
+import streamlit as st
+
+from game_assets import render_game
+
+st.set_page_config(page_title="약사 피하기 🏃", layout="wide", page_icon="🏃")
+
+def dodge_pharmacist_game():
+    """약사 피하기 미니게임 - PC 키보드 + 모바일 터치 지원"""
+    
+    st.header("🎮 약사 피하기 게임")
+    st.markdown("**PC:** ← → 방향키로 이동 | **모바일:** 화면 터치로 이동 | 💊 약을 먹으면 점수 +1 | 💣 부작용 폭탄 피하기!")
+    
+    # 게임 본체는 static/games 의 해시 파일 (game_src/dodge.html → python build_assets.py)
+    # 브라우저 캐시에서 불러오고, 여기서는 iframe 주소만 보냄
+    render_game('dodge', height=850)
+    
+    # 게임 설명
+    with st.expander("🎯 게임 가이드"):
+        st.markdown("""
+        ### 게임 방법
+        - **목표**: 하늘에서 떨어지는 약(💊)을 최대한 많이 먹으세요!
+        - **조작 (PC)**: 키보드 ← → 방향키 또는 A, D 키로 좌우 이동
+        - **조작 (모바일)**: 화면을 터치하면 캐릭터가 터치한 위치로 이동
+        - **조작 (PC 마우스)**: 마우스를 클릭한 채로 드래그해도 이동 가능
+        - **주의**: 💣 부작용 폭탄에 맞으면 게임 오버!
+        
+        ### 모바일 팁
+        - 화면 아무 곳이나 터치하면 캐릭터가 그 위치로 부드럽게 이동합니다
+        - 손가락을 계속 움직이면 캐릭터도 따라 움직입니다
+        - PC에서도 마우스로 클릭&드래그 가능!
+        
+        **팁**: 욕심내지 말고 안전하게 플레이하세요! 💊
+        """)
+
+# 게임 실행
+if __name__ == "__main__":
+    dodge_pharmacist_game()
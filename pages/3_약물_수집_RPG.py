@@ -0,0 +1,97 @@
+# pages/3_약물_수집_RPG.py - 약물 수집 RPG, 픽셀 그래픽 (100x100 대형 맵)
+import random
+
+import streamlit as st
+
+from game_assets import render_game
+from map_gen import daily_seed, map_fragment
+
+st.set_page_config(page_title="약물 수집 RPG 💊", layout="wide", page_icon="💊")
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def cached_map(seed, size=100):
+    # 같은 시드는 한 번만 생성 (오늘의 맵은 모든 사용자가 공유)
+    return map_fragment(seed, size)
+
+
+def new_seed():
+    st.session_state.rpg_seed = random.randint(1, 999_999)
+
+
+def pixel_drug_collector_game():
+    """픽셀 그래픽 약물 수집 RPG - 이모지 없이 순수 픽셀아트"""
+    
+    st.header("💊 약물 수집 RPG - 레트로 픽셀 에디션")
+    st.markdown("**100x100 거대 맵을 탐험하며 픽셀 약물을 수집하고 환자를 치료하세요!** | WASD 또는 방향키 🎮")
+    
+    # 맵 선택: 오늘의 맵(날짜 시드) 또는 시드 번호로 공유/재도전
+    if 'rpg_seed' not in st.session_state:
+        new_seed()
+
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        mode = st.radio("맵", ["📅 오늘의 맵", "🎲 랜덤 맵"], horizontal=True, label_visibility="collapsed")
+    if mode == "📅 오늘의 맵":
+        seed = daily_seed()
+        with col2:
+            st.caption(f"시드 {seed} · 모두 같은 맵")
+    else:
+        with col2:
+            seed = st.number_input("시드", min_value=1, max_value=999_999, key='rpg_seed',
+                                   label_visibility="collapsed")
+        with col3:
+            st.button("🔄 새 맵", use_container_width=True, on_click=new_seed)
+
+    # 게임 본체는 static/games 의 해시 파일 (game_src/rpg.html → python build_assets.py)
+    # 브라우저 캐시에서 불러오고, 맵은 서버에서 만든 격자를 #fragment 로만 보냄
+    render_game('rpg', height=1200, fragment=cached_map(int(seed)))
+    
+    # 게임 설명
+    with st.expander("🎯 게임 가이드"):
+        st.markdown("""
+        ### 🎮 진짜 픽셀 그래픽 RPG!
+        
+        **맵 크기**: 100x100 (10,000 타일!)  
+        **약물 종류**: 10가지  
+        **환자 종류**: 10가지  
+        **환자 수**: 30명  
+        **맵**: 오늘의 맵은 날짜로 정해져서 모두 같은 맵, 랜덤 맵은 시드 번호로 공유 가능
+        
+        ### 약물 & 질병 매칭
+        
+        | 약물 | 치료 가능 질병 |
+        |------|----------------|
+        | 아스피린 | 두통, 발열 |
+        | 인슐린 | 당뇨병 |
+        | 페니실린 | 감염 |
+        | 모르핀 | 중증 통증 |
+        | 메트포르민 | 당뇨병 |
+        | 와파린 | 혈전 |
+        | 리시노프릴 | 고혈압 |
+        | 오메프라졸 | 역류성 식도염 |
+        | 알부테롤 | 천식 |
+        | 레보티록신 | 갑상선 저하증 |
+        
+        ### 조작법
+        - **PC**: WASD 또는 방향키
+        - **모바일**: 화면 하단 버튼
+        
+        ### 픽셀 그래픽 특징
+        - ✅ 이모지 없음
+        - ✅ 순수 픽셀아트 (fillRect)
+        - ✅ 레트로 8비트 느낌
+        - ✅ crisp-edges 렌더링
+        
+        ### 팁
+        - 미니맵 활용 (우측 상단)
+        - 노랑=약물, 빨강=환자, 초록=나
+        - 당뇨병은 인슐린/메트포르민 둘 다 OK
+        - 두통/발열은 아스피린으로 치료
+        
+        **100x100 거대 픽셀 월드를 탐험하세요!** 🎮✨
+        """)
+
+# 게임 실행
+if __name__ == "__main__":
+    pixel_drug_collector_game()
@@ -0,0 +1,154 @@
+# pages/4_티커_상세.py - 티커별 뉴스 / 주가영향 추이
+# 집계(건수, 평균, 추이)는 ticker_daily (ticker_stats.py, 분석기가 갱신) 에서 일 수만큼만 읽고
+# 뉴스 목록은 news(ticker, pub_date) 인덱스로 최신순 N개만 → 뉴스가 많은 티커도 바로 열림
+# 주소에 ?ticker=PFE 로 바로 열 수 있음
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from calibration import SCORE_SQL
+from snapshot import JUNK_TICKERS, score_style
+from ticker_stats import data_version
+
+st.set_page_config(page_title="티커 상세 📈", layout="wide", page_icon="📈")
+
+st.title("📈 티커 상세")
+st.caption("종목별 뉴스와 AI 주가영향 점수 추이 (티커는 정확하지 않을 수 있습니다.)")
+
+DB_PATH = 'fda_news.db'
+PAGE_SIZE = 50
+
+
+def query(sql, params=()):
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        return pd.read_sql_query(sql, conn, params=params)
+    except Exception:
+        # 아직 ticker_daily 가 없는 DB
+        return pd.DataFrame()
+    finally:
+        conn.close()
+
+
+@st.cache_data(ttl=60, max_entries=4)
+def ticker_list(version):
+    return query(f"""
+        SELECT ticker, SUM(news_count) AS news
+        FROM ticker_daily
+        WHERE ticker NOT IN ({','.join('?' * len(JUNK_TICKERS))}) AND ticker != 'NONE'
+        GROUP BY ticker
+        ORDER BY news DESC, ticker
+    """, JUNK_TICKERS)
+
+
+@st.cache_data(ttl=60, max_entries=256)
+def ticker_daily(ticker, version):
+    return query("""
+        SELECT day, news_count, scored_count, score_sum, score_min, score_max, high_count
+        FROM ticker_daily
+        WHERE ticker = ?
+        ORDER BY day
+    """, (ticker,))
+
+
+@st.cache_data(ttl=60, max_entries=256)
+def ticker_news(ticker, limit, version):
+    return query(f"""
+        SELECT pub_date AS 발표시간,
+               COALESCE(summary_ko, title) AS 한줄요약,
+               news_type AS 유형,
+               {SCORE_SQL} AS 주가영향,
+               link AS 원문
+        FROM news
+        WHERE ticker = ? AND analyzed = 1
+        ORDER BY pub_date DESC
+        LIMIT ?
+    """, (ticker, limit))
+
+
+def show_more():
+    st.session_state.ticker_limit += PAGE_SIZE
+
+
+def select_ticker():
+    st.session_state.ticker_limit = PAGE_SIZE
+
+
+version = data_version(DB_PATH)
+tickers = ticker_list(version)
+
+if tickers.empty:
+    st.warning("📡 티커 집계가 아직 없습니다 → `python ticker_stats.py` 실행하세요!")
+    st.stop()
+
+options = tickers['ticker'].tolist()
+counts = dict(zip(tickers['ticker'], tickers['news']))
+if st.session_state.get('ticker') not in counts:
+    wanted = st.query_params.get('ticker', options[0]).upper()
+    st.session_state.ticker = wanted if wanted in counts else options[0]
+    st.session_state.ticker_limit = PAGE_SIZE
+ticker = st.selectbox("티커", options, key='ticker', on_change=select_ticker,
+                      format_func=lambda t: f"{t} ({counts[t]}건)")
+st.query_params['ticker'] = ticker
+
+daily = ticker_daily(ticker, version)
+if daily.empty:
+    st.info(f"📰 {ticker} 뉴스가 없습니다.")
+    st.stop()
+
+# 통계 (일간 집계를 합치기만 함)
+scored = daily['scored_count'].sum()
+avg = daily['score_sum'].sum() / scored if scored else None
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    st.metric("총 뉴스", int(daily['news_count'].sum()))
+with col2:
+    st.metric("평균 점수", f"{avg:.1f}" if avg is not None else "N/A")
+with col3:
+    high = int(daily['high_count'].sum())
+    st.metric("고영향 (7+)", high, "🔥" if high > 0 else "")
+with col4:
+    st.metric("마지막 뉴스", daily['day'].iloc[-1])
+
+# 추이: 일 평균 + 30일 이동 평균 (점수 합/건수를 각각 굴려서 나눔)
+series = daily.set_index(pd.to_datetime(daily['day']))
+rolling = series[['score_sum', 'scored_count']].rolling('30D').sum()
+trend = pd.DataFrame({
+    '일 평균': series['score_sum'] / series['scored_count'].replace(0, np.nan),
+    '30일 이동 평균': rolling['score_sum'] / rolling['scored_count'].replace(0, np.nan),
+})
+
+st.markdown("---")
+col_left, col_right = st.columns(2)
+with col_left:
+    st.subheader("⭐ 주가영향 추이")
+    st.line_chart(trend)
+with col_right:
+    st.subheader("📰 월별 뉴스 수")
+    monthly = series['news_count'].resample('MS').sum()
+    monthly.index = monthly.index.strftime('%Y-%m')
+    st.bar_chart(monthly.rename('뉴스'))
+
+# 뉴스 목록 (최신순, 더 보기로 PAGE_SIZE 씩)
+st.markdown("---")
+st.subheader(f"🗞️ {ticker} 뉴스")
+limit = st.session_state.ticker_limit
+news = ticker_news(ticker, limit, version)
+styles = [score_style(v) for v in news['주가영향']]
+st.dataframe(
+    news.style.apply(lambda col: styles, subset=['주가영향']),
+    use_container_width=True,
+    hide_index=True,
+    column_config={
+        "원문": st.column_config.LinkColumn("원문 링크"),
+        "주가영향": st.column_config.NumberColumn("주가영향", format="%.1f ⭐")
+    }
+)
+total = int(daily['news_count'].sum())
+if len(news) < total:
+    st.button(f"더 보기 ({len(news)}/{total})", on_click=show_more)
+
+st.markdown("---")
+st.info("📢 주가영향 점수가 10점에 가까울수록 큰 주가 상승을, 0점에 가까울수록 큰 주가 하락을 예측합니다.")
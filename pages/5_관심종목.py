@@ -0,0 +1,125 @@
+# pages/5_관심종목.py - 내 관심 종목 뉴스 피드
+# 관심 종목은 닉네임별로 watchlist.db 에 저장 (주소에 ?user=닉네임 으로 바로 열 수 있음)
+# 피드는 watchlist.fetch_feed (종목별 인덱스 + 키셋 페이지네이션) 결과를
+# 관심 종목 묶음 해시 + 커서 단위로 캐시 → 같은 종목을 보는 사용자끼리 공유
+import sqlite3
+
+import pandas as pd
+import streamlit as st
+
+from snapshot import JUNK_TICKERS, score_style
+from ticker_stats import data_version
+from watchlist import (FIRST_CURSOR, MAX_TICKERS, fetch_feed, load_watchlist,
+                       normalize_user, save_watchlist, watchlist_key)
+
+st.set_page_config(page_title="관심 종목 ⭐", layout="wide", page_icon="⭐")
+
+st.title("⭐ 관심 종목")
+st.caption("관심 종목으로 저장한 티커의 뉴스만 최신순으로 (티커는 정확하지 않을 수 있습니다.)")
+
+DB_PATH = 'fda_news.db'
+PAGE_SIZE = 50
+
+
+@st.cache_data(ttl=60, max_entries=4)
+def ticker_options(version):
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        return [t for (t,) in conn.execute(f"""
+            SELECT ticker FROM ticker_daily
+            WHERE ticker NOT IN ({','.join('?' * len(JUNK_TICKERS))}) AND ticker != 'NONE'
+            GROUP BY ticker
+            ORDER BY SUM(news_count) DESC, ticker
+        """, JUNK_TICKERS)]
+    except sqlite3.OperationalError:
+        # 아직 ticker_daily 가 없는 DB
+        return []
+    finally:
+        conn.close()
+
+
+@st.cache_data(ttl=60, max_entries=512)
+def feed_page(key, _tickers, cursor, version):
+    """한 페이지 (key = 관심 종목 묶음 해시, _tickers 는 캐시 키에서 제외)"""
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        return fetch_feed(conn, _tickers, cursor, PAGE_SIZE)
+    finally:
+        conn.close()
+
+
+def select_user():
+    user = normalize_user(st.session_state.watch_user)
+    st.session_state.watch_tickers = sorted(load_watchlist(user))
+    st.session_state.feed_pages = 1
+    if user:
+        st.query_params['user'] = user
+
+
+def save_tickers():
+    user = normalize_user(st.session_state.watch_user)
+    save_watchlist(user, st.session_state.watch_tickers)
+    st.session_state.feed_pages = 1
+
+
+def show_more():
+    st.session_state.feed_pages += 1
+
+
+if 'watch_user' not in st.session_state:
+    st.session_state.watch_user = st.query_params.get('user', '')
+    select_user()
+
+version = data_version(DB_PATH)
+options = ticker_options(version)
+# 저장해 둔 티커가 아직 집계에 없어도 선택 목록에 남김
+options = sorted(set(st.session_state.watch_tickers) - set(options)) + options
+
+col_user, col_tickers = st.columns([1, 3])
+with col_user:
+    st.text_input("닉네임", key='watch_user', on_change=select_user, max_chars=20,
+                  placeholder="관심 종목을 저장할 이름")
+user = normalize_user(st.session_state.watch_user)
+with col_tickers:
+    st.multiselect("관심 종목", options, key='watch_tickers', on_change=save_tickers,
+                   max_selections=MAX_TICKERS, disabled=not user,
+                   placeholder="티커 선택 (PFE, MRK ...)")
+
+if not user:
+    st.info("👤 닉네임을 입력하면 관심 종목이 저장됩니다.")
+    st.stop()
+
+tickers = tuple(sorted(st.session_state.watch_tickers))
+if not tickers:
+    st.info("📌 관심 종목을 추가하세요!")
+    st.stop()
+
+# 페이지마다 이전 페이지의 마지막 행 다음부터 (앞 페이지는 캐시에서)
+key = watchlist_key(tickers)
+rows, cursor = [], FIRST_CURSOR
+for _ in range(st.session_state.feed_pages):
+    page, cursor = feed_page(key, tickers, cursor, version)
+    rows += page
+    if cursor is None:
+        break
+
+if not rows:
+    st.info("📰 관심 종목 뉴스가 아직 없습니다.")
+    st.stop()
+
+news = pd.DataFrame(rows, columns=['id', '발표시간', '한줄요약', '티커', '유형', '주가영향', '원문']).drop(columns='id')
+styles = [score_style(v) for v in news['주가영향']]
+st.dataframe(
+    news.style.apply(lambda col: styles, subset=['주가영향']),
+    use_container_width=True,
+    hide_index=True,
+    column_config={
+        "원문": st.column_config.LinkColumn("원문 링크"),
+        "주가영향": st.column_config.NumberColumn("주가영향", format="%.1f ⭐")
+    }
+)
+if cursor is not None:
+    st.button(f"더 보기 ({len(news)}건 표시 중)", on_click=show_more)
+
+st.markdown("---")
+st.info("📢 주가영향 점수가 10점에 가까울수록 큰 주가 상승을, 0점에 가까울수록 큰 주가 하락을 예측합니다.")
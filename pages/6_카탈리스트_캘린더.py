@@ -0,0 +1,117 @@
+# pages/6_카탈리스트_캘린더.py - PDUFA 목표일 / FDA 자문위원회 일정 달력
+# 일정은 분석기가 뉴스에서 뽑아 catalysts 테이블에 저장 (catalysts.py)
+# 달력 한 달 / 앞으로 N일 = catalysts(event_date) 인덱스 구간만 읽음, 일정이 바뀔 때만 다시 조회
+# 주소에 ?ticker=ABCD 로 한 티커 일정만 볼 수 있음
+import calendar
+import sqlite3
+from datetime import date, timedelta
+
+import pandas as pd
+import streamlit as st
+
+from catalysts import EVENT_LABELS, PRECISION_LABELS, catalysts_version, upcoming
+from entities import clean_text
+
+st.set_page_config(page_title="카탈리스트 캘린더 📅", layout="wide", page_icon="📅")
+
+st.title("📅 카탈리스트 캘린더")
+st.caption("뉴스에서 뽑은 PDUFA 목표일과 FDA 자문위원회 일정 (날짜/티커는 정확하지 않을 수 있습니다.)")
+
+DB_PATH = 'fda_news.db'
+WEEKDAYS = ['일', '월', '화', '수', '목', '금', '토']
+EVENT_ICONS = {'pdufa': '⚖️', 'adcom': '🏛️'}
+
+
+def query(start, end, ticker, event_types):
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        return upcoming(conn, start, end, ticker or None, event_types)
+    except sqlite3.OperationalError:
+        # 아직 catalysts 테이블이 없는 DB
+        return []
+    finally:
+        conn.close()
+
+
+@st.cache_data(ttl=60, max_entries=64)
+def month_events(year, month, ticker, event_types, version):
+    start = date(year, month, 1)
+    end = start + timedelta(days=calendar.monthrange(year, month)[1])
+    return query(start, end, ticker, event_types)
+
+
+@st.cache_data(ttl=60, max_entries=64)
+def upcoming_events(today, days, ticker, event_types, version):
+    return query(today, today + timedelta(days=days), ticker, event_types)
+
+
+today = date.today()
+version = catalysts_version(DB_PATH)
+months = [(today.year + (today.month - 1 + i) // 12, (today.month - 1 + i) % 12 + 1) for i in range(-3, 13)]
+
+col_month, col_type, col_ticker = st.columns([1, 2, 1])
+with col_month:
+    year, month = st.selectbox("월", months, index=3, format_func=lambda ym: f"{ym[0]}년 {ym[1]}월")
+with col_type:
+    event_types = tuple(st.multiselect("일정 종류", list(EVENT_LABELS), default=list(EVENT_LABELS),
+                                       format_func=EVENT_LABELS.get))
+with col_ticker:
+    ticker = st.text_input("티커", value=st.query_params.get('ticker', ''), max_chars=10,
+                           placeholder="전체").strip().upper()
+
+if not event_types:
+    st.info("📌 일정 종류를 선택하세요!")
+    st.stop()
+
+# ------------------------------------------------------------------ 달력
+by_day = {}
+for event_date, precision, label, kind, event_ticker, *_ in month_events(year, month, ticker, event_types, version):
+    by_day.setdefault(event_date, []).append((precision, label, kind, event_ticker))
+
+st.subheader(f"{year}년 {month}월")
+st.caption("분기/반기처럼 기간으로만 나온 일정은 그 기간의 마지막 날에 표시")
+header = st.columns(7)
+for col, name in zip(header, WEEKDAYS):
+    col.markdown(f"**{name}**")
+for week in calendar.Calendar(firstweekday=6).monthdatescalendar(year, month):
+    cols = st.columns(7)
+    for col, day in zip(cols, week):
+        if day.month != month:
+            col.caption(str(day.day))
+            continue
+        mark = " 🔵" if day == today else ""
+        lines = [f"**{day.day}**{mark}"]
+        for precision, label, kind, event_ticker in by_day.get(day.isoformat(), []):
+            when = "" if precision == 'day' else f" ({label})"
+            lines.append(f"{EVENT_ICONS[kind]} {EVENT_LABELS[kind]} · {event_ticker or '-'}{when}")
+        col.markdown("  \n".join(lines))
+
+# ------------------------------------------------------------------ 앞으로 N일
+st.markdown("---")
+days = st.select_slider("앞으로", options=[30, 90, 180, 365], value=90, format_func=lambda d: f"{d}일")
+rows = upcoming_events(today, days, ticker, event_types, version)
+if not rows:
+    st.info("📰 이 기간에 잡힌 일정이 아직 없습니다.")
+    st.stop()
+
+events = pd.DataFrame([
+    {
+        '날짜': label,
+        'D-day': f"D-{(date.fromisoformat(event_date) - today).days}",
+        '정밀도': PRECISION_LABELS[precision],
+        '종류': EVENT_LABELS[kind],
+        '티커': event_ticker,
+        '한줄요약': clean_text(summary),
+        '발표시간': pub_date,
+        '원문': link,
+        '추출': method,
+    }
+    for event_date, precision, label, kind, event_ticker, summary, pub_date, link, method in rows
+])
+st.dataframe(
+    events,
+    use_container_width=True,
+    hide_index=True,
+    column_config={"원문": st.column_config.LinkColumn("원문 링크")}
+)
+st.caption(f"{len(events)}건 · 추출 = regex(날짜 문법) / llm(문법으로 못 찾은 글만)")
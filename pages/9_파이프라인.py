@@ -0,0 +1,277 @@
+# pages/9_파이프라인.py - 파이프라인 상태 (운영자용)
+# pipeline_runs / pipeline_spans 에 쌓인 기록을 GROUP BY로 집계해서 보여줌
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import streamlit as st
+
+from tracing import WEB_TRACE_DB
+
+st.set_page_config(page_title="파이프라인 상태 🛠️", layout="wide", page_icon="🛠️")
+
+st.title("🛠️ 파이프라인 상태")
+st.caption("수집기 · 분석기 · 대시보드 실행 기록 (tracing.py)")
+
+days = st.radio("기간", [1, 7, 30, 90], index=1, horizontal=True, format_func=lambda d: f"최근 {d}일")
+
+
+def query(sql, params=(), db_path='fda_news.db'):
+    conn = sqlite3.connect(db_path)
+    try:
+        return pd.read_sql_query(sql, conn, params=params)
+    except Exception:
+        # 아직 트레이스 테이블이 없는 DB
+        return pd.DataFrame()
+    finally:
+        conn.close()
+
+
+@st.cache_data(ttl=60)
+def source_stats(since, until):
+    return query("""
+        SELECT r.source AS 소스,
+               COUNT(DISTINCT r.id) AS 실행,
+               AVG(CASE WHEN s.stage = 'fetch' THEN s.duration_ms END) AS fetch_avg_ms,
+               MAX(CASE WHEN s.stage = 'fetch' THEN s.duration_ms END) AS fetch_max_ms,
+               AVG(CASE WHEN s.stage = 'fetch' THEN s.bytes END) AS fetch_bytes,
+               SUM(CASE WHEN s.stage = 'fetch' AND s.status != 'ok' THEN 1 ELSE 0 END) AS fetch_errors,
+               SUM(CASE WHEN s.stage = 'parse' THEN s.count ELSE 0 END) AS entries,
+               SUM(CASE WHEN s.stage = 'dedup' THEN s.count ELSE 0 END) AS checked,
+               SUM(CASE WHEN s.stage = 'dedup' THEN s.skipped ELSE 0 END) AS duplicates,
+               SUM(CASE WHEN s.stage = 'insert' THEN s.count ELSE 0 END) AS inserted
+        FROM pipeline_runs r
+        JOIN pipeline_spans s ON s.run_id = r.id
+        WHERE r.pipeline = 'collector' AND r.started_at >= ? AND r.started_at < ?
+        GROUP BY r.source
+        ORDER BY r.source
+    """, (since, until))
+
+
+@st.cache_data(ttl=60)
+def analyzer_stats(since, until):
+    return query("""
+        SELECT COUNT(DISTINCT r.id) AS runs,
+               SUM(CASE WHEN s.stage = 'update' THEN s.count ELSE 0 END) AS analyzed,
+               SUM(CASE WHEN s.stage = 'llm_call' THEN 1 ELSE 0 END) AS calls,
+               SUM(CASE WHEN s.stage = 'llm_call' AND s.status != 'ok' THEN 1 ELSE 0 END) AS errors,
+               AVG(CASE WHEN s.stage = 'llm_call' THEN s.duration_ms END) AS call_avg_ms,
+               SUM(CASE WHEN s.stage = 'llm_call' THEN s.tokens ELSE 0 END) AS tokens
+        FROM pipeline_runs r
+        JOIN pipeline_spans s ON s.run_id = r.id
+        WHERE r.pipeline = 'analyzer' AND r.started_at >= ? AND r.started_at < ?
+    """, (since, until))
+
+
+@st.cache_data(ttl=60)
+def run_durations(since, until):
+    # 대시보드 기록은 웹 서버의 WEB_TRACE_DB 에 따로 있음 (tracing.py)
+    sql = """
+        SELECT pipeline, COALESCE(source, '') AS source, status,
+               COUNT(*) AS runs, AVG(duration_ms) AS avg_ms, MAX(duration_ms) AS max_ms,
+               MAX(started_at) AS last_run
+        FROM pipeline_runs
+        WHERE started_at >= ? AND started_at < ?
+        GROUP BY pipeline, source, status
+        ORDER BY pipeline, source
+    """
+    frames = [query(sql, (since, until))]
+    if os.path.exists(WEB_TRACE_DB):
+        frames.append(query(sql, (since, until), WEB_TRACE_DB))
+    frames = [df for df in frames if not df.empty]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+@st.cache_data(ttl=60)
+def daily_trend(since):
+    return query("""
+        SELECT substr(r.started_at, 1, 10) AS day,
+               SUM(CASE WHEN s.stage = 'insert' THEN s.count ELSE 0 END) AS 수집,
+               SUM(CASE WHEN s.stage = 'update' THEN s.count ELSE 0 END) AS 분석,
+               SUM(CASE WHEN s.stage = 'llm_call' AND s.status != 'ok' THEN 1 ELSE 0 END) AS API오류
+        FROM pipeline_runs r
+        JOIN pipeline_spans s ON s.run_id = r.id
+        WHERE r.started_at >= ?
+        GROUP BY day
+        ORDER BY day
+    """, (since,))
+
+
+# 수집→분석 지연 (시간). analyzed_at / created_at 은 둘 다 UTC, analyzed_at 없는 예전 행은 제외
+# (pub_date 는 피드마다 다른 현지 시각이고 오프셋을 저장하지 않으므로 지연 계산에 쓰지 않음)
+# 분위수는 SQL 창 함수로: 정렬 순번이 ceil(q * n) 인 값 (행을 pandas 로 가져오지 않음)
+LATENCY_SQL = """
+    WITH lat AS (
+        SELECT substr(analyzed_at, 1, 10) AS day,
+               (julianday(analyzed_at) - julianday(created_at)) * 24 AS h
+        FROM news
+        WHERE analyzed_at >= ? AND analyzed_at < ? AND created_at IS NOT NULL
+    ), ranked AS (
+        SELECT {key} AS day, h,
+               ROW_NUMBER() OVER (PARTITION BY {key} ORDER BY h) AS rn,
+               COUNT(*) OVER (PARTITION BY {key}) AS n
+        FROM lat
+    )
+    SELECT day, MAX(n) AS n,
+           MIN(CASE WHEN rn >= 0.5 * n THEN h END) AS p50,
+           MIN(CASE WHEN rn >= 0.95 * n THEN h END) AS p95
+    FROM ranked
+    GROUP BY day
+    ORDER BY day
+"""
+
+
+@st.cache_data(ttl=60)
+def freshness(since, until):
+    """기간 전체 p50/p95 (1행, 기록이 없으면 빈 DataFrame)"""
+    return query(LATENCY_SQL.format(key="''"), (since, until))
+
+
+@st.cache_data(ttl=60)
+def daily_freshness(since, until):
+    return query(LATENCY_SQL.format(key='day'), (since, until))
+
+
+@st.cache_data(ttl=60)
+def backlog():
+    return query("""
+        SELECT COUNT(*) AS pending,
+               (julianday('now') - julianday(MIN(created_at))) * 24 AS oldest_h
+        FROM news
+        WHERE analyzed = 0
+    """)
+
+
+def fmt_time(dt):
+    return dt.strftime('%Y-%m-%d %H:%M:%S')
+
+
+now = datetime.now()
+# 이번 기간과 직전 기간을 같이 봐서 회귀를 바로 확인
+until = fmt_time(now + timedelta(minutes=1))
+since = fmt_time(now - timedelta(days=days))
+prev_since = fmt_time(now - timedelta(days=days * 2))
+# analyzed_at / created_at 은 UTC (실행 기록은 실행한 곳의 현지 시각)
+utc_now = datetime.now(timezone.utc).replace(tzinfo=None)
+utc_until = fmt_time(utc_now + timedelta(minutes=1))
+utc_since = fmt_time(utc_now - timedelta(days=days))
+utc_prev_since = fmt_time(utc_now - timedelta(days=days * 2))
+
+fresh = freshness(utc_since, utc_until)
+fresh_prev = freshness(utc_prev_since, utc_since)
+an = analyzer_stats(since, until)
+an_prev = analyzer_stats(prev_since, since)
+bl = backlog()
+
+
+def pct(df, col):
+    if df.empty or pd.isna(df[col].iloc[0]):
+        return None
+    return float(df[col].iloc[0])
+
+
+def delta(cur, prev, unit=""):
+    if cur is None or prev is None:
+        return None
+    return f"{cur - prev:+.1f}{unit}"
+
+
+# 1. 한눈에 보기
+st.subheader("📌 한눈에 보기")
+p50, p95 = pct(fresh, 'p50'), pct(fresh, 'p95')
+p50_prev, p95_prev = pct(fresh_prev, 'p50'), pct(fresh_prev, 'p95')
+
+col1, col2, col3, col4, col5 = st.columns(5)
+with col1:
+    pending = int(bl['pending'].iloc[0]) if not bl.empty else 0
+    st.metric("분석 대기", pending)
+with col2:
+    oldest = bl['oldest_h'].iloc[0] if not bl.empty else None
+    st.metric("가장 오래된 대기", f"{oldest:.1f}h" if pd.notna(oldest) else "-")
+with col3:
+    st.metric("수집→분석 p50", f"{p50:.1f}h" if p50 is not None else "-",
+              delta(p50, p50_prev, "h"), delta_color="inverse")
+with col4:
+    st.metric("수집→분석 p95", f"{p95:.1f}h" if p95 is not None else "-",
+              delta(p95, p95_prev, "h"), delta_color="inverse")
+with col5:
+    if not an.empty and an['calls'].iloc[0]:
+        err = an['errors'].iloc[0] / an['calls'].iloc[0] * 100
+        prev_err = (an_prev['errors'].iloc[0] / an_prev['calls'].iloc[0] * 100
+                    if not an_prev.empty and an_prev['calls'].iloc[0] else None)
+        st.metric("API 오류율", f"{err:.1f}%", delta(err, prev_err, "%p"), delta_color="inverse")
+    else:
+        st.metric("API 오류율", "-")
+
+# 2. 소스별 수집
+st.markdown("---")
+st.subheader("📰 소스별 수집")
+src = source_stats(since, until)
+if src.empty:
+    st.info("기간 내 수집 기록이 없습니다.")
+else:
+    src['중복률'] = (src['duplicates'] / src['checked'].where(src['checked'] > 0)).fillna(0) * 100
+    src['fetch 오류'] = src['fetch_errors']
+    st.dataframe(
+        src[['소스', '실행', 'fetch_avg_ms', 'fetch_max_ms', 'fetch_bytes', 'fetch 오류',
+             'entries', 'inserted', 'duplicates', '중복률']],
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "fetch_avg_ms": st.column_config.NumberColumn("fetch 평균", format="%.0f ms"),
+            "fetch_max_ms": st.column_config.NumberColumn("fetch 최대", format="%.0f ms"),
+            "fetch_bytes": st.column_config.NumberColumn("평균 크기", format="%.0f B"),
+            "entries": st.column_config.NumberColumn("RSS 항목"),
+            "inserted": st.column_config.NumberColumn("신규 저장"),
+            "duplicates": st.column_config.NumberColumn("중복"),
+            "중복률": st.column_config.NumberColumn("중복률", format="%.1f%%"),
+        }
+    )
+
+# 3. 분석기
+st.markdown("---")
+st.subheader("🤖 분석기")
+runs = run_durations(since, until)
+if an.empty or not an['runs'].iloc[0]:
+    st.info("기간 내 분석 기록이 없습니다.")
+else:
+    row = an.iloc[0]
+    analyzer_runs = runs[runs['pipeline'] == 'analyzer'] if not runs.empty else runs
+    total_min = (analyzer_runs['avg_ms'] * analyzer_runs['runs']).sum() / 60000 if not analyzer_runs.empty else 0
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("분석 건수", int(row['analyzed'] or 0))
+    with col2:
+        st.metric("처리량", f"{(row['analyzed'] or 0) / total_min:.1f}건/분" if total_min > 0 else "-")
+    with col3:
+        st.metric("LLM 평균 응답", f"{row['call_avg_ms'] or 0:.0f} ms")
+    with col4:
+        st.metric("API 토큰", f"{int(row['tokens'] or 0):,}")
+
+# 4. 추이
+st.markdown("---")
+st.subheader("📈 일별 추이")
+trend = daily_trend(since)
+if not trend.empty:
+    st.line_chart(trend.set_index('day')[['수집', '분석', 'API오류']])
+daily_fresh = daily_freshness(utc_since, utc_until)
+if not daily_fresh.empty:
+    st.line_chart(daily_fresh.set_index('day')['p50'].rename("수집→분석 p50 (h)"))
+    st.caption("수집 시각(created_at) 기준. 피드의 발행 시각은 소스마다 시간대가 달라 쓰지 않습니다.")
+
+# 5. 실행별 소요시간
+st.markdown("---")
+st.subheader("⏱️ 실행 기록")
+if runs.empty:
+    st.info("기간 내 실행 기록이 없습니다.")
+else:
+    st.dataframe(
+        runs,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "avg_ms": st.column_config.NumberColumn("평균", format="%.0f ms"),
+            "max_ms": st.column_config.NumberColumn("최대", format="%.0f ms"),
+        }
+    )
@@ -1,30 +1,23 @@
 # quick_check.py
-import sqlite3
-import pandas as pd
 from datetime import datetime, timedelta
 
-conn = sqlite3.connect('fda_news.db')
+from news_store import NewsStore
 
-# 티커 있는 뉴스
-df = pd.read_sql_query("""
-    SELECT pub_date, title, ticker, impact_score
-    FROM news 
-    WHERE analyzed = 1 
-    AND ticker IS NOT NULL
-    AND ticker NOT IN ('THE', 'NEWS', 'FDA')
-    ORDER BY pub_date DESC
-""", conn)
+store = NewsStore('fda_news.db')
+store.refresh()
 
-conn.close()
+# 티커 있는 뉴스
+analyzed = store.mask(analyzed=True, exclude_tickers=('THE', 'NEWS', 'FDA')) & (store.column('ticker') >= 0)  # ticker IS NOT NULL
+columns = ['pub_date', 'title', 'ticker', 'impact_score']
+df = store.frame(columns, analyzed)
 
 print("\n=== 분석 완료된 뉴스 (날짜순) ===\n")
 print(df)
 
-# 날짜 변환 & 30일 필터
-df['pub_date'] = pd.to_datetime(df['pub_date'], errors='coerce')
+# 30일 필터 (발표시간은 로드할 때 한 번만 변환해 둠)
 thirty_days_ago = datetime.now() - timedelta(days=30)
 
-recent = df[df['pub_date'] >= thirty_days_ago]
+recent = store.frame(columns, analyzed & store.mask(since=thirty_days_ago))
 
 print(f"\n=== 최근 30일 ({thirty_days_ago.strftime('%Y-%m-%d')} 이후) ===\n")
 print(recent)
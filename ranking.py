@@ -0,0 +1,157 @@
+# ranking.py - 대시보드 중요도 순위 (news.rank_score, 인덱스 idx_news_rank)
+# 발표시간 순만으로는 큰 FDA 승인이 자잘한 Fierce 기사에 밀려 30건 밖으로 나감
+# → 중요도 = 출처 가중치 × (1 + |점수 - 5|) × (1 + ln 같은 날 같은 티커 뉴스 수) × (1 + 키워드 태그)
+#   rank_score = ln(중요도) + 발표시간(시간) × ln2 / 반감기
+#   "지금 기준으로 반감기마다 절반" 으로 줄이는 것과 순서가 같음 (지금 시각은 모든 행에 같은 값이라 빠짐)
+#   → 시간이 지나도 다시 계산할 필요 없이 ORDER BY rank_score DESC 가 인덱스 순서 그대로
+# 분석기가 분석한 행 + 같은 (티커, 날짜) 묶음만 그때그때 갱신 (묶음 크기가 바뀌므로)
+# 가중치를 바꾸면 분석기 시작 시 / python ranking.py 로 전체 다시 계산 (UPDATE 한 번, 바뀐 행만 씀)
+# 보정을 다시 맞추면 calibration.py 가 같이 다시 계산
+# GitHub Actions 에는 numpy 가 없어서 표준 라이브러리만 사용
+import argparse
+import hashlib
+import json
+import math
+import re
+import sqlite3
+from datetime import datetime
+
+from calibration import SCORE_SQL
+from database import get_state, migrate, set_state
+from ticker_stats import ensure_ticker_daily
+
+HALF_LIFE_HOURS = 24.0  # 중요도 2배 = 하루 더 최신인 것과 같음
+EPOCH = datetime(2020, 1, 1)
+
+SOURCE_WEIGHTS = {'fda': 1.3, 'fierce': 1.0, 'globe': 0.8}  # globe = 회사 보도자료
+DEFAULT_SOURCE_WEIGHT = 1.0
+
+# 제목 키워드 태그 (합계 최대 1.0 → 중요도 최대 2배)
+TAGS = [
+    ('approval', r'\bapprov(?:al|es|ed)\b', 0.5),
+    ('rejection', r'complete response|\bCRL\b|\breject', 0.5),
+    ('breakthrough', r'breakthrough therapy|accelerated approval|priority review', 0.3),
+    ('deal', r'\bacqui(?:re|res|red|sition)\b|\bmerger\b|\bbuyout\b', 0.4),
+    ('phase3', r'phase (?:3|iii)\b|pivotal', 0.2),
+    ('safety', r'\brecall|warning letter|boxed warning|clinical hold', 0.3),
+]
+TAG_CAP = 1.0
+TAG_RE = [(name, re.compile(pattern, re.IGNORECASE), weight) for name, pattern, weight in TAGS]
+
+VERSION_KEY = 'ranking.version'  # 전체 다시 계산할 때마다 (NewsStore 재동기화 신호)
+PARAMS_KEY = 'ranking.params'    # 가중치 해시 - 바뀌면 분석기가 전체 다시 계산
+
+# 같은 날 같은 티커 뉴스 수 = ticker_daily (분석기가 먼저 갱신)
+RANK_SQL = f"""
+    news_rank(source, news_type, {SCORE_SQL},
+               COALESCE((SELECT news_count FROM ticker_daily d
+                         WHERE d.ticker = news.ticker AND d.day = substr(news.pub_date, 1, 10)), 1),
+               title, pub_date)
+"""
+
+
+def tag_bonus(title):
+    if not title:
+        return 0.0
+    return min(TAG_CAP, sum(weight for _, regex, weight in TAG_RE if regex.search(title)))
+
+
+def importance(source, news_type, score, cluster, title):
+    # 정책 뉴스(회사 못 찾음, news_type 없음)의 3.0 은 자리 채움 값이라 영향도로 치지 않음
+    deviation = abs(score - 5) if score is not None and news_type else 0.0
+    return (SOURCE_WEIGHTS.get(source, DEFAULT_SOURCE_WEIGHT)
+            * (1 + deviation)
+            * (1 + math.log(max(cluster or 1, 1)))
+            * (1 + tag_bonus(title)))
+
+
+def rank_score(source, news_type, score, cluster, title, pub_date):
+    """정렬 키. pub_date 를 못 읽으면 None (맨 뒤)"""
+    try:
+        dt = datetime.strptime(pub_date[:19], '%Y-%m-%d %H:%M:%S')
+    except (TypeError, ValueError):
+        return None
+    hours = (dt - EPOCH).total_seconds() / 3600
+    return round(math.log(importance(source, news_type, score, cluster, title)) + hours * math.log(2) / HALF_LIFE_HOURS, 6)
+
+
+def params_hash():
+    params = [HALF_LIFE_HOURS, sorted(SOURCE_WEIGHTS.items()), DEFAULT_SOURCE_WEIGHT, TAGS, TAG_CAP]
+    return hashlib.sha1(json.dumps(params).encode()).hexdigest()[:12]
+
+
+def register(conn):
+    conn.create_function('news_rank', 6, rank_score, deterministic=True)
+
+
+def update_ranks(conn, ids=(), keys=()):
+    """분석된 행(ids) + 묶음 크기가 바뀐 (티커, 날짜) 묶음(keys) 만 다시 계산
+
+    커밋은 호출한 쪽에서 (분석 결과와 같은 트랜잭션)
+    """
+    register(conn)
+    updated = 0
+    ids = list(ids)
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        updated += conn.execute(f"""
+            UPDATE news SET rank_score = {RANK_SQL}
+            WHERE analyzed = 1 AND id IN ({','.join('?' * len(chunk))})
+        """, chunk).rowcount
+    for key in {k for k in keys if k}:
+        ticker, day = key
+        updated += conn.execute(f"""
+            UPDATE news SET rank_score = {RANK_SQL}
+            WHERE ticker = ? AND pub_date >= ? AND pub_date < ? AND analyzed = 1
+        """, (ticker, day, day + '~')).rowcount
+    return updated
+
+
+def rank_all(conn):
+    """전체 다시 계산 - 값이 바뀐 행만 씀 (DB 파일이 괜히 바뀌지 않게). 커밋까지 함"""
+    register(conn)
+    updated = conn.execute(f"""
+        UPDATE news SET rank_score = CASE WHEN analyzed = 1 THEN {RANK_SQL} END
+        WHERE rank_score IS NOT (CASE WHEN analyzed = 1 THEN {RANK_SQL} END)
+    """).rowcount
+    if updated or get_state(conn, PARAMS_KEY) != params_hash():
+        set_state(conn, PARAMS_KEY, params_hash())
+        set_state(conn, VERSION_KEY, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    conn.commit()
+    return updated
+
+
+def ensure_ranks(conn):
+    """처음 한 번 / 가중치가 바뀌었으면 전체 계산 (분석기/스냅샷 시작 시 호출)"""
+    ensure_ticker_daily(conn)
+    if get_state(conn, PARAMS_KEY) != params_hash():
+        updated = rank_all(conn)
+        print(f"🏅 rank_score 계산: {updated}건")
+
+
+def ranking_version(conn):
+    try:
+        return get_state(conn, VERSION_KEY)
+    except sqlite3.OperationalError:
+        return None
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="뉴스 중요도 순위 (rank_score) 다시 계산")
+    ap.add_argument("--db", default="fda_news.db")
+    ap.add_argument("--top", type=int, default=10, help="최근 30일 상위 N건 출력")
+    args = ap.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    migrate(conn)
+    ensure_ticker_daily(conn)
+    updated = rank_all(conn)
+    print(f"🏅 rank_score 갱신: {updated}건")
+
+    for pub_date, source, ticker, score, title in conn.execute(f"""
+        SELECT pub_date, source, ticker, {SCORE_SQL}, title FROM news
+        WHERE analyzed = 1 AND rank_score IS NOT NULL AND pub_date >= date('now', '-30 days')
+        ORDER BY rank_score DESC LIMIT ?
+    """, (args.top,)):
+        print(f"  {pub_date[:16]} {source:<7} {ticker or '-':<6} {score if score is not None else '-':>4} {(title or '')[:60]}")
+    conn.close()
@@ -1,11 +1,15 @@
 # reset.py
 import sqlite3
 
+from database import bump_news_generation, migrate
+
 conn = sqlite3.connect('fda_news.db')
+migrate(conn)
 cursor = conn.cursor()
 
-# 모든 뉴스를 미분석 상태로
+# 모든 뉴스를 미분석 상태로 (analyzed_at 은 그대로라 NewsStore 에 전체 재동기화를 알림)
 cursor.execute("UPDATE news SET analyzed = 0")
+bump_news_generation(conn)
 conn.commit()
 
 # 확인
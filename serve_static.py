@@ -0,0 +1,79 @@
+# serve_static.py - 사전 압축(.br/.gz) + 장기 캐시 헤더로 정적 파일 서빙
+# 사용법: python build_assets.py --precompress && python serve_static.py --root static --port 8600
+#   → OWNDRUG_ASSET_BASE=http://<host>:8600/games streamlit run app.py
+# (압축본이 없으면 원본을 그대로 보냄)
+# nginx(gzip_static/brotli_static)나 CDN 앞에 둘 때도 같은 규칙 사용:
+#   이름에 해시가 있는 파일은 immutable 1년, 그 외에는 no-cache
+import argparse
+import hashlib
+import mimetypes
+import os
+import re
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+HASHED_NAME = re.compile(r'\.[0-9a-f]{10}\.[a-z0-9]+$')
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def cache_control(path):
+    return IMMUTABLE if HASHED_NAME.search(path) else "no-cache"
+
+
+class PrecompressedHandler(SimpleHTTPRequestHandler):
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            path = os.path.join(path, 'index.html')
+        if not os.path.isfile(path):
+            self.send_error(404, "File not found")
+            return None
+
+        # 브라우저가 받을 수 있는 압축본이 있으면 그걸 보냄
+        accept = self.headers.get('Accept-Encoding', '')
+        encoding = None
+        body_path = path
+        for enc, ext in (('br', '.br'), ('gzip', '.gz')):
+            if enc in accept and os.path.isfile(path + ext):
+                encoding, body_path = enc, path + ext
+                break
+
+        stat = os.stat(body_path)
+        etag = '"%s"' % hashlib.md5(f"{body_path}:{stat.st_mtime_ns}:{stat.st_size}".encode()).hexdigest()
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", cache_control(path))
+            self.end_headers()
+            return None
+
+        ctype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        if ctype.startswith('text/') or ctype in ('application/json', 'application/javascript'):
+            ctype += '; charset=utf-8'
+
+        f = open(body_path, 'rb')
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(stat.st_size))
+        self.send_header("Cache-Control", cache_control(path))
+        self.send_header("ETag", etag)
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+        return f
+
+
+def serve(root, port):
+    handler = lambda *a, **k: PrecompressedHandler(*a, directory=root, **k)
+    server = ThreadingHTTPServer(('', port), handler)
+    print(f"🌐 {os.path.abspath(root)} → http://localhost:{port}/")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="정적 파일 서버 (사전 압축 + 캐시 헤더)")
+    ap.add_argument("--root", default="static")
+    ap.add_argument("--port", type=int, default=8600)
+    args = ap.parse_args()
+    serve(args.root, args.port)
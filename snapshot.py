@@ -0,0 +1,214 @@
+# snapshot.py - 대시보드 스냅샷 (파이프라인이 만들고 app.py 는 읽기만)
+# 수집/분석이 끝날 때마다 app.py 첫 화면에 필요한 행/지표를 미리 계산해서
+# snapshots/dashboard.json 으로 저장 → 방문자마다 SQL + pandas 변환을 반복하지 않음
+# 파일은 커밋하지 않음 (.gitignore): 배포 서버에서는 app.py 가 DB 를 읽기 전용으로 열어 만듦 (build_readonly)
+# (GitHub Actions 에는 pandas 가 없으므로 표준 라이브러리만 사용)
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+from calibration import SCORE_SQL
+from database import migrate
+from ranking import ensure_ranks
+from tracing import PipelineRun
+
+SNAPSHOT_DIR = 'snapshots'
+DASHBOARD_FILE = os.path.join(SNAPSHOT_DIR, 'dashboard.json')
+SCHEMA_VERSION = 2
+
+COLUMNS = ['발표시간', '한줄요약', '티커', '주가영향', '원문']
+JUNK_TICKERS = ('THE', 'NEWS', 'FDA', 'FOR', 'AND', 'WITH', 'THIS', 'THAT')
+DAYS = 30
+LIMIT = 30
+
+
+def parse_date(value):
+    """pd.to_datetime(errors='coerce') 와 같은 역할: 못 읽으면 None"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        pass
+    try:
+        from dateutil import parser
+        dt = parser.parse(value)
+        return dt.replace(tzinfo=None)
+    except Exception:
+        return None
+
+
+def score_style(val):
+    """app.py 의 점수별 색상 (미리 계산해서 스냅샷에 저장)"""
+    if val is None:
+        return ''
+    if val >= 7:
+        return 'background-color: #90EE90; font-weight: bold'
+    elif val >= 5:
+        return 'background-color: #FFFFE0'
+    elif val > 0 and val <= 2:
+        return 'background-color: #FFB6C6'
+    return ''
+
+
+def build_dashboard(conn, now=None):
+    """app.py 의 load_data() + 지표 계산을 그대로 옮긴 것"""
+    now = now or datetime.now()
+    cutoff = now - timedelta(days=DAYS)
+    placeholders = ','.join('?' * len(JUNK_TICKERS))
+    # 중요도 순 (ranking.py): idx_news_rank 를 뒤에서부터 읽다가 조건에 맞는 LIMIT 건이 모이면 끝
+    rows = conn.execute(f"""
+        SELECT pub_date, COALESCE(summary_ko, title), ticker, {SCORE_SQL}, link
+        FROM news
+        WHERE analyzed = 1 AND ticker IS NOT NULL
+        AND ticker != ''
+        AND ticker NOT IN ({placeholders})
+        AND rank_score IS NOT NULL AND pub_date >= ?
+        ORDER BY rank_score DESC
+        LIMIT ?
+    """, (*JUNK_TICKERS, cutoff.strftime('%Y-%m-%d %H:%M:%S'), LIMIT)).fetchall()
+
+    data = []
+    pub_dates = []
+    for pub_date, summary, ticker, impact, link in rows:
+        dt = parse_date(pub_date)
+        if dt is None or dt < cutoff:
+            continue
+        data.append([dt.strftime('%m/%d %H:%M'), (summary or '')[:60] + '...', ticker, impact, link])
+        pub_dates.append(dt.strftime('%Y-%m-%d %H:%M:%S'))
+
+    pending = conn.execute("SELECT COUNT(*) FROM news WHERE analyzed = 0").fetchone()[0]
+
+    return {
+        'schema': SCHEMA_VERSION,
+        'generated_at': now.strftime('%Y-%m-%d %H:%M:%S'),
+        'cutoff': cutoff.strftime('%Y-%m-%d %H:%M:%S'),
+        'columns': COLUMNS,
+        'rows': data,
+        'pub_dates': pub_dates,
+        'styles': [score_style(r[3]) for r in data],
+        'metrics': dashboard_metrics(data, pending),
+    }
+
+
+def dashboard_metrics(data, pending):
+    scores = [r[3] for r in data if r[3] is not None and r[3] > 0]
+    return {
+        'total': len(data),
+        'analyzed_count': len(scores),
+        'high': sum(1 for r in data if r[3] is not None and r[3] >= 7),
+        'avg': round(sum(scores) / len(scores), 2) if scores else None,
+        'pending': pending,
+    }
+
+
+def current_view(snapshot, now=None):
+    """읽는 시점 기준으로 30일이 지난 행을 뺌 (오래 다시 만들어지지 않은 스냅샷 대비)
+
+    반환: (rows, styles, metrics)
+    """
+    cutoff = ((now or datetime.now()) - timedelta(days=DAYS)).strftime('%Y-%m-%d %H:%M:%S')
+    if snapshot['cutoff'] >= cutoff:
+        return snapshot['rows'], snapshot['styles'], snapshot['metrics']
+    keep = [i for i, pub_date in enumerate(snapshot['pub_dates']) if pub_date >= cutoff]
+    rows = [snapshot['rows'][i] for i in keep]
+    styles = [snapshot['styles'][i] for i in keep]
+    return rows, styles, dashboard_metrics(rows, snapshot['metrics']['pending'])
+
+
+def write_atomic(path, data):
+    """읽는 쪽이 반쯤 쓰인 파일을 보지 않도록 임시 파일 → rename"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def save_snapshot(snapshot, path=DASHBOARD_FILE):
+    """내용이 같으면 파일을 건드리지 않음 (버전 = 내용 해시). 반환: (버전, 새로 썼는지, 바이트)"""
+    body = {k: v for k, v in snapshot.items() if k not in ('generated_at', 'cutoff', 'pub_dates', 'version')}
+    version = hashlib.sha256(json.dumps(body, ensure_ascii=False, sort_keys=True).encode()).hexdigest()[:12]
+    snapshot['version'] = version
+    data = json.dumps(snapshot, ensure_ascii=False, separators=(',', ':')).encode()
+
+    current = None
+    if os.path.exists(path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                current = json.load(f).get('version')
+        except (OSError, ValueError):
+            pass
+    if current != version:
+        write_atomic(path, data)
+    return version, current != version, len(data)
+
+
+def write_snapshot(db_path='fda_news.db', path=DASHBOARD_FILE):
+    """파이프라인용 (analyzer.py 끝 / python snapshot.py): 스키마/순위를 맞춘 뒤 생성"""
+    run = PipelineRun('snapshot', db_path=db_path)
+    try:
+        with run.span('query') as span:
+            conn = sqlite3.connect(db_path)
+            migrate(conn)
+            ensure_ranks(conn)
+            snapshot = build_dashboard(conn)
+            conn.close()
+            span.count = len(snapshot['rows'])
+
+        with run.span('write') as span:
+            version, changed, span.bytes = save_snapshot(snapshot, path)
+            span.count = int(changed)
+    except Exception as e:
+        run.finish(status='error', error=str(e))
+        print(f"❌ 스냅샷 생성 실패: {e}")
+        return None
+
+    run.finish()
+    print(f"📸 대시보드 스냅샷 {version}: 뉴스 {len(snapshot['rows'])}건 | 대기 {snapshot['metrics']['pending']}건"
+          f"{'' if changed else ' (변경 없음)'}")
+    return snapshot
+
+
+def build_readonly(db_path='fda_news.db', path=DASHBOARD_FILE):
+    """웹 프로세스용: DB 를 읽기 전용으로 열고 migrate/순위 계산 없이 생성
+
+    파이프라인이 아직 rank_score/impact_calibrated 를 만들지 않은 DB 면 None (app.py 는 NewsStore 로 대체)
+    """
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return None
+    try:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(news)")}
+        if not {'rank_score', 'impact_calibrated'} <= columns:
+            return None
+        snapshot = build_dashboard(conn)
+    except sqlite3.Error as e:
+        print(f"⚠️ 스냅샷 생성 실패 (읽기 전용): {e}")
+        return None
+    finally:
+        conn.close()
+    try:
+        save_snapshot(snapshot, path)
+    except OSError as e:
+        print(f"⚠️ 스냅샷 저장 실패: {e}")
+    return snapshot
+
+
+def load_snapshot(path=DASHBOARD_FILE):
+    """없거나 스키마가 다르면 None (app.py 는 DB 로 대체)"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if snapshot.get('schema') != SCHEMA_VERSION:
+        return None
+    return snapshot
+
+
+if __name__ == "__main__":
+    write_snapshot()
@@ -0,0 +1,174 @@
+# synthetic_db.py - 벤치마크용 대용량 가짜 뉴스 DB 생성기
+import argparse
+import os
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+from database import init_database
+
+# 실제 DB 비율 (fda 52 / fierce 435 / globe 198) 을 대략 따라감
+SOURCES = [('fda', 0.08), ('fierce', 0.63), ('globe', 0.29)]
+
+NEWS_TYPES = [
+    ('breakthrough', 0.40), ('approval', 0.14), ('rejection', 0.10),
+    ('warning', 0.09), ('policy', 0.09), ('acquisition', 0.05),
+    ('partnership', 0.04), ('earnings', 0.03), ('ipo', 0.02), ('unknown', 0.04),
+]
+
+# 자주 나오는 대형 제약사 (앞쪽일수록 자주 등장)
+BIG_TICKERS = [
+    'SNY', 'NVO', 'RHHBY', 'NVS', 'MRNA', 'JNJ', 'AZN', 'REGN', 'LLY', 'ABT',
+    'GSK', 'GILD', 'PFE', 'MRK', 'BMY', 'TEVA', 'AMGN', 'ABBV', 'TAK', 'BIIB',
+    'VRTX', 'BNTX', 'SRPT', 'ALNY', 'INCY', 'EXEL', 'BMRN', 'NBIX', 'UTHR', 'IONS',
+]
+
+# 분석기가 잘못 뽑는 단어들 (대시보드 쿼리에서 걸러짐)
+JUNK_TICKERS = ['THE', 'NEWS', 'FDA']
+
+DRUGS = [
+    'pembrolizumab', 'semaglutide', 'tirzepatide', 'lecanemab', 'donanemab',
+    'nivolumab', 'dupilumab', 'osimertinib', 'olaparib', 'inclisiran',
+    'elamipretide', 'vutrisiran', 'zanubrutinib', 'datopotamab deruxtecan',
+]
+
+INDICATIONS = [
+    'non-small cell lung cancer', 'obesity', 'type 2 diabetes', "Alzheimer's disease",
+    'Duchenne muscular dystrophy', 'atopic dermatitis', 'breast cancer',
+    'hypercholesterolemia', 'ATTR cardiomyopathy', 'multiple myeloma', 'ulcerative colitis',
+]
+
+TITLE_TEMPLATES = {
+    'approval': "FDA Approves {drug} for {ind}",
+    'rejection': "{company} Receives Complete Response Letter for {drug} in {ind}",
+    'warning': "FDA Issues Warning Letter to {company} Over {drug} Manufacturing",
+    'breakthrough': "{company} Announces Positive Phase 3 Topline Results for {drug} in {ind}",
+    'policy': "FDA Announces New Guidance on {ind} Drug Development",
+    'acquisition': "{company} to Acquire Developer of {drug} for ${amount} Billion",
+    'partnership': "{company} Enters Collaboration to Develop {drug} in {ind}",
+    'earnings': "{company} Reports Fourth Quarter and Full Year Financial Results",
+    'ipo': "{company} Announces Pricing of Initial Public Offering",
+    'unknown': "{company} to Present at Upcoming Healthcare Conference",
+}
+
+INSERT_SQL = """
+    INSERT INTO news (guid, title, summary, link, pub_date, ticker,
+                      impact_score, news_type, analyzed, source, summary_ko)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SUMMARY_FILLER = (
+    "The company said the results support a planned regulatory submission and "
+    "that further data will be presented at an upcoming medical meeting. "
+    "Analysts noted the competitive landscape remains crowded, and investors will "
+    "watch for label details, pricing and launch timing over the coming quarters. "
+)
+
+
+def weighted_choice(rng, items):
+    r = rng.random()
+    acc = 0.0
+    for value, weight in items:
+        acc += weight
+        if r < acc:
+            return value
+    return items[-1][0]
+
+
+def build_ticker_pool(rng, size):
+    """대형주 + 가짜 소형주 티커 풀, Zipf 가중치"""
+    pool = list(BIG_TICKERS)
+    seen = set(pool)
+    while len(pool) < size:
+        t = ''.join(rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(rng.choice((3, 4, 4))))
+        if t not in seen:
+            seen.add(t)
+            pool.append(t)
+    weights = [1.0 / (rank + 1) ** 1.1 for rank in range(len(pool))]
+    return pool, weights
+
+
+def random_pub_date(rng, now, days):
+    """최근일수록 뉴스가 많고, 평일 업무시간에 몰리는 분포"""
+    age = days * (rng.random() ** 1.5)
+    dt = now - timedelta(days=age)
+    if dt.weekday() >= 5 and rng.random() < 0.8:
+        dt -= timedelta(days=dt.weekday() - 4)
+    hour = min(23, max(0, int(rng.gauss(11, 3))))
+    return dt.replace(hour=hour, minute=rng.randrange(60), second=0, microsecond=0)
+
+
+def generate_rows(rows, seed=42, days=730, pending_ratio=0.15, ticker_pool=400):
+    rng = random.Random(seed)
+    now = datetime.now()
+    tickers, ticker_weights = build_ticker_pool(rng, ticker_pool)
+
+    # pub_date 순서대로 id가 커지도록 (수집 순서 흉내)
+    dates = sorted(random_pub_date(rng, now, days) for _ in range(rows))
+    ticker_draws = rng.choices(tickers, weights=ticker_weights, k=rows)
+
+    for i, dt in enumerate(dates):
+        source = weighted_choice(rng, SOURCES)
+        news_type = weighted_choice(rng, NEWS_TYPES)
+        ticker = ticker_draws[i]
+        drug = rng.choice(DRUGS)
+        ind = rng.choice(INDICATIONS)
+        title = TITLE_TEMPLATES[news_type].format(
+            company=f"{ticker.title()} Therapeutics", drug=drug, ind=ind,
+            amount=rng.randint(1, 40),
+        )
+        summary = (f"{title}. " + SUMMARY_FILLER * 2)[:rng.randint(120, 500)]
+        link = f"https://example.com/{source}/{dt:%Y/%m/%d}/{i}"
+        pub_date = dt.strftime('%Y-%m-%d %H:%M:%S')
+
+        # 미분석 뉴스는 최근 쪽에 몰려 있음
+        recent = i > rows * (1 - pending_ratio * 2)
+        analyzed = 0 if recent and rng.random() < 0.5 else 1
+
+        if not analyzed:
+            yield (link, title, summary, link, pub_date, None, None, None, 0, source, None)
+        elif news_type == 'policy' or rng.random() < 0.25:
+            # 티커 없는 정책 뉴스 → analyzer가 3.0 고정 점수
+            yield (link, title, summary, link, pub_date, None, 3.0, None, 1, source, None)
+        else:
+            if rng.random() < 0.01:
+                ticker = rng.choice(JUNK_TICKERS)
+            impact = round(min(10.0, max(0.0, rng.gauss(5.6, 1.6))), 1)
+            summary_ko = f"{ticker}, {drug} 관련 {news_type} 소식"
+            yield (link, title, summary, link, pub_date, ticker, impact, news_type, 1, source, summary_ko)
+
+
+def create_synthetic_db(db_path, rows, seed=42, days=730, pending_ratio=0.15, ticker_pool=400):
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    init_database(db_path)
+
+    conn = sqlite3.connect(db_path)
+    batch = []
+    for row in generate_rows(rows, seed=seed, days=days,
+                             pending_ratio=pending_ratio, ticker_pool=ticker_pool):
+        batch.append(row)
+        if len(batch) >= 10000:
+            conn.executemany(INSERT_SQL, batch)
+            batch = []
+    if batch:
+        conn.executemany(INSERT_SQL, batch)
+    conn.commit()
+    conn.close()
+    print(f"✅ {db_path}: {rows:,}건 생성 ({os.path.getsize(db_path) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="벤치마크용 가짜 뉴스 DB 생성")
+    ap.add_argument("rows", type=int, help="생성할 뉴스 개수")
+    ap.add_argument("--out", default=None, help="DB 파일 경로 (기본: bench_data/news_<rows>.db)")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--days", type=int, default=730, help="pub_date 분포 기간 (일)")
+    ap.add_argument("--pending-ratio", type=float, default=0.15)
+    ap.add_argument("--tickers", type=int, default=400, help="티커 풀 크기")
+    args = ap.parse_args()
+
+    out = args.out or os.path.join("bench_data", f"news_{args.rows}.db")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    create_synthetic_db(out, args.rows, seed=args.seed, days=args.days,
+                        pending_ratio=args.pending_ratio, ticker_pool=args.tickers)
@@ -0,0 +1,5 @@
+# tests/conftest.py - 저장소 루트의 모듈을 바로 import (python -m pytest / pytest 둘 다)
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,76 @@
+# tests/test_calibration.py - 자리 채움 행이 보정에 섞이지 않는지, 같은 곡선이면 버전이 그대로인지
+import random
+import sqlite3
+
+from calibration import apply_calibration, calibration_version, fit, init_calibration_tables, load_params
+from database import init_database
+
+
+def make_db(tmp_path):
+    db_path = str(tmp_path / 'news.db')
+    init_database(db_path)
+    conn = sqlite3.connect(db_path)
+    init_calibration_tables(conn)
+    rng = random.Random(0)
+    rows = []
+    # LLM 이 판단한 정책 뉴스 (회사 있음) + 다른 유형
+    for i in range(60):
+        rows.append((f'policy{i}', 'fierce', 'PFE', 'policy', round(rng.uniform(3.0, 7.0), 1)))
+    for i in range(60):
+        rows.append((f'approval{i}', 'fierce', 'MRK', 'approval', round(rng.uniform(5.0, 9.0), 1)))
+    # 회사를 못 찾은 행: 유형/티커 없이 3.0 (같은 출처에 더 많이)
+    for i in range(150):
+        rows.append((f'placeholder{i}', 'fierce', None, None, 3.0))
+    conn.executemany("""
+        INSERT INTO news (guid, source, ticker, news_type, impact_score, analyzed)
+        VALUES (?, ?, ?, ?, ?, 1)
+    """, rows)
+    conn.commit()
+    return conn
+
+
+def test_placeholders_are_not_fitted_or_calibrated(tmp_path):
+    conn = make_db(tmp_path)
+    fit(conn)
+    apply_calibration(conn)
+
+    params = load_params(conn)
+    assert all(news_type is not None for _, news_type in params)
+
+    # 자리 채움 행은 NULL (화면에는 원래 3.0)
+    assert conn.execute("""
+        SELECT COUNT(*) FROM news WHERE news_type IS NULL AND impact_calibrated IS NOT NULL
+    """).fetchone()[0] == 0
+
+    # 진짜 정책 뉴스는 자기 분포에 맞춰지므로 거의 그대로 (3.0 뭉치에 밀려 올라가지 않음)
+    for score, calibrated in conn.execute("""
+        SELECT impact_score, impact_calibrated FROM news WHERE news_type = 'policy'
+    """):
+        assert abs(calibrated - score) <= 0.3
+        assert (calibrated >= 7) == (score >= 7)
+
+
+def test_placeholder_keeps_null_after_incremental_apply(tmp_path):
+    conn = make_db(tmp_path)
+    fit(conn)
+    conn.execute("UPDATE news SET impact_calibrated = 6.0 WHERE news_type IS NULL")
+    ids = [i for (i,) in conn.execute("SELECT id FROM news WHERE news_type IS NULL LIMIT 10")]
+    apply_calibration(conn, ids)
+    assert conn.execute(f"""
+        SELECT COUNT(*) FROM news WHERE id IN ({','.join('?' * len(ids))}) AND impact_calibrated IS NOT NULL
+    """, ids).fetchone()[0] == 0
+
+
+def test_refit_with_same_curves_keeps_version(tmp_path):
+    conn = make_db(tmp_path)
+    fit(conn)
+    version = calibration_version(conn)
+    assert version
+
+    # 점수가 그대로면 다시 맞춰도 같은 버전 (정적 페이지/NewsStore 가 전체 다시 만들지 않음)
+    fit(conn)
+    assert calibration_version(conn) == version
+
+    conn.execute("UPDATE news SET impact_score = 9.5 WHERE guid LIKE 'approval%' AND id % 2 = 0")
+    fit(conn)
+    assert calibration_version(conn) != version
@@ -0,0 +1,67 @@
+# tests/test_news_store.py - refresh() 가 전체 스캔 없이 새 행 / 다시 분석된 행 / 일괄 초기화를 반영하는지
+import sqlite3
+
+from database import bump_news_generation, init_database
+from news_store import NewsStore
+
+
+def make_db(tmp_path, n=20):
+    db_path = str(tmp_path / 'news.db')
+    init_database(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.executemany("""
+        INSERT INTO news (guid, title, link, pub_date, ticker, impact_score, analyzed, analyzed_at)
+        VALUES (?, ?, ?, '2026-10-01 00:00:00', 'PFE', 5.0, 1, '2026-10-01 01:00:00')
+    """, [(f'g{i}', f't{i}', f'l{i}') for i in range(n)])
+    conn.commit()
+    return db_path, conn
+
+
+def traced_refresh(store):
+    """refresh() 동안 실행된 SQL"""
+    statements = []
+    real_connect = sqlite3.connect
+
+    def connect(*args, **kwargs):
+        conn = real_connect(*args, **kwargs)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    sqlite3.connect = connect
+    try:
+        stats = store.refresh()
+    finally:
+        sqlite3.connect = real_connect
+    return stats, statements
+
+
+def test_refresh_is_incremental(tmp_path):
+    db_path, conn = make_db(tmp_path)
+    store = NewsStore(db_path)
+    store.refresh()
+    assert store.size == 20 and store.pending() == 0
+
+    conn.execute("INSERT INTO news (guid, title, link, pub_date) VALUES ('new', 'n', 'ln', '2026-10-02 00:00:00')")
+    conn.execute("UPDATE news SET impact_score = 9.0, analyzed_at = '2026-10-02 01:00:00' WHERE id = 3")
+    conn.commit()
+
+    stats, statements = traced_refresh(store)
+    assert stats['appended'] == 1 and stats['resynced'] == 0
+    assert store.size == 21 and store.pending() == 1
+    assert store.column('impact_score')[2] == 9.0
+    assert not any('COUNT(' in sql.upper() for sql in statements)
+
+
+def test_bulk_reset_resyncs_through_generation(tmp_path):
+    db_path, conn = make_db(tmp_path)
+    store = NewsStore(db_path)
+    store.refresh()
+
+    # reset.py: analyzed_at 은 그대로 두고 전부 미분석으로
+    conn.execute("UPDATE news SET analyzed = 0")
+    bump_news_generation(conn)
+    conn.commit()
+
+    stats = store.refresh()
+    assert stats['resynced'] == 20
+    assert store.pending() == 20
@@ -0,0 +1,126 @@
+# ticker_stats.py - 티커별 일간 집계 (ticker_daily)
+# 티커 상세 페이지는 이 표만 읽음 → 뉴스가 몇 년 치 쌓인 PFE/MRK 도 일 수만큼의 행
+# 분석기가 결과를 쓸 때 바뀐 (티커, 날짜) 묶음만 news(ticker, pub_date) 인덱스로 다시 셈
+#   - 재분석으로 티커가 바뀌면 예전 티커 쪽 묶음도 같이 다시 셈
+#   - 처음 한 번(표가 비어 있을 때)은 GROUP BY 로 전체 생성
+# 사용법: python ticker_stats.py [--rebuild]
+import argparse
+import sqlite3
+from datetime import datetime
+
+from calibration import SCORE_SQL
+from database import get_state, migrate, set_state
+
+BUILT_KEY = 'ticker_daily.built'
+VERSION_KEY = 'ticker_daily.version'  # 페이지 캐시 키
+
+HIGH_SCORE = 7
+
+# 점수는 보정 점수 (calibration.py) - 보정을 다시 맞추면 rebuild()
+AGGREGATE_SQL = f"""
+    SELECT ticker, substr(pub_date, 1, 10) AS day,
+           COUNT(*),
+           SUM(CASE WHEN {SCORE_SQL} > 0 THEN 1 ELSE 0 END),
+           COALESCE(SUM(CASE WHEN {SCORE_SQL} > 0 THEN {SCORE_SQL} END), 0),
+           MIN(CASE WHEN {SCORE_SQL} > 0 THEN {SCORE_SQL} END),
+           MAX(CASE WHEN {SCORE_SQL} > 0 THEN {SCORE_SQL} END),
+           SUM(CASE WHEN {SCORE_SQL} >= {HIGH_SCORE} THEN 1 ELSE 0 END)
+    FROM news
+"""
+
+
+def init_ticker_tables(conn):
+    # WITHOUT ROWID: (ticker, day) 순서로 저장 → 티커 하나 = 연속된 구간 한 번 읽기
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ticker_daily (
+            ticker TEXT NOT NULL,
+            day TEXT NOT NULL,
+            news_count INTEGER NOT NULL,
+            scored_count INTEGER NOT NULL,
+            score_sum REAL NOT NULL,
+            score_min REAL,
+            score_max REAL,
+            high_count INTEGER NOT NULL,
+            PRIMARY KEY (ticker, day)
+        ) WITHOUT ROWID
+    """)
+    conn.commit()
+
+
+def rebuild(conn):
+    """전체 다시 계산 (처음 한 번 / 수동 복구용)"""
+    conn.execute("DELETE FROM ticker_daily")
+    conn.execute(f"""
+        INSERT INTO ticker_daily
+        {AGGREGATE_SQL}
+        WHERE analyzed = 1 AND ticker IS NOT NULL AND ticker != '' AND pub_date IS NOT NULL
+        GROUP BY ticker, day
+    """)
+    set_state(conn, BUILT_KEY, 1)
+    set_state(conn, VERSION_KEY, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    conn.commit()
+    return conn.execute("SELECT COUNT(*) FROM ticker_daily").fetchone()[0]
+
+
+def ensure_ticker_daily(conn):
+    """표가 없거나 아직 만든 적 없으면 생성 (분석기 시작 시 호출)"""
+    init_ticker_tables(conn)
+    if get_state(conn, BUILT_KEY) is None:
+        rows = rebuild(conn)
+        print(f"📊 ticker_daily 생성: {rows}행")
+
+
+def day_key(ticker, pub_date):
+    """갱신할 묶음 키 (티커/날짜가 없으면 None)"""
+    if not ticker or not pub_date:
+        return None
+    return (ticker, pub_date[:10])
+
+
+def refresh_groups(conn, keys):
+    """바뀐 (티커, 날짜) 묶음만 다시 셈. 커밋은 호출한 쪽에서 (분석 결과와 같은 트랜잭션)"""
+    keys = {k for k in keys if k}
+    for ticker, day in keys:
+        row = conn.execute(f"""
+            {AGGREGATE_SQL}
+            WHERE ticker = ? AND pub_date >= ? AND pub_date < ? AND analyzed = 1
+        """, (ticker, day, day + '~')).fetchone()
+        if row[2]:
+            conn.execute("INSERT OR REPLACE INTO ticker_daily VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (ticker, day, *row[2:]))
+        else:
+            conn.execute("DELETE FROM ticker_daily WHERE ticker = ? AND day = ?", (ticker, day))
+    if keys:
+        set_state(conn, VERSION_KEY, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    return len(keys)
+
+
+def data_version(db_path='fda_news.db'):
+    """페이지 캐시 키 (분석기가 집계를 바꿀 때마다 바뀜)"""
+    conn = sqlite3.connect(db_path)
+    try:
+        return get_state(conn, VERSION_KEY)
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="티커별 일간 집계")
+    ap.add_argument("--db", default="fda_news.db")
+    ap.add_argument("--rebuild", action="store_true", help="전체 다시 계산")
+    args = ap.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    migrate(conn)
+    init_ticker_tables(conn)
+    if args.rebuild:
+        print(f"📊 ticker_daily 재계산: {rebuild(conn)}행")
+    else:
+        ensure_ticker_daily(conn)
+    for ticker, days, news in conn.execute("""
+        SELECT ticker, COUNT(*), SUM(news_count) FROM ticker_daily
+        GROUP BY ticker ORDER BY 3 DESC LIMIT 10
+    """):
+        print(f"  {ticker:<8} {news:>5}건 ({days}일)")
+    conn.close()
@@ -0,0 +1,375 @@
+# topics.py - 뉴스 주제 묶기 (GLP-1, 유전자 치료, CRL ...)
+# 제목 + 원문 요약 → 해싱 TF-IDF 희소 벡터 (dict {특성 번호: 가중치}, 단어 + 두 단어 묶음)
+# → 미니배치 구면 k-means (Sculley 2010: 중심마다 본 문서 수 n, 학습률 1/n)
+#   - 처음 한 번: 분석된 뉴스 전체로 학습 (python topics.py --refit 으로 다시)
+#   - 이후: 분석기가 새로 분석한 행만 문서 빈도(df)에 더하고 → 가까운 중심에 배정 → 그 중심만 조금 움직임
+#     → 전체를 다시 묶지 않음. 한 건 배정 = 중심 K개와 희소 내적 (수십 특성 × K)
+# 결과: news.topic_id + topics (중심/대표 단어) 테이블. 대시보드는 topic_id 로 거르기만 함
+# GitHub Actions 에는 numpy/sklearn 이 없어서 표준 라이브러리만 사용
+# 사용법: python topics.py [--refit] [--topics 12]
+import argparse
+import html
+import json
+import math
+import random
+import re
+import sqlite3
+import time
+import zlib
+from collections import Counter
+from datetime import datetime
+
+from calibration import SCORE_SQL
+from database import get_state, migrate, set_state
+
+N_FEATURES = 2 ** 18  # 해시 공간 (충돌은 무시할 만큼 드묾)
+N_TOPICS = 12
+BATCH_SIZE = 256
+FIT_PASSES = 5
+MAX_CENTROID_TERMS = 400  # 중심 벡터는 가중치 큰 특성만 남김 (희소 유지)
+TOP_TERMS = 5
+SEED = 42
+
+VERSION_KEY = 'topics.version'  # 화면 캐시 키
+DOCS_KEY = 'topics.docs'        # df 에 더한 문서 수 (IDF 의 N)
+
+TAG_RE = re.compile(r'<[^>]+>')
+TOKEN_RE = re.compile(r"[a-z][a-z0-9]*(?:-[a-z0-9]+)*")  # glp-1, car-t, covid-19
+STOPWORDS = frozenset("""
+a an and are as at be been but by can could did do does for from had has have he her his how if in into is it
+its may more most new not of on or our over said says she so than that the their them then there these they this
+to up was we were what when which who will with would after about also all first other out one two three year
+years week weeks company companies inc corp ltd announces announced today report reports reported plc
+globe newswire globenewswire business wire prnewswire fiercebiotech href hreflang en www com http https
+""".split())
+
+
+def init_topic_tables(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS topics (
+            topic_id INTEGER PRIMARY KEY,
+            n INTEGER NOT NULL,       -- 학습에 쓴 문서 수 (학습률 1/n)
+            size INTEGER NOT NULL,    -- 지금 배정된 뉴스 수
+            terms TEXT NOT NULL,      -- 대표 단어 JSON
+            centroid BLOB NOT NULL,   -- {특성: 가중치} JSON (zlib)
+            updated_at TIMESTAMP
+        )
+    """)
+    # 특성 번호 → 문서 빈도 + 처음 본 단어 (대표 단어 표시용)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS topic_df (
+            feature INTEGER PRIMARY KEY,
+            df INTEGER NOT NULL,
+            term TEXT NOT NULL
+        )
+    """)
+    conn.commit()
+
+
+# ------------------------------------------------------------------ 벡터화
+def tokenize(text):
+    text = html.unescape(TAG_RE.sub(' ', text or '')).lower()
+    words = [w for w in TOKEN_RE.findall(text) if len(w) > 1 and w not in STOPWORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def feature(term):
+    # hash() 는 프로세스마다 달라서 crc32
+    return zlib.crc32(term.encode()) % N_FEATURES
+
+
+def doc_terms(title, summary):
+    """문서 → {특성: 횟수}, {특성: 단어}"""
+    counts = Counter()
+    names = {}
+    for term in tokenize(f"{title or ''} {summary or ''}"):
+        f = feature(term)
+        counts[f] += 1
+        names.setdefault(f, term)
+    return counts, names
+
+
+def normalize(vec):
+    norm = math.sqrt(sum(w * w for w in vec.values()))
+    return {f: w / norm for f, w in vec.items()} if norm else {}
+
+
+def dot(x, centroid):
+    return sum(w * centroid.get(f, 0.0) for f, w in x.items())
+
+
+class TopicModel:
+    """df 표 + 중심 K개 (둘 다 DB 에 저장, 메모리에서는 dict)"""
+
+    def __init__(self):
+        self.df = {}
+        self.names = {}
+        self.docs = 0
+        self.centroids = []
+        self.counts = []
+        self.dirty_df = set()
+        self.dirty_topics = set()
+
+    # ----------------------------------------------------------- 저장
+    @classmethod
+    def load(cls, conn, features):
+        """중심 K개 + 필요한 특성의 df 만 읽음 (새 문서의 특성 + 대표 단어 후보)"""
+        model = cls()
+        model.docs = int(get_state(conn, DOCS_KEY, 0))
+        for _, n, centroid in conn.execute("SELECT topic_id, n, centroid FROM topics ORDER BY topic_id"):
+            model.centroids.append({int(f): w for f, w in json.loads(zlib.decompress(centroid)).items()})
+            model.counts.append(n)
+        wanted = set(features)
+        for centroid in model.centroids:
+            wanted.update(sorted(centroid, key=centroid.get, reverse=True)[:TOP_TERMS * 6])
+        wanted = list(wanted)
+        for start in range(0, len(wanted), 500):
+            chunk = wanted[start:start + 500]
+            for f, df, term in conn.execute(f"""
+                SELECT feature, df, term FROM topic_df WHERE feature IN ({','.join('?' * len(chunk))})
+            """, chunk):
+                model.df[f] = df
+                model.names[f] = term
+        return model
+
+    def save(self, conn):
+        """df / 중심 모두 바뀐 것만. 커밋은 호출한 쪽에서"""
+        conn.executemany("INSERT OR REPLACE INTO topic_df (feature, df, term) VALUES (?, ?, ?)",
+                         [(f, self.df[f], self.names[f]) for f in self.dirty_df])
+        self.dirty_df.clear()
+        set_state(conn, DOCS_KEY, self.docs)
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        conn.execute("DELETE FROM topics WHERE topic_id >= ?", (len(self.centroids),))
+        for k in sorted(self.dirty_topics):
+            centroid = self.centroids[k]
+            blob = zlib.compress(json.dumps({str(f): round(w, 6) for f, w in centroid.items()}).encode())
+            conn.execute("""
+                INSERT INTO topics (topic_id, n, size, terms, centroid, updated_at) VALUES (?, ?, 0, ?, ?, ?)
+                ON CONFLICT(topic_id) DO UPDATE SET
+                    n = excluded.n, terms = excluded.terms, centroid = excluded.centroid, updated_at = excluded.updated_at
+            """, (k, self.counts[k], json.dumps(self.top_terms(k), ensure_ascii=False), blob, now))
+        self.dirty_topics.clear()
+
+    # ----------------------------------------------------------- 벡터
+    def add_documents(self, docs):
+        """새 문서의 단어를 df 에 더함 (IDF 가 새 문서까지 반영)"""
+        for counts, names in docs:
+            for f in counts:
+                self.df[f] = self.df.get(f, 0) + 1
+                self.names.setdefault(f, names[f])
+                self.dirty_df.add(f)
+        self.docs += len(docs)
+
+    def vector(self, counts):
+        """TF-IDF (sublinear tf, smooth idf) + L2 정규화"""
+        n = self.docs
+        return normalize({
+            f: (1 + math.log(c)) * (math.log((1 + n) / (1 + self.df.get(f, 0))) + 1)
+            for f, c in counts.items()
+        })
+
+    def nearest(self, x):
+        best, best_sim = 0, -1.0
+        for k, centroid in enumerate(self.centroids):
+            sim = dot(x, centroid)
+            if sim > best_sim:
+                best, best_sim = k, sim
+        return best
+
+    # ----------------------------------------------------------- 학습
+    def init_centroids(self, vectors, k, rng):
+        """k-means++ : 이미 고른 중심과 멀수록(1 - 코사인) 뽑힐 확률이 큼"""
+        self.centroids = [dict(rng.choice(vectors))]
+        dist = [1 - dot(x, self.centroids[0]) for x in vectors]
+        while len(self.centroids) < k:
+            total = sum(dist)
+            if total <= 0:
+                break
+            r = rng.random() * total
+            for i, d in enumerate(dist):
+                r -= d
+                if r <= 0:
+                    break
+            self.centroids.append(dict(vectors[i]))
+            dist = [min(d, 1 - dot(x, self.centroids[-1])) for d, x in zip(dist, vectors)]
+        self.counts = [1] * len(self.centroids)
+        self.dirty_topics = set(range(len(self.centroids)))
+
+    def partial_fit(self, vectors):
+        """미니배치 한 번: 배치 안에서 배정은 고정 → 중심마다 학습률 1/n 으로 이동 → 정규화/가지치기"""
+        labels = [self.nearest(x) for x in vectors]
+        touched = set()
+        for x, k in zip(vectors, labels):
+            self.counts[k] += 1
+            eta = 1.0 / self.counts[k]
+            centroid = self.centroids[k]
+            for f in centroid:
+                centroid[f] *= (1 - eta)
+            for f, w in x.items():
+                centroid[f] = centroid.get(f, 0.0) + eta * w
+            touched.add(k)
+        self.dirty_topics |= touched
+        for k in touched:
+            top = sorted(self.centroids[k].items(), key=lambda item: item[1], reverse=True)[:MAX_CENTROID_TERMS]
+            self.centroids[k] = normalize(dict(top))
+        return labels
+
+    def top_terms(self, k, n=TOP_TERMS):
+        """중심에서 가중치 큰 단어 (두 단어 묶음에 이미 들어간 단어는 건너뜀)"""
+        terms = []
+        for f, _ in sorted(self.centroids[k].items(), key=lambda item: item[1], reverse=True)[:n * 6]:
+            term = self.names.get(f)
+            if not term or any(term in t.split(' ') or t in term.split(' ') for t in terms):
+                continue
+            terms.append(term)
+            if len(terms) == n:
+                break
+        return terms
+
+
+# ------------------------------------------------------------------ 실행
+def refresh_sizes(conn, delta=None):
+    """주제별 뉴스 수. delta({주제: +-n}) 가 있으면 그만큼만 더함"""
+    if delta is None:
+        conn.execute("""
+            UPDATE topics SET size = (SELECT COUNT(*) FROM news WHERE news.topic_id = topics.topic_id)
+        """)
+    else:
+        conn.executemany("UPDATE topics SET size = size + ? WHERE topic_id = ?",
+                         [(n, k) for k, n in delta.items() if n])
+    set_state(conn, VERSION_KEY, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+
+
+def fit_topics(conn, k=N_TOPICS, passes=FIT_PASSES, seed=SEED):
+    """전체 다시 학습 (처음 한 번 / --refit). 분석된 뉴스가 k 개보다 적으면 0"""
+    rows = conn.execute("SELECT id, title, summary FROM news WHERE analyzed = 1 ORDER BY id").fetchall()
+    if len(rows) < k:
+        return 0
+    conn.execute("DELETE FROM topic_df")
+    conn.execute("DELETE FROM topics")
+    model = TopicModel()
+    docs = [doc_terms(title, summary) for _, title, summary in rows]
+    model.add_documents(docs)
+    vectors = [model.vector(counts) for counts, _ in docs]
+
+    rng = random.Random(seed)
+    model.init_centroids([v for v in vectors if v], k, rng)
+    order = list(range(len(vectors)))
+    for _ in range(passes):
+        rng.shuffle(order)
+        for start in range(0, len(order), BATCH_SIZE):
+            model.partial_fit([vectors[i] for i in order[start:start + BATCH_SIZE] if vectors[i]])
+
+    conn.execute("UPDATE news SET topic_id = NULL")
+    conn.executemany("UPDATE news SET topic_id = ? WHERE id = ?",
+                     [(model.nearest(v), row[0]) for v, row in zip(vectors, rows) if v])
+    model.save(conn)
+    refresh_sizes(conn)
+    conn.commit()
+    return len(rows)
+
+
+def ensure_topics(conn):
+    """주제 모델이 없으면 한 번 학습 (분석기 시작 시 호출)"""
+    init_topic_tables(conn)
+    if conn.execute("SELECT COUNT(*) FROM topics").fetchone()[0] == 0:
+        n = fit_topics(conn)
+        if n:
+            print(f"🧭 주제 {N_TOPICS}개 학습: 뉴스 {n}건")
+
+
+def assign_topics(conn, ids):
+    """새로 분석된 뉴스만 배정 + 그 중심만 미니배치로 이동. 커밋은 호출한 쪽에서
+
+    반환: 배정한 건수 (모델이 없으면 0)
+    """
+    ids = list(ids)
+    if not ids:
+        return 0
+    rows = []
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        rows += conn.execute(f"""
+            SELECT id, title, summary, topic_id FROM news
+            WHERE analyzed = 1 AND id IN ({','.join('?' * len(chunk))})
+        """, chunk).fetchall()
+    docs = [doc_terms(title, summary) for _, title, summary, _ in rows]
+    model = TopicModel.load(conn, {f for counts, _ in docs for f in counts})
+    if not model.centroids:
+        return 0
+    model.add_documents(docs)
+    vectors = [model.vector(counts) for counts, _ in docs]
+    keep = [i for i, v in enumerate(vectors) if v]
+    labels = model.partial_fit([vectors[i] for i in keep]) if keep else []
+    conn.executemany("UPDATE news SET topic_id = ? WHERE id = ?",
+                     [(label, rows[i][0]) for i, label in zip(keep, labels)])
+    model.save(conn)
+    # 다시 분석된 행은 예전 주제에서 빼고 새 주제에 더함
+    delta = Counter(labels)
+    delta.subtract(Counter(rows[i][3] for i in keep if rows[i][3] is not None))
+    refresh_sizes(conn, delta)
+    return len(labels)
+
+
+def topic_list(db_path='fda_news.db'):
+    """[(topic_id, 대표 단어 목록, 뉴스 수)] 큰 주제부터. 모델이 없으면 []"""
+    conn = sqlite3.connect(db_path)
+    try:
+        return [(k, json.loads(terms), size)
+                for k, terms, size in conn.execute("SELECT topic_id, terms, size FROM topics ORDER BY size DESC")]
+    except sqlite3.OperationalError:
+        return []
+    finally:
+        conn.close()
+
+
+def topic_news(topic_id, limit=30, db_path='fda_news.db'):
+    """주제 하나의 뉴스 중요도 순 (idx_news_topic 순서 그대로 앞에서 limit 개)"""
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"""
+            SELECT pub_date, COALESCE(summary_ko, title), ticker, {SCORE_SQL}, link
+            FROM news
+            WHERE topic_id = ? AND analyzed = 1
+            ORDER BY rank_score DESC
+            LIMIT ?
+        """, (topic_id, limit)).fetchall()
+    finally:
+        conn.close()
+
+
+def topics_version(db_path='fda_news.db'):
+    """화면 캐시 키 (배정/학습할 때마다 바뀜)"""
+    conn = sqlite3.connect(db_path)
+    try:
+        return get_state(conn, VERSION_KEY)
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="뉴스 주제 묶기")
+    ap.add_argument("--db", default="fda_news.db")
+    ap.add_argument("--refit", action="store_true", help="전체 다시 학습")
+    ap.add_argument("--topics", type=int, default=N_TOPICS)
+    args = ap.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    migrate(conn)
+    init_topic_tables(conn)
+    started = time.perf_counter()
+    if args.refit or conn.execute("SELECT COUNT(*) FROM topics").fetchone()[0] == 0:
+        n = fit_topics(conn, k=args.topics)
+        print(f"🧭 주제 학습: 뉴스 {n}건 ({time.perf_counter() - started:.1f}s)")
+    else:
+        # 빠진 행만 배정 (분석기 밖에서 분석된 행 등)
+        missing = [r[0] for r in conn.execute("SELECT id FROM news WHERE analyzed = 1 AND topic_id IS NULL")]
+        n = assign_topics(conn, missing)
+        conn.commit()
+        print(f"🧭 새 뉴스 {n}건 배정 ({(time.perf_counter() - started) * 1000:.0f}ms)")
+
+    for topic_id, size, terms in conn.execute("SELECT topic_id, size, terms FROM topics ORDER BY size DESC"):
+        print(f"  #{topic_id:<3} {size:>5}건  {' · '.join(json.loads(terms))}")
+    conn.close()
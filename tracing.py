@@ -0,0 +1,175 @@
+# tracing.py - 파이프라인 구간별 시간/건수 측정 (pipeline_runs / pipeline_spans)
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# 설정하면 실행마다 JSON 한 줄씩 추가 기록
+TRACE_FILE = os.getenv("OWNDRUG_TRACE_FILE", "")
+# 웹 프로세스(app.py) 기록은 따로 저장 → 커밋되는 fda_news.db 에는 파이프라인 기록만
+WEB_TRACE_DB = os.getenv("OWNDRUG_WEB_TRACE_DB", "web_traces.db")
+
+
+def init_tracing_tables(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS pipeline_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            pipeline TEXT,
+            source TEXT,
+            started_at TEXT,
+            finished_at TEXT,
+            duration_ms REAL,
+            status TEXT,
+            error TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS pipeline_spans (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id INTEGER,
+            stage TEXT,
+            started_at TEXT,
+            duration_ms REAL,
+            count INTEGER DEFAULT 0,
+            skipped INTEGER DEFAULT 0,
+            bytes INTEGER DEFAULT 0,
+            tokens INTEGER DEFAULT 0,
+            status TEXT DEFAULT 'ok',
+            meta TEXT
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_pipeline ON pipeline_runs(pipeline, started_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_spans_run ON pipeline_spans(run_id, stage)")
+
+
+class Span:
+    def __init__(self, stage, meta=None):
+        self.stage = stage
+        self.started_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.duration_ms = 0.0
+        self.count = 0
+        self.skipped = 0
+        self.bytes = 0
+        self.tokens = 0
+        self.status = 'ok'
+        self.meta = meta or {}
+
+    def to_dict(self):
+        return {
+            'stage': self.stage,
+            'started_at': self.started_at,
+            'duration_ms': round(self.duration_ms, 3),
+            'count': self.count,
+            'skipped': self.skipped,
+            'bytes': self.bytes,
+            'tokens': self.tokens,
+            'status': self.status,
+            'meta': self.meta,
+        }
+
+
+class PipelineRun:
+    """실행 1회 = pipeline_runs 1행. 구간은 메모리에 모았다가 finish()에서 한 번에 저장.
+
+    - span(stage): 호출마다 1행 (LLM 호출, RSS 가져오기 등)
+    - timer(stage): 같은 stage는 1행으로 합산 (항목별 중복체크/저장 등)
+    """
+
+    def __init__(self, pipeline, source=None, db_path='fda_news.db', record=True):
+        self.pipeline = pipeline
+        self.source = source
+        self.db_path = db_path
+        self.record = record
+        self.started_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self._start = time.perf_counter()
+        self.spans = []
+        self._timers = {}
+        self.finished = False
+
+    @contextmanager
+    def span(self, stage, **meta):
+        span = Span(stage, meta)
+        start = time.perf_counter()
+        try:
+            yield span
+        except Exception as e:
+            span.status = 'error'
+            span.meta['error'] = str(e)[:200]
+            raise
+        finally:
+            span.duration_ms = (time.perf_counter() - start) * 1000
+            self.spans.append(span)
+
+    @contextmanager
+    def timer(self, stage):
+        span = self._timers.get(stage)
+        if span is None:
+            span = Span(stage)
+            self._timers[stage] = span
+            self.spans.append(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.duration_ms += (time.perf_counter() - start) * 1000
+
+    def summary(self):
+        totals = {}
+        for s in self.spans:
+            totals[s.stage] = totals.get(s.stage, 0.0) + s.duration_ms
+        return " | ".join(f"{stage} {ms:.0f}ms" for stage, ms in totals.items())
+
+    def finish(self, status='ok', error=None):
+        if self.finished:
+            return
+        self.finished = True
+        duration_ms = (time.perf_counter() - self._start) * 1000
+        finished_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        if not self.record:
+            return
+
+        print(f"⏱️ [{self.pipeline}{'/' + self.source if self.source else ''}] "
+              f"총 {duration_ms:.0f}ms | {self.summary()}")
+
+        # 측정 실패가 파이프라인을 멈추면 안 됨
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            init_tracing_tables(conn)
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO pipeline_runs (pipeline, source, started_at, finished_at, duration_ms, status, error)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (self.pipeline, self.source, self.started_at, finished_at, duration_ms, status, error))
+            run_id = cursor.lastrowid
+            cursor.executemany("""
+                INSERT INTO pipeline_spans (run_id, stage, started_at, duration_ms, count, skipped,
+                                            bytes, tokens, status, meta)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (run_id, s.stage, s.started_at, s.duration_ms, s.count, s.skipped, s.bytes,
+                 s.tokens, s.status, json.dumps(s.meta, ensure_ascii=False) if s.meta else None)
+                for s in self.spans
+            ])
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            print(f"⚠️ 트레이스 저장 실패: {e}")
+
+        if TRACE_FILE:
+            try:
+                with open(TRACE_FILE, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({
+                        'pipeline': self.pipeline,
+                        'source': self.source,
+                        'started_at': self.started_at,
+                        'finished_at': finished_at,
+                        'duration_ms': round(duration_ms, 3),
+                        'status': status,
+                        'error': error,
+                        'spans': [s.to_dict() for s in self.spans],
+                    }, ensure_ascii=False) + "\n")
+            except Exception as e:
+                print(f"⚠️ 트레이스 파일 기록 실패: {e}")
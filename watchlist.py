@@ -0,0 +1,115 @@
+# watchlist.py - 사용자별 관심 종목 + 관심 종목 뉴스 피드
+# 관심 종목은 leaderboard.db 처럼 뉴스 DB와 분리된 watchlist.db 에 저장
+# (CI 가 커밋하는 fda_news.db 는 건드리지 않음)
+# 피드는 SQL 한 번: 티커마다 news(ticker, pub_date) 인덱스를 최신순으로 LIMIT 만큼만 읽고 합침
+#   → 키셋 페이지네이션 (마지막 행의 발표시간/id 다음부터) 이라 OFFSET 처럼 앞 페이지를 다시 읽지 않음
+#   → 비용 = 종목 수 × 페이지 크기 (뉴스가 몇 년 치 쌓여도 같음)
+import hashlib
+import os
+import sqlite3
+from datetime import datetime
+
+from calibration import SCORE_SQL
+
+WATCHLIST_DB = os.getenv("OWNDRUG_WATCHLIST_DB", "watchlist.db")
+
+MAX_TICKERS = 50  # SQLite UNION ALL 한도(500)보다 충분히 작게
+FIRST_CURSOR = ('9999', 0)  # 첫 페이지: 모든 발표시간보다 뒤
+
+FEED_COLUMNS = f"""
+    id, pub_date AS 발표시간,
+    COALESCE(summary_ko, title) AS 한줄요약,
+    ticker AS 티커,
+    news_type AS 유형,
+    {SCORE_SQL} AS 주가영향,
+    link AS 원문
+"""
+
+
+def connect(db_path=WATCHLIST_DB):
+    conn = sqlite3.connect(db_path, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS watchlists (
+            user TEXT NOT NULL,
+            ticker TEXT NOT NULL,
+            added_at TIMESTAMP NOT NULL,
+            PRIMARY KEY (user, ticker)
+        ) WITHOUT ROWID
+    """)
+    return conn
+
+
+def normalize_user(user):
+    return (user or '').strip()[:20]
+
+
+def load_watchlist(user, db_path=WATCHLIST_DB):
+    """관심 종목 집합 (frozenset → 포함 여부 O(1))"""
+    user = normalize_user(user)
+    if not user:
+        return frozenset()
+    conn = connect(db_path)
+    try:
+        return frozenset(t for (t,) in conn.execute("SELECT ticker FROM watchlists WHERE user = ?", (user,)))
+    finally:
+        conn.close()
+
+
+def save_watchlist(user, tickers, db_path=WATCHLIST_DB):
+    """관심 종목을 tickers 로 맞춤 (추가/삭제된 것만 씀)"""
+    user = normalize_user(user)
+    if not user:
+        return frozenset()
+    wanted = frozenset(t.strip().upper() for t in tickers if t and t.strip())
+    if len(wanted) > MAX_TICKERS:
+        raise ValueError(f"관심 종목은 {MAX_TICKERS}개까지")
+    conn = connect(db_path)
+    try:
+        with conn:
+            current = {t for (t,) in conn.execute("SELECT ticker FROM watchlists WHERE user = ?", (user,))}
+            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            conn.executemany("INSERT OR IGNORE INTO watchlists VALUES (?, ?, ?)",
+                             [(user, t, now) for t in wanted - current])
+            conn.executemany("DELETE FROM watchlists WHERE user = ? AND ticker = ?",
+                             [(user, t) for t in current - wanted])
+    finally:
+        conn.close()
+    return wanted
+
+
+def watchlist_key(tickers):
+    """캐시 키: 순서와 상관없이 같은 종목 묶음이면 같은 값 (사용자끼리 공유)"""
+    return hashlib.sha1(','.join(sorted(tickers)).encode()).hexdigest()[:16]
+
+
+def feed_sql(n_tickers):
+    # 티커마다: 인덱스 (ticker, pub_date, rowid) 를 뒤에서부터 → 커서 이전 행 LIMIT 개
+    # 바깥: 합친 (종목 수 × LIMIT) 행만 정렬해서 LIMIT 개
+    branch = f"""
+        SELECT * FROM (
+            SELECT {FEED_COLUMNS} FROM news
+            WHERE ticker = ? AND analyzed = 1
+              AND pub_date <= ? AND (pub_date < ? OR id < ?)
+            ORDER BY pub_date DESC, id DESC
+            LIMIT ?
+        )"""
+    return ' UNION ALL '.join([branch] * n_tickers) + " ORDER BY 발표시간 DESC, id DESC LIMIT ?"
+
+
+def fetch_feed(conn, tickers, cursor=FIRST_CURSOR, limit=50):
+    """관심 종목 뉴스 최신순 limit 개 (cursor = 이전 페이지 마지막 행의 (발표시간, id))
+
+    반환: (행 목록, 다음 cursor 또는 None)
+    """
+    tickers = sorted(tickers)
+    if not tickers:
+        return [], None
+    pub_date, news_id = cursor
+    params = []
+    for t in tickers:
+        params += [t, pub_date, pub_date, news_id, limit]
+    params.append(limit)
+    rows = conn.execute(feed_sql(len(tickers)), params).fetchall()
+    next_cursor = (rows[-1][1], rows[-1][0]) if len(rows) == limit else None
+    return rows, next_cursor